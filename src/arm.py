@@ -1,7 +1,10 @@
 import arm_constraints
 import eer
 import eer_constraints as EC
+import hierarchy
+import interning
 import xml.etree.ElementTree as ET
+import xml_stream
 
 
 class ARM_Model:
@@ -13,6 +16,8 @@ class ARM_Model:
     ----------
     arm_entities : list of ARM_Entity
         The entities that together compose the ARM Model.
+    entity_index : dict of str to ARM_Entity
+        The entities keyed by name, for constant time lookups.
 
     Methods
     -------
@@ -29,75 +34,87 @@ class ARM_Model:
         Entities must be added with the `add_arm_entity()` method.
         """
         self.arm_entities = []
+        self.entity_index = {}
 
-    def load_arm(self, filename='../ARM_XML_Schema/template.xml'):
-        tree = ET.parse(filename)
-        root = tree.getroot()
+    def load_arm(self, filename='../ARM_XML_Schema/template.xml', stream=False):
+        """
+        Loads an ARM model from an XML file into a python object representation
+
+        If `stream` is True the document is parsed incrementally - each entity
+        is built as soon as its block has been read and the block is then
+        discarded, so the whole document is never held in memory. When
+        streaming, `filename` may also be an open file object or an iterable
+        of byte chunks (e.g. read from a socket or a decompressor).
+        """
+        if stream:
+            blocks = xml_stream.iter_blocks(filename)
+        else:
+            blocks = ET.parse(filename).getroot()
 
-        num_elements = len(root)
-        for i in range(num_elements):
-            if(root[i].attrib["type"] == "Entity"):
-                self.load_entity(root[i])
+        for block in blocks:
+            if(block.attrib["type"] == "Entity"):
+                self.load_entity(block)
 
     def load_entity(self, entity_block):
         """
         Loads an ARM entity from an XML file
         Helper method for the broader load_arm()
         """
-        entity = ARM_Entity(entity_block.attrib["name"])
-        entity_components = len(entity_block)
-        for j in range(entity_components):
-            if(entity_block[j].attrib["type"] == "attr"):
-                attr_name = entity_block[j].text
-                data_type = entity_block[j].attrib["data_type"]
-                entity.add_attribute(ARM_Attribute(attr_name, data_type))
-            if(entity_block[j].attrib["type"] == "pk"):
-                pk = entity_block[j].text
-                constraint = arm_constraints.PK_Constraint(pk)
-                entity.add_constraint(constraint)
-            if(entity_block[j].attrib["type"] == "fk"):
-                name = entity_block[j].text
-                fk = entity_block[j].attrib["fk"]
-                references = entity_block[j].attrib["references"]
-                constraint = arm_constraints.FK_Constraint(name, fk, references)
-                entity.add_constraint(constraint)
-            if(entity_block[j].attrib["type"] == "inheritance"):
-                parent = entity_block[j].text
-                constraint = arm_constraints.Inheritance_Constraint(parent)
+        string = interning.string
+        entity = ARM_Entity(string(entity_block.attrib["name"]))
+        for component in entity_block:
+            attrib = component.attrib
+            component_type = attrib["type"]
+            if component_type == "attr":
+                entity.add_attribute(interning.arm_attribute(component.text, attrib["data_type"]))
+            elif component_type == "pk":
+                entity.add_constraint(arm_constraints.PK_Constraint(string(component.text)))
+            elif component_type == "fk":
+                constraint = arm_constraints.FK_Constraint(string(component.text),
+                                                           string(attrib["fk"]),
+                                                           string(attrib["references"]))
                 entity.add_constraint(constraint)
-            if(entity_block[j].attrib["type"] == "cover"):
-                covered_by = []
-                covered_by_components = len(entity_block[j])
-                for k in range(covered_by_components):
-                    covered_by.append(entity_block[j][k].text)
-                constraint = arm_constraints.Cover_Constraint(covered_by)
+            elif component_type == "inheritance":
+                entity.add_constraint(
+                    arm_constraints.Inheritance_Constraint(string(component.text)))
+            elif component_type == "cover":
+                covered_by = [string(item.text) for item in component]
+                entity.add_constraint(arm_constraints.Cover_Constraint(covered_by))
+            elif component_type == "disjoint":
+                disjoint_with = [string(item.text) for item in component]
+                entity.add_constraint(arm_constraints.Disjointness_Constraint(disjoint_with))
+            elif component_type == "path_fd":
+                fd_attribs = [string(item.text) for item in component]
+                constraint = arm_constraints.Pathfd_Constraint(fd_attribs,
+                                                               string(attrib["target"]))
                 entity.add_constraint(constraint)
-            if(entity_block[j].attrib["type"] == "disjoint"):
-                disjoint_with = []
-                disjoint_with_components = len(entity_block[j])
-                for k in range(disjoint_with_components):
-                    disjoint_with.append(entity_block[j][k].text)
-                constraint = arm_constraints.Disjointness_Constraint(disjoint_with)
-                entity.add_constraint(constraint)
-            if(entity_block[j].attrib["type"] == "path_fd"):
-                fd_attribs = []
-                target = entity_block[j].attrib["target"]
-                fd_attrib_components = len(entity_block[j])
-                for k in range(fd_attrib_components):
-                    fd_attribs.append(entity_block[j][k].text)
-                constraint = arm_constraints.Pathfd_Constraint(fd_attribs, target)
-                entity.add_constraint(constraint)
-        self.add_arm_entity(entity)
+        # A duplicate name is reported by validation.validate(), with every other problem
+        self.add_arm_entity(entity, allow_duplicate=True)
 
-    def add_arm_entity(self, new_arm_entity):
+    def add_arm_entity(self, new_arm_entity, allow_duplicate=False):
         """Adds an ARM_Entity to the model.
 
+        Args:
+            new_arm_entity (ARM_Entity): The entity to add.
+            allow_duplicate (bool): Optional - whether the entity may have the
+                                    name of an entity already in the model, as
+                                    when loading a file. It is then kept for
+                                    `validation.validate()` to report, and
+                                    `find_entity()` still finds the first.
+
         Raises:
             AssertionError:
                 if `new_arm_entity` supplied is not of type `ARM_Entity`
+                or the model already has an entity with the same name
+                and `allow_duplicate` is False
         """
 
         assert type(new_arm_entity) == ARM_Entity
+        name = new_arm_entity.get_name()
+        if name in self.entity_index:
+            assert allow_duplicate, "Duplicate entity name: {}".format(name)
+        else:
+            self.entity_index[name] = new_arm_entity
         self.arm_entities.append(new_arm_entity)
 
     def get_arm_entities(self):
@@ -107,152 +124,52 @@ class ARM_Model:
     def transform_to_eer(self, debug=False):
         """Applies the set of transformation rules for ARM to EER.
 
+        Returns:
+            EER: The EER model resulting from the transformation from the
+                 ARM model given by `self`.
+        """
+        # Parents are transformed before their subclasses, whatever the
+        # order of the relations in the model
+        arm_entities = hierarchy.schedule(self.arm_entities)
+        results = [transform_entity_to_eer(arm_entity, debug) for arm_entity in arm_entities]
+        return self.merge_eer_components(arm_entities, results)
+
+    def merge_eer_components(self, arm_entities, results):
+        """Applies the transformation rules for ARM to EER that span several relations.
+
+        Args:
+            arm_entities (list of ARM_Entity): The relations of the model,
+                parents before their subclasses (see `hierarchy.schedule()`).
+            results (iterable of tuple): The (EER_Entity or None, list of
+                EER_Relationship) produced by `transform_entity_to_eer()` for
+                each of `arm_entities`, in order.
+
         Returns:
             EER: The EER model resulting from the transformation from the
                  ARM model given by `self`.
         """
         eer_model = eer.EER_Model()        # will store the new EER model
 
-        # STEP I: Create the entities and relationships
-        for arm_entity in self.arm_entities:
-            # Step I_A - extract the PK and FK attribues from the ARM
-
-            # Get the PK attributes
-            pk = []
-            for constraint in arm_entity.get_constraints():
-                if type(constraint) == arm_constraints.Pathfd_Constraint:
-                    if constraint.get_target() == 'self':
-                        pk = constraint.get_attributes()
-            k = len(pk)  # k is the number of PK attributes
-
-            # Count the number of foreign keys in the PK
-            h = 0
-            fk_tables = []  # which entities participate in the relationship
-            for constraint in arm_entity.get_constraints():
-                if type(constraint) == arm_constraints.FK_Constraint \
-                        and constraint.get_fk() in pk:
-                    h += 1
-                    fk_tables.append(constraint.get_references())
-
-            if debug is True:
-                print("{}: h = {}, k = {}".format(arm_entity.get_name(), h, k))
-
-            # Step I_B - check if a 'strong entity' should be created
-            entity_to_add = False
-            weak_entity_to_add = False
-
-            if h == 0:
-                new_ent = eer.EER_Entity(arm_entity.get_name())
-                entity_to_add = True
-
-            # Step I_C - check if a 'regular relationship' should be created
-            elif h == k:
-                new_rel = eer.EER_Relationship(arm_entity.get_name())
-                new_rel.set_entity1(fk_tables[0])
-                new_rel.set_entity2(fk_tables[1])
-                new_rel.set_mult1(("0", "n"))
-                new_rel.set_mult2(("0", "n"))
-                for attr in arm_entity.get_attributes():
-                    if attr.get_name() not in pk and attr.get_name() != "self":
-                        new_rel.add_attribute(eer.EER_Attribute(attr.get_name()))
+        for arm_entity, (new_ent, relationships) in zip(arm_entities, results):
+            for new_rel in relationships:
                 eer_model.add_eer_relationship(new_rel)
+            if new_ent is None:
+                continue
 
-            # Step I_D - check if a weak entity should be created
-            elif h < k:
-                new_ent = eer.EER_Entity(arm_entity.get_name(), weak=True)
-                entity_to_add = True
-                weak_entity_to_add = True
-
-            # STEP II: Assign PK attributes and declare as identifier
-            if entity_to_add:
-                if weak_entity_to_add:
-                    # Only add the partial identifier
-                    partial_id = []
-                    for attr in pk:
-                        # Don't add the identifer of the strong entity
-                        for constraint in arm_entity.get_constraints():
-                            if type(constraint) == arm_constraints.FK_Constraint \
-                                    and constraint.get_fk() in pk and attr == constraint.get_fk():
-                                # Add a weak relationship here
-                                new_rel = eer.EER_Relationship(
-                                    arm_entity.get_name()
-                                    + constraint.get_references(), weak=True)
-                                new_rel.set_entity1(arm_entity.get_name())
-                                new_rel.set_entity2(constraint.get_references())
-                                new_rel.set_mult1(("0", "n"))
-                                # Weak entity belongs to one and only one strong entity:
-                                new_rel.set_mult2(("1",))
-                                eer_model.add_eer_relationship(new_rel)
-                                break
-                        else:
-                            partial_id.append(attr)
-                    for attr in partial_id:
-                        new_ent.add_attribute(eer.EER_Attribute(attr))
-                        id_constraint = EC.Identifier_Constraint(partial_id)
-                        new_ent.add_constraint(id_constraint)
-                else:
-                    for attr in pk:
-                        new_ent.add_attribute(eer.EER_Attribute(attr))
-                    id_constraint = EC.Identifier_Constraint(pk)
-                    new_ent.add_constraint(id_constraint)
-
-                # STEP III: Extract and add non-pk attributes
-                for attr in arm_entity.get_attributes():
-                    if attr.get_name() not in pk and attr.get_name() != "self":
-                        # Check if attribute is part of an FK constraint
-                        # If so, add an EER Relationship
-                        for constraint in arm_entity.get_constraints():
-                            if type(constraint) == arm_constraints.FK_Constraint and constraint.get_fk() == attr.get_name():
-                                new_rel = eer.EER_Relationship(
-                                    arm_entity.get_name()
-                                    + constraint.get_references())
-                                new_rel.set_entity1(arm_entity.get_name())
-                                new_rel.set_entity2(constraint.get_references())
-                                # As per Prof Keet's request, assume it is n-1 not 1-1 as per document.
-                                # FK is on the n side of the relationship
-                                new_rel.set_mult1(("1", "n"))
-                                new_rel.set_mult2(("1",))
-                                eer_model.add_eer_relationship(new_rel)
-                                break
-                        else:  # Otherwise, attribute is a regular attribute
-                            new_ent.add_attribute(eer.EER_Attribute(attr.get_name()))
-
-                # STEPS IV - VI: Inheritance, Covering and Disjointness
-                parent = None
-                covered_constraint = False
-                disjointess_constraint = False
-                for constraint in arm_entity.get_constraints():
-                    # Check if this entity has a parent
-                    if type(constraint) == arm_constraints.Inheritance_Constraint:
-                        parent = constraint.get_parent()
-                    # Check if this entity is disjoint with any other entity
-                    if type(constraint) == arm_constraints.Disjointness_Constraint:
-                        disjointess_constraint = True
-                if parent is not None:
-                    # Then this entity has a parent
-                    # Now check if this inheritance needs a covering constraint
-                    parent_ent = self.find_entity(parent)
-                    for parent_constraint in parent_ent.get_constraints():
-                        if type(parent_constraint) == arm_constraints.Cover_Constraint:
-                            covered_constraint = True
-
-                    # Finally, add the appropriate specialisation relationship
-                    # constraint to the EER entity
-                    new_ent.add_constraint(
-                        EC.Inheritance_Constraint(parent,
-                                                  disjointess_constraint,
-                                                  covered_constraint))
-
-                eer_model.add_eer_entity(new_ent)
+            # STEPS IV - VI: Inheritance, Covering and Disjointness
+            parent = arm_entity.get_parent()
+            if parent is not None:
+                # Then this entity has a parent
+                new_ent.add_constraint(
+                    transform_inheritance_to_eer(arm_entity, self.find_entity(parent)))
+
+            eer_model.add_eer_entity(new_ent)
 
         return eer_model
 
     def find_entity(self, entity_name):
         """Returns the ARM entity object corresponding to a given entity name"""
-        for ent in self.arm_entities:
-            if ent.get_name() == entity_name:
-                return ent
-        return None
+        return self.entity_index.get(entity_name)
 
     def __len__(self):
         """ Returns the number of entities that the model consists of. """
@@ -290,6 +207,15 @@ class ARM_Entity:
     constraints : list of Constraint
         The constraints of the entity - such as a PK_Constraint,
         FK_Constraint etc.
+    attribute_index : dict of str to ARM_Attribute
+        The attributes keyed by name.
+    constraints_by_type : dict of type to list of Constraint
+        The constraints bucketed by their class, in the order they were added.
+    fk_by_column : dict of str to FK_Constraint
+        The foreign key constraints keyed by the attribute forming the key.
+    constraint_index : dict of tuple to Constraint
+        The constraints keyed by their `index_key()`, so that a constraint
+        equal to one the entity already has is not added again.
     """
 
     def __init__(self, name):
@@ -304,6 +230,12 @@ class ARM_Entity:
         self.name = name
         self.attributes = []
         self.constraints = []
+        self.attribute_index = {}
+        self.constraints_by_type = {}
+        self.fk_by_column = {}
+        self.constraint_index = {}
+        # The digest cached by fingerprint.py, cleared by every setter
+        self._fingerprint = None
 
     def add_attribute(self, new_attribute):
         """Adds an ARM_Attribute to the entity.
@@ -314,16 +246,32 @@ class ARM_Entity:
         """
         assert type(new_attribute) == ARM_Attribute
         self.attributes.append(new_attribute)
+        self.attribute_index.setdefault(new_attribute.get_name(), new_attribute)
+        self._fingerprint = None
 
     def add_constraint(self, new_constraint):
-        """Adds a Constraint to the entity.
+        """Adds a Constraint to the entity, unless the entity already has an equal one.
 
         Raises:
             AssertionError:
                 if `new_constraint` supplied is not of type `Constraint`
         """
         assert isinstance(new_constraint, arm_constraints.Constraint)
+        key = new_constraint.index_key()
+        existing = self.constraint_index.get(key)
+        # A constraint changed since it was added is no longer indexed by its key
+        if existing is not None and existing.index_key() == key:
+            return
+        self.constraint_index[key] = new_constraint
         self.constraints.append(new_constraint)
+        constraint_type = type(new_constraint)
+        if constraint_type in self.constraints_by_type:
+            self.constraints_by_type[constraint_type].append(new_constraint)
+        else:
+            self.constraints_by_type[constraint_type] = [new_constraint]
+        if constraint_type == arm_constraints.FK_Constraint:
+            self.fk_by_column.setdefault(new_constraint.get_fk(), new_constraint)
+        self._fingerprint = None
 
     def get_name(self):
         """Getter for name."""
@@ -337,6 +285,39 @@ class ARM_Entity:
         """Getter for constraints."""
         return self.constraints
 
+    def find_attribute(self, attribute_name):
+        """Returns the attribute with the given name, or None if there is none."""
+        return self.attribute_index.get(attribute_name)
+
+    def get_constraints_of_type(self, constraint_type):
+        """Returns the constraints of the given class, e.g. FK_Constraint."""
+        return self.constraints_by_type.get(constraint_type, [])
+
+    def get_constraint_of_type(self, constraint_type):
+        """Returns the first constraint of the given class, or None if there is none."""
+        constraints = self.constraints_by_type.get(constraint_type)
+        return constraints[0] if constraints else None
+
+    def get_fk_constraints(self):
+        """Returns the foreign key constraints."""
+        return self.get_constraints_of_type(arm_constraints.FK_Constraint)
+
+    def get_fk(self, column):
+        """Returns the foreign key constraint on the attribute `column`, or None."""
+        return self.fk_by_column.get(column)
+
+    def get_key_pathfd(self):
+        """Returns the Pathfd_Constraint that determines `self`, or None."""
+        for constraint in self.get_constraints_of_type(arm_constraints.Pathfd_Constraint):
+            if constraint.get_target() == "self":
+                return constraint
+        return None
+
+    def get_parent(self):
+        """Returns the name of the parent entity, or None if there is no isa constraint."""
+        constraint = self.get_constraint_of_type(arm_constraints.Inheritance_Constraint)
+        return constraint.get_parent() if constraint is not None else None
+
     def __str__(self):
         """
         String representation of the entity.
@@ -373,6 +354,9 @@ class ARM_Attribute:
         The data type of the attribute - defaulted to anyType.
     """
 
+    # _fingerprint caches the digest of the attribute (see fingerprint.py)
+    __slots__ = ("name", "data_type", "_fingerprint")
+
     def __init__(self, name, data_type="anyType"):
         """
         Args:
@@ -397,3 +381,133 @@ class ARM_Attribute:
         e.g. 'age (INT)'
         """
         return "{} ({})".format(self.name, self.data_type)
+
+
+def transform_entity_to_eer(arm_entity, debug=False):
+    """Applies the transformation rules for ARM to EER that involve a single relation.
+
+    The inheritance constraints, which depend on the parent relation, are
+    added by `ARM_Model.merge_eer_components()`.
+
+    Returns:
+        (EER_Entity, list of EER_Relationship): The entity for `arm_entity`
+            (or None if it becomes a relationship) and the relationships
+            produced from it.
+    """
+    # Step I_A - extract the PK and FK attribues from the ARM
+
+    # Get the PK attributes
+    key_pathfd = arm_entity.get_key_pathfd()
+    pk = key_pathfd.get_attributes() if key_pathfd is not None else []
+    k = len(pk)  # k is the number of PK attributes
+
+    # Count the number of foreign keys in the PK
+    fk_tables = []  # which entities participate in the relationship
+    for constraint in arm_entity.get_fk_constraints():
+        if constraint.get_fk() in pk:
+            fk_tables.append(constraint.get_references())
+    h = len(fk_tables)
+
+    if debug is True:
+        print("{}: h = {}, k = {}".format(arm_entity.get_name(), h, k))
+
+    # Step I_B - check if a 'strong entity' should be created
+    new_ent = None
+    relationships = []             # the EER relationships produced
+    entity_to_add = False
+    weak_entity_to_add = False
+
+    if h == 0:
+        new_ent = eer.EER_Entity(arm_entity.get_name())
+        entity_to_add = True
+
+    # Step I_C - check if a 'regular relationship' should be created
+    elif h == k:
+        new_rel = eer.EER_Relationship(arm_entity.get_name())
+        new_rel.set_entity1(fk_tables[0])
+        new_rel.set_entity2(fk_tables[1])
+        new_rel.set_mult1(("0", "n"))
+        new_rel.set_mult2(("0", "n"))
+        for attr in arm_entity.get_attributes():
+            if attr.get_name() not in pk and attr.get_name() != "self":
+                new_rel.add_attribute(interning.eer_attribute(attr.get_name()))
+        relationships.append(new_rel)
+
+    # Step I_D - check if a weak entity should be created
+    elif h < k:
+        new_ent = eer.EER_Entity(arm_entity.get_name(), weak=True)
+        entity_to_add = True
+        weak_entity_to_add = True
+
+    # STEP II: Assign PK attributes and declare as identifier
+    if entity_to_add:
+        if weak_entity_to_add:
+            # Only add the partial identifier
+            partial_id = []
+            for attr in pk:
+                # Don't add the identifer of the strong entity
+                constraint = arm_entity.get_fk(attr)
+                if constraint is not None:
+                    # Add a weak relationship here
+                    new_rel = eer.EER_Relationship(
+                        arm_entity.get_name()
+                        + constraint.get_references(), weak=True)
+                    new_rel.set_entity1(arm_entity.get_name())
+                    new_rel.set_entity2(constraint.get_references())
+                    new_rel.set_mult1(("0", "n"))
+                    # Weak entity belongs to one and only one strong entity:
+                    new_rel.set_mult2(("1",))
+                    relationships.append(new_rel)
+                else:
+                    partial_id.append(attr)
+            for attr in partial_id:
+                new_ent.add_attribute(interning.eer_attribute(attr))
+            if partial_id:
+                id_constraint = EC.Identifier_Constraint(partial_id)
+                new_ent.add_constraint(id_constraint)
+        else:
+            for attr in pk:
+                new_ent.add_attribute(interning.eer_attribute(attr))
+            id_constraint = EC.Identifier_Constraint(pk)
+            new_ent.add_constraint(id_constraint)
+
+        # STEP III: Extract and add non-pk attributes
+        for attr in arm_entity.get_attributes():
+            if attr.get_name() not in pk and attr.get_name() != "self":
+                # Check if attribute is part of an FK constraint
+                # If so, add an EER Relationship
+                constraint = arm_entity.get_fk(attr.get_name())
+                if constraint is not None:
+                    new_rel = eer.EER_Relationship(
+                        arm_entity.get_name()
+                        + constraint.get_references())
+                    new_rel.set_entity1(arm_entity.get_name())
+                    new_rel.set_entity2(constraint.get_references())
+                    # As per Prof Keet's request, assume it is n-1 not 1-1 as per document.
+                    # FK is on the n side of the relationship
+                    new_rel.set_mult1(("1", "n"))
+                    new_rel.set_mult2(("1",))
+                    relationships.append(new_rel)
+                else:  # Otherwise, attribute is a regular attribute
+                    new_ent.add_attribute(interning.eer_attribute(attr.get_name()))
+
+    return new_ent, relationships
+
+
+def transform_inheritance_to_eer(arm_entity, parent_entity):
+    """
+    Returns the EER Inheritance_Constraint for a relation with a parent -
+    disjoint if the relation has a disjointness constraint, and covering if
+    its parent relation `parent_entity` has a cover constraint.
+    """
+    # Check if this entity is disjoint with any other entity
+    disjointess_constraint = len(arm_entity.get_constraints_of_type(
+        arm_constraints.Disjointness_Constraint)) > 0
+    # Now check if this inheritance needs a covering constraint
+    covered_constraint = len(parent_entity.get_constraints_of_type(
+        arm_constraints.Cover_Constraint)) > 0
+
+    # Finally, return the appropriate specialisation relationship constraint
+    return EC.Inheritance_Constraint(arm_entity.get_parent(),
+                                     disjointess_constraint,
+                                     covered_constraint)
@@ -7,12 +7,51 @@ class Constraint:
     Acts as an abstract class - it is never itself instantiated, instead
     the PK_Constraint, FK_Constraint etc. classes below inherit from this
     class and are themselves instantiated.
+
+    Constraints are values: two constraints are equal, and hash alike, if
+    their `key()`s are equal. A constraint should not be changed while it
+    is in a set or used as a dictionary key.
     """
 
+    # _fingerprint caches the digest of the constraint (see fingerprint.py),
+    # and is cleared by every setter
+    __slots__ = ("_fingerprint",)
+
+    def key(self):
+        """
+        Returns the values the constraint constrains, after a tag naming its
+        class - with the names of an unordered list sorted.
+        """
+        return (type(self).__name__,)
+
+    def index_key(self):
+        """Returns the key of the constraint among the constraints of one ARM_Entity."""
+        return self.key()
+
+    def __eq__(self, other):
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
     def __str__(self):
         return "Constraint object"
 
 
+def ordered_set(names):
+    """
+    Returns `names` without repeats, keeping the first occurrence of each in
+    order, and the set of the names. `names` itself is returned if it has
+    no repeats.
+    """
+    name_set = set(names)
+    if len(name_set) != len(names):
+        names = list(dict.fromkeys(names))
+    return names, name_set
+
+
 class PK_Constraint(Constraint):
     """
     A class used to represent a primary key constraint in an ARM_Entity.
@@ -23,6 +62,8 @@ class PK_Constraint(Constraint):
         The name of the ARM Attribute that forms the primary key
     """
 
+    __slots__ = ("pk",)
+
     def __init__(self, pk):
         self.pk = pk
 
@@ -30,6 +71,9 @@ class PK_Constraint(Constraint):
         """Getter for the primary key."""
         return self.pk
 
+    def key(self):
+        return ("pk", self.pk)
+
     def __str__(self):
         """
         String representation of the primary key constraint.
@@ -52,6 +96,8 @@ class FK_Constraint(Constraint):
         The name of the ARM Entity that the foreign key references
     """
 
+    __slots__ = ("name", "fk", "references")
+
     def __init__(self, name, fk, references):
         self.name = name
         self.fk = fk
@@ -69,6 +115,9 @@ class FK_Constraint(Constraint):
         """Getter for the table the fk references."""
         return self.references
 
+    def key(self):
+        return ("fk", self.name, self.fk, self.references)
+
     def __str__(self):
         """
         String representation of the foreign key constraint.
@@ -89,6 +138,8 @@ class Inheritance_Constraint(Constraint):
         The name of the parent entity
     """
 
+    __slots__ = ("parent",)
+
     def __init__(self, parent):
         self.parent = parent
 
@@ -96,6 +147,9 @@ class Inheritance_Constraint(Constraint):
         """Getter for the parent."""
         return self.parent
 
+    def key(self):
+        return ("isa", self.parent)
+
     def __str__(self):
         """
         String representation of the inheritance constraint.
@@ -111,19 +165,28 @@ class Cover_Constraint(Constraint):
     Attributes
     ----------
     covered_by : list of str
-        The name of the entities that this entity is covered by.
+        The name of the entities that this entity is covered by, each once.
     """
 
+    __slots__ = ("covered_by", "_covered_set")
+
     def __init__(self, covered_by):
-        self.covered_by = covered_by
+        self.covered_by, self._covered_set = ordered_set(covered_by)
 
     def get_covered_by(self):
         """Getter for the covered_by."""
         return self.covered_by
 
     def add_to_covered_by(self, new_entity):
-        """Adds another entity to the covered_by list."""
+        """Adds another entity to the covered_by list, unless it is already in it."""
+        if new_entity in self._covered_set:
+            return
         self.covered_by.append(new_entity)
+        self._covered_set.add(new_entity)
+        self._fingerprint = None
+
+    def key(self):
+        return ("cover",) + tuple(sorted(self.covered_by))
 
     def __str__(self):
         """
@@ -134,33 +197,117 @@ class Cover_Constraint(Constraint):
         return "covered by ({})".format(cov_str)
 
 
+class Disjointness_Group:
+    """
+    A class used to represent a group of mutually disjoint entities.
+
+    A group is shared by the Disjointness_Constraint of each of its members,
+    so that n mutually disjoint entities need space proportional to n rather
+    than n separate lists of the other n - 1 entities.
+
+    Attributes
+    ----------
+    members : list of str
+        The names of the entities in the group, each once.
+    """
+
+    __slots__ = ("members", "_member_set", "_fingerprint")
+
+    def __init__(self, members):
+        self.members, self._member_set = ordered_set(members)
+
+    def get_members(self):
+        """Getter for the members."""
+        return self.members
+
+    def set_members(self, new_members):
+        """Setter for the members."""
+        self.members, self._member_set = ordered_set(new_members)
+        self._fingerprint = None
+
+    def add_member(self, new_entity):
+        """Adds another entity to the group, unless it is already a member."""
+        if new_entity in self._member_set:
+            return
+        self.members.append(new_entity)
+        self._member_set.add(new_entity)
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.members)
+
+
 class Disjointness_Constraint(Constraint):
     """
     A class used to represent a disjointess constraint in an ARM_Entity.
 
     Attributes
     ----------
-    disjoint_with : list of str
-        The name of the entities that this entity is disjoint with.
+    group : Disjointness_Group
+        The entities that this entity is disjoint with - or, if `owner` is
+        set, a group shared with those entities that also contains `owner`.
+    owner : str
+        The name of the entity this constraint belongs to when it shares its
+        group with the other members, otherwise None.
     """
 
-    def __init__(self, disjoint_with):
-        self.disjoint_with = disjoint_with
+    __slots__ = ("group", "owner")
+
+    def __init__(self, disjoint_with, owner=None):
+        """
+        Args:
+            disjoint_with (list of str or Disjointness_Group):
+                The entities that this entity is disjoint with, or a shared
+                group containing `owner` and the entities it is disjoint with.
+            owner (str): The name of the entity the constraint belongs to.
+                         Required when `disjoint_with` is a shared group.
+        """
+        if isinstance(disjoint_with, Disjointness_Group):
+            assert owner is not None
+            self.group = disjoint_with
+        else:
+            self.group = Disjointness_Group(disjoint_with)
+        self.owner = owner
 
     def add_to_disjoint_with(self, new_entity):
-        """Adds another entity to the disjoint_with list."""
-        self.disjoint_with.append(new_entity)
+        """
+        Adds another entity to the disjoint_with list.
+        For a shared group, the entity joins the group - i.e. it becomes
+        disjoint with every member of the group.
+        """
+        self.group.add_member(new_entity)
 
     def get_disjoint_with(self):
         """Getter for the disjoint_with."""
-        return self.disjoint_with
+        if self.owner is None:
+            return self.group.get_members()
+        return [member for member in self.group.get_members() if member != self.owner]
+
+    def get_group(self):
+        """Getter for the group."""
+        return self.group
+
+    def get_owner(self):
+        """Getter for the owner."""
+        return self.owner
+
+    def key(self):
+        return ("disjoint",) + tuple(sorted(self.get_disjoint_with()))
+
+    def index_key(self):
+        # Comparing the members of a shared group would take time proportional
+        # to its size for every member, so a shared constraint is identified
+        # by its group and owner instead
+        if self.owner is None:
+            return self.key()
+        return ("disjoint-group", id(self.group), self.owner)
 
     def __str__(self):
         """
         String representation of the disjointness constraint.
         e.g. 'disjoint with (Student, Lecturer)'
         """
-        dis_str = ", ".join(self.disjoint_with)
+        dis_str = ", ".join(self.get_disjoint_with())
         return "disjoint with ({})".format(dis_str)
 
 
@@ -176,6 +323,8 @@ class Pathfd_Constraint(Constraint):
         The name of the attribute that is determined by the fd
     """
 
+    __slots__ = ("attributes", "target")
+
     def __init__(self, attributes, target):
         self.attributes = attributes
         self.target = target
@@ -187,11 +336,16 @@ class Pathfd_Constraint(Constraint):
     def set_attributes(self, new_attributes):
         """Setter for the attributes."""
         self.attributes = new_attributes
+        self._fingerprint = None
 
     def get_target(self):
         """Getter for the target."""
         return self.target
 
+    def key(self):
+        attributes = tuple(sorted(self.attributes)) if self.attributes is not None else None
+        return ("pathfd", self.target, attributes)
+
     def __str__(self):
         """
         String representation of the pathfd constraint.
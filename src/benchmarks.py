@@ -0,0 +1,472 @@
+"""
+Performance benchmarks for loading and transforming large models.
+
+Run a single benchmark with e.g. `python3 benchmarks.py load_eer`, or all
+of them with `python3 benchmarks.py`. Sizes can be overridden by passing
+entity counts after the benchmark name.
+"""
+import difflib
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import arm
+import arm_constraints
+import diff
+import eer
+import eer_constraints
+import fingerprint
+import graph
+import incremental
+import interning
+import model_generator
+import parallel
+import roundtrip
+import snapshot
+import streaming
+import validation
+
+
+def measure(function):
+    """
+    Runs `function` twice - once timed and once under tracemalloc.
+
+    Returns:
+        (float, int): The elapsed seconds and the peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_load_eer(sizes=(1000, 10000, 50000)):
+    """Compares the memory and throughput of the tree and streaming EER loaders."""
+    print("load_eer: tree parse vs streaming parse")
+    print("{:>10} {:>10} {:>12} {:>12} {:>12} {:>12}".format(
+        "entities", "file MB", "tree s", "tree MB", "stream s", "stream MB"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            filename = os.path.join(tmp, "eer_{}.xml".format(size))
+            model_generator.write_xml(filename, model_generator.eer_xml_lines(size))
+            tree_time, tree_peak = measure(lambda: eer.EER_Model().load_eer(filename))
+            stream_time, stream_peak = measure(
+                lambda: eer.EER_Model().load_eer(filename, stream=True))
+            print("{:>10} {:>10.1f} {:>12.3f} {:>12.1f} {:>12.3f} {:>12.1f}".format(
+                size, os.path.getsize(filename) / 2**20,
+                tree_time, tree_peak / 2**20,
+                stream_time, stream_peak / 2**20))
+
+
+def bench_load_arm(sizes=(1000, 10000, 50000)):
+    """Compares the memory and throughput of the tree and streaming ARM loaders."""
+    print("load_arm: tree parse vs streaming parse")
+    print("{:>10} {:>10} {:>12} {:>12} {:>12} {:>12}".format(
+        "entities", "file MB", "tree s", "tree MB", "stream s", "stream MB"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            filename = os.path.join(tmp, "arm_{}.xml".format(size))
+            model_generator.write_xml(filename, model_generator.arm_xml_lines(size))
+            tree_time, tree_peak = measure(lambda: arm.ARM_Model().load_arm(filename))
+            stream_time, stream_peak = measure(
+                lambda: arm.ARM_Model().load_arm(filename, stream=True))
+            print("{:>10} {:>10.1f} {:>12.3f} {:>12.1f} {:>12.3f} {:>12.1f}".format(
+                size, os.path.getsize(filename) / 2**20,
+                tree_time, tree_peak / 2**20,
+                stream_time, stream_peak / 2**20))
+
+
+def bench_snapshot(sizes=(1000, 10000, 50000)):
+    """Compares loading a model from XML with loading it from a snapshot."""
+    print("snapshot: XML load vs snapshot load")
+    print("{:>6} {:>10} {:>10} {:>10} {:>10} {:>12} {:>10}".format(
+        "model", "entities", "XML MB", "snap MB", "XML s", "snapshot s", "speedup"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for kind, lines, model_class, loader in [
+                    ("eer", model_generator.eer_xml_lines(size), eer.EER_Model, "load_eer"),
+                    ("arm", model_generator.arm_xml_lines(size), arm.ARM_Model, "load_arm")]:
+                xml_filename = os.path.join(tmp, "{}_{}.xml".format(kind, size))
+                snapshot_filename = os.path.join(tmp, "{}_{}.snapshot".format(kind, size))
+                model_generator.write_xml(xml_filename, lines)
+                model = model_class()
+                start = time.perf_counter()
+                getattr(model, loader)(xml_filename)
+                xml_time = time.perf_counter() - start
+                snapshot.dump(model, snapshot_filename)
+                start = time.perf_counter()
+                snapshot.load(snapshot_filename)
+                snapshot_time = time.perf_counter() - start
+                print("{:>6} {:>10} {:>10.1f} {:>10.1f} {:>10.3f} {:>12.3f} {:>9.1f}x".format(
+                    kind, size, os.path.getsize(xml_filename) / 2**20,
+                    os.path.getsize(snapshot_filename) / 2**20,
+                    xml_time, snapshot_time, xml_time / snapshot_time))
+
+
+def bench_transform(sizes, lines, model_class, loader, transform):
+    """Times a transformation of generated models of increasing size."""
+    print("{}: time per entity should stay flat as the model grows".format(transform))
+    print("{:>10} {:>12} {:>16}".format("entities", "seconds", "us per entity"))
+    for size in sizes:
+        model = model_class()
+        getattr(model, loader)(model_generator.xml_file_object(lines(size)))
+        start = time.perf_counter()
+        getattr(model, transform)()
+        elapsed = time.perf_counter() - start
+        print("{:>10} {:>12.3f} {:>16.1f}".format(size, elapsed, elapsed / size * 1e6))
+
+
+def bench_transform_to_eer(sizes=(100, 1000, 10000, 100000)):
+    """Shows how ARM_Model.transform_to_eer scales with the number of entities."""
+    bench_transform(sizes, model_generator.arm_xml_lines,
+                    arm.ARM_Model, "load_arm", "transform_to_eer")
+
+
+def bench_transform_to_arm(sizes=(100, 1000, 5000)):
+    """
+    Shows how EER_Model.transform_to_arm scales with the number of entities.
+    The implicit disjointness constraints (STEP VI) are quadratic in the
+    number of entities, which limits the default sizes.
+    """
+    bench_transform(sizes, model_generator.eer_xml_lines,
+                    eer.EER_Model, "load_eer", "transform_to_arm")
+
+
+def bench_transform_to_arm_relationships(sizes=(1000, 10000, 100000)):
+    """
+    Shows how EER_Model.transform_to_arm scales with the number of
+    relationships - each is resolved to its relations in constant time.
+    """
+    print("transform_to_arm: time per relationship should stay flat as the model grows")
+    print("{:>14} {:>12} {:>22}".format("relationships", "seconds", "us per relationship"))
+    for size in sizes:
+        model = eer.EER_Model()
+        model.load_eer(model_generator.xml_file_object(
+            model_generator.eer_relationship_xml_lines(size)))
+        start = time.perf_counter()
+        model.transform_to_arm()
+        elapsed = time.perf_counter() - start
+        print("{:>14} {:>12.3f} {:>22.1f}".format(size, elapsed, elapsed / size * 1e6))
+
+
+def bench_transform_to_arm_memory(sizes=(1000, 5000, 20000)):
+    """
+    Shows that the memory of the model produced by EER_Model.transform_to_arm
+    grows linearly with the number of entities - the implicit disjointness
+    constraints (STEP VI) share a single group of relation names.
+    """
+    print("transform_to_arm: memory per entity should stay flat as the model grows")
+    print("{:>10} {:>12} {:>16}".format("entities", "MB", "bytes per entity"))
+    for size in sizes:
+        model = eer.EER_Model()
+        model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(size)))
+        tracemalloc.start()
+        transformed = model.transform_to_arm()
+        transformed_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del transformed
+        print("{:>10} {:>12.1f} {:>16.0f}".format(
+            size, transformed_size / 2**20, transformed_size / size))
+
+
+def bench_parallel(sizes=(10000, 50000), workers=None):
+    """Compares the serial transformations with the parallel ones."""
+    print("parallel: serial vs process pool transformations")
+    print("{:>18} {:>10} {:>12} {:>12}".format("transform", "entities", "serial s", "parallel s"))
+    for size in sizes:
+        for transform, lines, model_class, loader in [
+                ("transform_to_arm", model_generator.eer_xml_lines, eer.EER_Model, "load_eer"),
+                ("transform_to_eer", model_generator.arm_xml_lines, arm.ARM_Model, "load_arm")]:
+            model = model_class()
+            getattr(model, loader)(model_generator.xml_file_object(lines(size)))
+            start = time.perf_counter()
+            getattr(model, transform)()
+            serial_time = time.perf_counter() - start
+            start = time.perf_counter()
+            getattr(parallel, transform)(model, workers=workers)
+            parallel_time = time.perf_counter() - start
+            print("{:>18} {:>10} {:>12.3f} {:>12.3f}".format(
+                transform, size, serial_time, parallel_time))
+
+
+def bench_incremental(sizes=(1000, 10000)):
+    """Compares a full transform_to_arm with an incremental one after a single edit."""
+    print("incremental: full vs incremental transform_to_arm after editing one entity")
+    print("{:>10} {:>12} {:>16} {:>12}".format("entities", "full s", "incremental s", "recomputed"))
+    for size in sizes:
+        model = eer.EER_Model()
+        model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(size)))
+        transform = incremental.Incremental_EER_To_ARM(model)
+        transform.get_arm_model()
+        edited = eer.EER_Entity("E3")
+        for attribute in model.find_entity("E3").get_attributes():
+            edited.add_attribute(attribute)
+        edited.add_attribute(eer.EER_Attribute("extra"))
+        edited.add_constraint(eer_constraints.Identifier_Constraint(["extra"]))
+        transform.replace_eer_entity(edited)
+        start = time.perf_counter()
+        transform.get_arm_model()
+        incremental_time = time.perf_counter() - start
+        start = time.perf_counter()
+        transform.to_eer_model().transform_to_arm()
+        full_time = time.perf_counter() - start
+        print("{:>10} {:>12.3f} {:>16.3f} {:>12}".format(
+            size, full_time, incremental_time, transform.recomputed))
+
+
+def bench_streaming(sizes=(1000, 5000)):
+    """
+    Compares the peak memory of writing the ARM model of a generated EER
+    model with transform_to_arm() and str() against streaming.dump_arm().
+    The text of the implicit disjointness constraints (STEP VI) is quadratic
+    in the number of entities, which limits the default sizes.
+    """
+    print("streaming: peak memory of eager vs streaming transform_to_arm output")
+    print("{:>10} {:>12} {:>12} {:>12} {:>12}".format(
+        "entities", "eager s", "eager MB", "stream s", "stream MB"))
+    for size in sizes:
+        model = eer.EER_Model()
+        model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(size)))
+        with tempfile.TemporaryFile("w") as f:
+            eager_time, eager_peak = measure(lambda: f.write(str(model.transform_to_arm())))
+            stream_time, stream_peak = measure(lambda: streaming.dump_arm(model, f))
+        print("{:>10} {:>12.3f} {:>12.1f} {:>12.3f} {:>12.1f}".format(
+            size, eager_time, eager_peak / 2**20, stream_time, stream_peak / 2**20))
+
+
+def bench_fingerprint(sizes=(10000, 50000)):
+    """
+    Compares hashing the snapshot of a generated EER model with its Merkle
+    fingerprint, computed from scratch and again after editing one entity.
+    """
+    print("fingerprint: snapshot SHA-256 vs Merkle fingerprint")
+    print("{:>10} {:>12} {:>12} {:>14}".format("entities", "snapshot s", "merkle s", "after edit s"))
+    for size in sizes:
+        model = eer.EER_Model()
+        model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(size)))
+        start = time.perf_counter()
+        hashlib.sha256(snapshot.dumps(model)).digest()
+        snapshot_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fingerprint.fingerprint(model)
+        merkle_time = time.perf_counter() - start
+        model.find_entity("E3").add_attribute(eer.EER_Attribute("extra"))
+        start = time.perf_counter()
+        fingerprint.fingerprint(model)
+        edit_time = time.perf_counter() - start
+        print("{:>10} {:>12.3f} {:>12.3f} {:>14.3f}".format(
+            size, snapshot_time, merkle_time, edit_time))
+
+
+def bench_diff(sizes=(10000, 50000), text_limit=10000):
+    """
+    Diffs two generated EER models that differ in 1% of their entities,
+    first with fresh fingerprints and then again with cached ones. Models
+    of up to `text_limit` entities are also diffed as text with difflib.
+    """
+    print("diff: structural diff vs text diff of models differing by 1%")
+    print("{:>10} {:>10} {:>12} {:>12} {:>10}".format(
+        "entities", "changed", "diff s", "cached s", "text s"))
+    for size in sizes:
+        models = []
+        for _ in range(2):
+            model = eer.EER_Model()
+            model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(size)))
+            models.append(model)
+        old, new = models
+        for i in range(0, size, 100):
+            new.find_entity("E{}".format(i)).add_attribute(eer.EER_Attribute("extra"))
+        start = time.perf_counter()
+        model_diff = diff.diff_models(old, new)
+        diff_time = time.perf_counter() - start
+        start = time.perf_counter()
+        diff.diff_models(old, new)
+        cached_time = time.perf_counter() - start
+        text_time = "-"
+        if size <= text_limit:
+            start = time.perf_counter()
+            list(difflib.unified_diff(str(old).splitlines(), str(new).splitlines()))
+            text_time = "{:.3f}".format(time.perf_counter() - start)
+        print("{:>10} {:>10} {:>12.3f} {:>12.3f} {:>10}".format(
+            size, len(model_diff.changed_entities), diff_time, cached_time, text_time))
+
+
+def bench_roundtrip(sizes=(1000, 5000), models=8, workers=None):
+    """
+    Times the round-trip verification of a directory of generated EER and
+    ARM models of each size, serially and in parallel.
+    """
+    print("roundtrip: verifying a directory of {} models".format(models))
+    print("{:>10} {:>12} {:>12} {:>14}".format(
+        "entities", "serial s", "parallel s", "slowest model s"))
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(models):
+                kind = "eer" if i % 2 == 0 else "arm"
+                lines = model_generator.eer_xml_lines if kind == "eer" \
+                    else model_generator.arm_xml_lines
+                model_generator.write_xml(os.path.join(tmp, "{}_{}.xml".format(kind, i)),
+                                          lines(size))
+            start = time.perf_counter()
+            results = roundtrip.verify_directory(tmp, workers=1)
+            serial_time = time.perf_counter() - start
+            start = time.perf_counter()
+            roundtrip.verify_directory(tmp, workers=workers)
+            parallel_time = time.perf_counter() - start
+        print("{:>10} {:>12.3f} {:>12.3f} {:>14.3f}".format(
+            size, serial_time, parallel_time, max(result.seconds for result in results)))
+
+
+def bench_validation(sizes=(10000, 100000)):
+    """
+    Times validating generated EER and ARM models against transforming
+    them, as the controller validates a model before every transformation.
+    """
+    print("validation: validate vs transform")
+    print("{:>10} {:>6} {:>12} {:>12}".format("entities", "model", "validate s", "transform s"))
+    for size in sizes:
+        for kind, lines, model_class, loader, transform in [
+                ("eer", model_generator.eer_xml_lines, eer.EER_Model, "load_eer",
+                 "transform_to_arm"),
+                ("arm", model_generator.arm_xml_lines, arm.ARM_Model, "load_arm",
+                 "transform_to_eer")]:
+            model = model_class()
+            getattr(model, loader)(model_generator.xml_file_object(lines(size)))
+            start = time.perf_counter()
+            problems = validation.validate(model)
+            validate_time = time.perf_counter() - start
+            assert problems == [], problems[:5]
+            start = time.perf_counter()
+            getattr(model, transform)()
+            transform_time = time.perf_counter() - start
+            print("{:>10} {:>6} {:>12.3f} {:>12.3f}".format(size, kind, validate_time,
+                                                            transform_time))
+
+
+def bench_graph(sizes=(10000, 100000), queries=1000):
+    """
+    Times building the graph of generated EER and ARM models, its first
+    analyses, and the mean time of each kind of query afterwards.
+    """
+    print("graph: build, analyse and query (mean of {} queries)".format(queries))
+    print("{:>10} {:>6} {:>10} {:>10} {:>11} {:>11} {:>11}".format(
+        "entities", "model", "build s", "analyse s", "ancest. us", "refs us", "scc us"))
+    for size in sizes:
+        for kind, lines, model_class, loader in [
+                ("eer", model_generator.eer_xml_lines, eer.EER_Model, "load_eer"),
+                ("arm", model_generator.arm_xml_lines, arm.ARM_Model, "load_arm")]:
+            model = model_class()
+            getattr(model, loader)(model_generator.xml_file_object(lines(size)))
+            start = time.perf_counter()
+            model_graph = graph.build_graph(model)
+            build_time = time.perf_counter() - start
+            start = time.perf_counter()
+            model_graph.get_longest_chain()
+            model_graph.get_reference_cycles()
+            analyse_time = time.perf_counter() - start
+            names = model_graph.get_nodes()[::max(1, len(model_graph) // queries)]
+            times = []
+            for query in [model_graph.get_ancestors, model_graph.get_referenced_by,
+                          model_graph.get_component]:
+                start = time.perf_counter()
+                for name in names:
+                    query(name)
+                times.append((time.perf_counter() - start) / len(names) * 1e6)
+            print("{:>10} {:>6} {:>10.3f} {:>10.3f} {:>11.2f} {:>11.2f} {:>11.2f}".format(
+                size, kind, build_time, analyse_time, *times))
+
+
+def traced_bytes_per_object(factory, count):
+    """Returns the traced memory per object of creating `count` objects."""
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def bench_memory(sizes=(1000000,)):
+    """
+    Reports the bytes used per attribute and constraint object - excluding
+    the (shared) strings they refer to - and the memory used by a generated
+    model with the given number of attributes.
+    """
+    factories = [
+        ("ARM_Attribute", lambda: arm.ARM_Attribute("name", "INT")),
+        ("EER_Attribute", lambda: eer.EER_Attribute("name", False, False, True)),
+        ("PK_Constraint", lambda: arm_constraints.PK_Constraint("self")),
+        ("FK_Constraint", lambda: arm_constraints.FK_Constraint("fk", "fk", "Ref")),
+        ("Inheritance_Constraint (ARM)", lambda: arm_constraints.Inheritance_Constraint("P")),
+        ("Pathfd_Constraint", lambda: arm_constraints.Pathfd_Constraint([], "self")),
+        ("Identifier_Constraint", lambda: eer_constraints.Identifier_Constraint([])),
+        ("Inheritance_Constraint (EER)",
+         lambda: eer_constraints.Inheritance_Constraint("P", True, False)),
+    ]
+    for size in sizes:
+        print("memory: bytes per object over {} objects".format(size))
+        for name, factory in factories:
+            print("{:>30} {:>8.1f}".format(name, traced_bytes_per_object(factory, size)))
+
+        num_entities = size // 5
+        for kind, lines, model_class, loader in [
+                ("eer", model_generator.eer_xml_lines, eer.EER_Model, "load_eer"),
+                ("arm", model_generator.arm_xml_lines, arm.ARM_Model, "load_arm")]:
+            source = model_generator.xml_file_object(lines(num_entities))
+            tracemalloc.start()
+            model = model_class()
+            getattr(model, loader)(source, stream=True)
+            model_size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("{} model with {} attributes: {:.1f} MB".format(
+                kind, size, model_size / 2**20))
+            if kind == "arm":
+                tracemalloc.start()
+                transformed = model.transform_to_eer()
+                transformed_size, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del transformed
+                print("{} model transformed to EER: {:.1f} MB".format(
+                    kind, transformed_size / 2**20))
+            del model
+        print("interning: {}".format(interning.get_stats()))
+
+
+BENCHMARKS = {
+    "load_eer": bench_load_eer,
+    "load_arm": bench_load_arm,
+    "snapshot": bench_snapshot,
+    "transform_to_eer": bench_transform_to_eer,
+    "transform_to_arm": bench_transform_to_arm,
+    "transform_to_arm_relationships": bench_transform_to_arm_relationships,
+    "transform_to_arm_memory": bench_transform_to_arm_memory,
+    "parallel": bench_parallel,
+    "incremental": bench_incremental,
+    "streaming": bench_streaming,
+    "fingerprint": bench_fingerprint,
+    "diff": bench_diff,
+    "roundtrip": bench_roundtrip,
+    "validation": bench_validation,
+    "graph": bench_graph,
+    "memory": bench_memory,
+}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[2:]]
+        if sizes:
+            BENCHMARKS[sys.argv[1]](sizes)
+        else:
+            BENCHMARKS[sys.argv[1]]()
+    else:
+        for benchmark in BENCHMARKS.values():
+            benchmark()
@@ -0,0 +1,126 @@
+"""
+A compact representation of the multiplicities of EER relationships.
+
+A multiplicity is written as a tuple of strings, e.g. ("0", "n"), ("1", "")
+or ("1",). `parse()` turns it, once, into a Cardinality with integer
+bounds, and the upper bound of a multiplicity containing "n" (or "N" or
+"*") is UNBOUNDED. There are only a few distinct multiplicities in a model,
+so each is parsed once and shared as a flyweight between every
+relationship that has it.
+
+A bound that is neither a number nor many does not stop a model from
+loading. Its Cardinality is invalid instead, and validation.py reports it.
+
+A Cardinality keeps the multiplicity as it was written, as a tuple - a
+list is converted, as the multiplicity is the key it is shared by.
+"""
+
+UNBOUNDED = -1                    # the upper bound of a multiplicity with "n"
+MANY = "n"
+MANY_BOUNDS = {"n", "N", "*"}     # the ways of writing many
+MAX_ENTRIES = 10000               # the cache is cleared when it holds this many
+
+
+class Cardinality:
+    """
+    A class used to represent the multiplicity of one end of a relationship.
+
+    Instances are shared, and must be treated as immutable.
+
+    Attributes
+    ----------
+    min : int
+        The lower bound, 0 if it is not given. None if a bound is invalid.
+    max : int
+        The upper bound, or UNBOUNDED. Equal to `min` if it is not given.
+        None if a bound is invalid.
+    mult : tuple of str
+        The multiplicity as it was written, e.g. ("0", "n").
+    """
+
+    __slots__ = ("min", "max", "mult")
+
+    def __init__(self, min, max, mult):
+        self.min = min
+        self.max = max
+        self.mult = mult
+
+    def is_valid(self):
+        """Checks if every bound is a number or many."""
+        return self.min is not None
+
+    def is_many(self):
+        """Checks if the multiplicity contains "n" - i.e. the `n` side of a relationship."""
+        return self.max == UNBOUNDED
+
+    def is_exact(self):
+        """Checks if the lower and upper bounds are the same, e.g. ("1",) or ("1", "1")."""
+        return self.min == self.max
+
+    def __eq__(self, other):
+        if not isinstance(other, Cardinality):
+            return NotImplemented
+        return self.min == other.min and self.max == other.max
+
+    def __hash__(self):
+        return hash((self.min, self.max))
+
+    def __str__(self):
+        """
+        String representation of the cardinality.
+        e.g. '0..n' or '1'
+        """
+        if not self.is_valid():
+            return "..".join(bound for bound in self.mult if bound != "")
+        if self.is_exact():
+            return str(self.min)
+        return "{}..{}".format(self.min, MANY if self.max == UNBOUNDED else self.max)
+
+
+CARDINALITIES = {}                # mult -> Cardinality
+
+
+def parse(mult):
+    """Returns the shared Cardinality of a multiplicity.
+
+    Args:
+        mult (tuple of str): The multiplicity, e.g. ("0", "n") or ("1",).
+                             A list is converted to a tuple.
+
+    Returns:
+        Cardinality: The bounds of `mult`, or None if `mult` is None. It is
+                     invalid if a bound is neither a number, many nor empty.
+    """
+    if mult is None:
+        return None
+    cardinality = CARDINALITIES.get(mult) if type(mult) is tuple else None
+    if cardinality is None:
+        mult = tuple(mult)
+        bounds = [parse_bound(bound) for bound in mult if bound.strip() != ""]
+        if None in bounds:
+            cardinality = Cardinality(None, None, mult)
+        elif UNBOUNDED in bounds:
+            # "n" makes the relationship many on this side, wherever it is
+            lower = bounds[0] if bounds[0] != UNBOUNDED else 0
+            cardinality = Cardinality(lower, UNBOUNDED, mult)
+        elif bounds:
+            cardinality = Cardinality(bounds[0], bounds[-1], mult)
+        else:
+            cardinality = Cardinality(0, 0, mult)
+        if len(CARDINALITIES) >= MAX_ENTRIES:
+            CARDINALITIES.clear()
+        CARDINALITIES[mult] = cardinality
+    return cardinality
+
+
+def parse_bound(bound):
+    """
+    Returns a bound as an int, UNBOUNDED for many, or None if it is neither.
+    Surrounding whitespace is ignored.
+    """
+    bound = bound.strip()
+    if bound in MANY_BOUNDS:
+        return UNBOUNDED
+    if not bound.isdigit():
+        return None
+    return int(bound)
@@ -4,6 +4,8 @@ from tkinter import messagebox
 from tkinter.scrolledtext import ScrolledText
 import arm
 import eer
+import transform_cache
+import validation
 import os  # for file path manipulation
 
 
@@ -27,6 +29,8 @@ class Controller():
         self.arm_model = None  # will store the currently loaded ARM model
         self.eer_loaded = False
         self.arm_loaded = False
+        # Transforming the same model again is answered from the cache
+        self.transform_cache = transform_cache.Transform_Cache()
         self.gui = view
         self.gui.load_menu.add_command(label="Load EER",
                                        command=self.open_eer_file_picker)
@@ -59,8 +63,8 @@ class Controller():
                 self.arm_loaded = False
                 self.gui.btn_transform.config(text="Transform to ARM")
                 self.gui.btn_transform.config(state="normal")
-            except:
-                messagebox.showinfo("Load Error", "Incorrect EER XML format")
+            except Exception as e:
+                messagebox.showinfo("Load Error", "Incorrect EER XML format\n{}".format(e))
 
         else:
             # User clicked cancel
@@ -83,8 +87,8 @@ class Controller():
                 self.eer_loaded = False
                 self.gui.btn_transform.config(text="Transform to EER")
                 self.gui.btn_transform.config(state="normal")
-            except:
-                messagebox.showinfo("Load Error", "Incorrect ARM XML format")
+            except Exception as e:
+                messagebox.showinfo("Load Error", "Incorrect ARM XML format\n{}".format(e))
         else:
             # User clicked cancel
             self.arm_filename = "No ARM file selected yet"
@@ -120,15 +124,28 @@ class Controller():
             messagebox.showinfo("Warning", "No ARM model to save")
 
     def transform(self):
+        # Every problem of the model is reported before anything is transformed
+        model = self.eer_model if self.eer_loaded else self.arm_model
+        problems = validation.validate(model) if model is not None else []
+        if problems:
+            self.show_problems(problems)
+            return
         if self.eer_loaded:
-            self.arm_model = self.eer_model.transform_to_arm()
+            self.arm_model = self.transform_cache.transform_to_arm(self.eer_model)
             self.gui.txt_arm.insert(tk.END, self.arm_model.__str__())
             self.gui.btn_transform.config(text="Transform")
             self.gui.btn_transform.config(state="disabled")
             self.arm_loaded = True
         elif self.arm_loaded:
-            self.eer_model = self.arm_model.transform_to_eer()
+            self.eer_model = self.transform_cache.transform_to_eer(self.arm_model)
             self.gui.txt_eer.insert(tk.END, self.eer_model.__str__())
             self.gui.btn_transform.config(text="Transform")
             self.gui.btn_transform.config(state="disabled")
             self.eer_loaded = True
+
+    def show_problems(self, problems, limit=20):
+        """Shows the first `limit` problems found in the loaded model."""
+        lines = [str(problem) for problem in problems[:limit]]
+        if len(problems) > limit:
+            lines.append("... and {} more".format(len(problems) - limit))
+        messagebox.showinfo("Validation Error", "\n".join(lines))
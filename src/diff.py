@@ -0,0 +1,295 @@
+"""
+Structural differences between two EER models or two ARM models.
+
+`diff_models()` matches the entities (and, for EER models, the
+relationships) of two models by name and compares each pair by its Merkle
+fingerprint (see fingerprint.py), so only the pairs that differ are
+examined further - their attributes are matched by name, and their
+constraints compared as multisets of fingerprints. As fingerprints are
+cached, diffing a model against several others only hashes it once.
+Relationships with the same name are paired in the order they are listed.
+
+The result is a Model_Diff, which can be inspected directly, printed as a
+short report, or written as compact JSON with `dumps()`.
+"""
+import collections
+import json
+import arm
+import eer
+import fingerprint
+
+
+class Entity_Diff:
+    """
+    A class used to represent the differences between two versions of an
+    entity or relationship with the same name.
+
+    Attributes, constraints and field values are given by their `str()`.
+
+    Attributes
+    ----------
+    name : str
+        The name of the entity or relationship.
+    added_attributes, removed_attributes : list of str
+        The attributes whose name only appears in the new or old version.
+    changed_attributes : list of (str, str)
+        The old and new versions of attributes with the same name.
+    added_constraints, removed_constraints : list of str
+        The constraints only found in the new or old version.
+    changed_fields : dict of str to (str, str)
+        The old and new values of other fields - e.g. "weak" or "mult1".
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.added_attributes = []
+        self.removed_attributes = []
+        self.changed_attributes = []
+        self.added_constraints = []
+        self.removed_constraints = []
+        self.changed_fields = {}
+
+    def to_dict(self):
+        """Returns the differences as a dictionary, leaving out empty lists."""
+        result = {}
+        attributes = {"added": self.added_attributes,
+                      "removed": self.removed_attributes,
+                      "changed": self.changed_attributes}
+        attributes = {key: value for key, value in attributes.items() if value}
+        if attributes:
+            result["attributes"] = attributes
+        constraints = {"added": self.added_constraints,
+                       "removed": self.removed_constraints}
+        constraints = {key: value for key, value in constraints.items() if value}
+        if constraints:
+            result["constraints"] = constraints
+        if self.changed_fields:
+            result["fields"] = self.changed_fields
+        return result
+
+    def __str__(self):
+        """
+        String representation of the differences.
+        e.g.
+        '~ Professor
+            + attribute: office (STRING)
+            - constraint: primary key (pnum)'
+        """
+        lines = ["~ {}".format(self.name)]
+        for field, (old, new) in self.changed_fields.items():
+            lines.append("    ~ {}: {} -> {}".format(field, old, new))
+        lines.extend("    + attribute: {}".format(a) for a in self.added_attributes)
+        lines.extend("    - attribute: {}".format(a) for a in self.removed_attributes)
+        lines.extend("    ~ attribute: {} -> {}".format(old, new)
+                     for old, new in self.changed_attributes)
+        lines.extend("    + constraint: {}".format(c) for c in self.added_constraints)
+        lines.extend("    - constraint: {}".format(c) for c in self.removed_constraints)
+        return "\n".join(lines)
+
+
+class Model_Diff:
+    """
+    A class used to represent the differences between two EER models or two
+    ARM models. Each list is sorted by name.
+
+    Attributes
+    ----------
+    kind : str
+        "eer" or "arm".
+    added_entities, removed_entities : list of str
+        The names of the entities only found in the new or old model.
+    changed_entities : list of Entity_Diff
+        The entities found in both models that differ.
+    added_relationships, removed_relationships : list of str
+        The names of the relationships only found in the new or old EER model.
+    changed_relationships : list of Entity_Diff
+        The relationships found in both EER models that differ.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.added_entities = []
+        self.removed_entities = []
+        self.changed_entities = []
+        self.added_relationships = []
+        self.removed_relationships = []
+        self.changed_relationships = []
+
+    def is_empty(self):
+        """Checks if the two models have the same structure."""
+        return not (self.added_entities or self.removed_entities or self.changed_entities
+                    or self.added_relationships or self.removed_relationships
+                    or self.changed_relationships)
+
+    def to_dict(self):
+        """Returns the differences as a dictionary of lists and strings, leaving out empty parts."""
+        result = {"kind": self.kind}
+        for key, added, removed, changed in [
+                ("entities", self.added_entities, self.removed_entities,
+                 self.changed_entities),
+                ("relationships", self.added_relationships, self.removed_relationships,
+                 self.changed_relationships)]:
+            part = {}
+            if added:
+                part["added"] = added
+            if removed:
+                part["removed"] = removed
+            if changed:
+                part["changed"] = {item.name: item.to_dict() for item in changed}
+            if part:
+                result[key] = part
+        return result
+
+    def dumps(self):
+        """Returns the differences as compact JSON."""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def __str__(self):
+        """
+        String representation of the differences, one line per item.
+        e.g.
+        '+ entity Lecturer
+        - relationship TeachesIn
+        ~ Professor
+            + attribute: office (STRING)'
+        """
+        lines = []
+        for label, added, removed, changed in [
+                ("entity", self.added_entities, self.removed_entities,
+                 self.changed_entities),
+                ("relationship", self.added_relationships, self.removed_relationships,
+                 self.changed_relationships)]:
+            lines.extend("+ {} {}".format(label, name) for name in added)
+            lines.extend("- {} {}".format(label, name) for name in removed)
+            lines.extend(str(item) for item in changed)
+        return "\n".join(lines) if lines else "No differences"
+
+
+def diff_models(old_model, new_model):
+    """Finds the structural differences between two models.
+
+    Args:
+        old_model (EER_Model or ARM_Model): The model before the change.
+        new_model (EER_Model or ARM_Model): The model after the change, of
+            the same kind as `old_model`.
+
+    Returns:
+        Model_Diff: The differences.
+
+    Raises:
+        AssertionError:
+            if the models are not of the same kind
+    """
+    assert type(old_model) == type(new_model), "Can only diff models of the same kind"
+    if isinstance(old_model, arm.ARM_Model):
+        model_diff = Model_Diff("arm")
+        model_diff.added_entities, model_diff.removed_entities, model_diff.changed_entities = \
+            diff_items(old_model.get_arm_entities(), new_model.get_arm_entities())
+        return model_diff
+
+    model_diff = Model_Diff("eer")
+    model_diff.added_entities, model_diff.removed_entities, model_diff.changed_entities = \
+        diff_items(old_model.get_eer_entities(), new_model.get_eer_entities())
+    (model_diff.added_relationships, model_diff.removed_relationships,
+     model_diff.changed_relationships) = \
+        diff_items(old_model.get_eer_relationships(), new_model.get_eer_relationships())
+    return model_diff
+
+
+def index_by_name(items):
+    """
+    Returns the items keyed by name - or, for the second and later items
+    with the same name, by the name and its occurrence.
+    """
+    index = {}
+    occurrences = collections.Counter()
+    for item in items:
+        name = item.get_name()
+        key = name if occurrences[name] == 0 else (name, occurrences[name])
+        occurrences[name] += 1
+        index[key] = item
+    return index
+
+
+def diff_items(old_items, new_items):
+    """
+    Matches two lists of entities or relationships by name.
+
+    Returns:
+        (list of str, list of str, list of Entity_Diff): The names of the
+            added and removed items, and the differences of the changed ones.
+    """
+    old_index = index_by_name(old_items)
+    new_index = index_by_name(new_items)
+    added = [new_index[key].get_name() for key in new_index if key not in old_index]
+    removed = [old_index[key].get_name() for key in old_index if key not in new_index]
+    changed = []
+    for key, old_item in old_index.items():
+        new_item = new_index.get(key)
+        if new_item is not None and fingerprint.fingerprint(old_item) != \
+                fingerprint.fingerprint(new_item):
+            changed.append(diff_entity(old_item, new_item))
+    added.sort()
+    removed.sort()
+    changed.sort(key=lambda item: item.name)
+    return added, removed, changed
+
+
+def diff_entity(old_item, new_item):
+    """Returns the Entity_Diff of two versions of an entity or relationship."""
+    entity_diff = Entity_Diff(old_item.get_name())
+
+    old_attributes = index_attributes(old_item)
+    new_attributes = index_attributes(new_item)
+    for name, attribute in new_attributes.items():
+        old_attribute = old_attributes.get(name)
+        if old_attribute is None:
+            entity_diff.added_attributes.append(str(attribute))
+        elif fingerprint.fingerprint(old_attribute) != fingerprint.fingerprint(attribute):
+            entity_diff.changed_attributes.append((str(old_attribute), str(attribute)))
+    entity_diff.removed_attributes = [str(attribute) for name, attribute in old_attributes.items()
+                                      if name not in new_attributes]
+
+    if not isinstance(old_item, eer.EER_Relationship):
+        old_constraints = {fingerprint.fingerprint(c): c for c in old_item.get_constraints()}
+        new_constraints = {fingerprint.fingerprint(c): c for c in new_item.get_constraints()}
+        old_counts = collections.Counter(fingerprint.fingerprint(c)
+                                         for c in old_item.get_constraints())
+        new_counts = collections.Counter(fingerprint.fingerprint(c)
+                                         for c in new_item.get_constraints())
+        for key, count in (new_counts - old_counts).items():
+            entity_diff.added_constraints.extend([str(new_constraints[key])] * count)
+        for key, count in (old_counts - new_counts).items():
+            entity_diff.removed_constraints.extend([str(old_constraints[key])] * count)
+
+    for field, getter in FIELDS.get(type(old_item), ()):
+        old_value = getattr(old_item, getter)()
+        new_value = getattr(new_item, getter)()
+        if old_value != new_value:
+            entity_diff.changed_fields[field] = (format_value(old_value),
+                                                 format_value(new_value))
+    return entity_diff
+
+
+def index_attributes(item):
+    """Returns the attributes of an entity or relationship keyed by name, first occurrence first."""
+    index = {}
+    for attribute in item.get_attributes():
+        index.setdefault(attribute.get_name(), attribute)
+    return index
+
+
+def format_value(value):
+    """Returns a field value as a string - a multiplicity such as ("0", "n") as '0..n'."""
+    if isinstance(value, tuple):
+        return "..".join(part for part in value if part != "")
+    return str(value)
+
+
+# The fields compared besides the attributes and constraints, and their getters
+FIELDS = {
+    eer.EER_Entity: [("weak", "is_weak")],
+    eer.EER_Relationship: [("entity1", "get_entity1"), ("mult1", "get_mult1"),
+                           ("entity2", "get_entity2"), ("mult2", "get_mult2"),
+                           ("weak", "is_weak")],
+}
@@ -1,7 +1,16 @@
 import xml.etree.ElementTree as ET
 import arm
 import arm_constraints
+import cardinality
 import eer_constraints
+import hierarchy
+import interning
+import lazy
+import resolution
+import xml_stream
+
+
+UNKNOWN_KIND = object()            # the kind of a relationship not yet worked out
 
 
 class EER_Model:
@@ -15,6 +24,8 @@ class EER_Model:
         The entities that together compose the EER Model.
     eer_relationships : list of EER_Relationship
         The entities that together compose the relationships between the EER Model.
+    entity_index : dict of str to EER_Entity
+        The entities keyed by name, for constant time lookups.
 
     Core Methods
     -------
@@ -33,17 +44,33 @@ class EER_Model:
         """
         self.__eer_entities = []
         self.__eer_relationships = []
+        self.__entity_index = {}
 
-    def add_eer_entity(self, new_eer_entity):
+    def add_eer_entity(self, new_eer_entity, allow_duplicate=False):
         """
         Adds an EER_Entity to the model.
 
+        Args:
+            new_eer_entity (EER_Entity): The entity to add.
+            allow_duplicate (bool): Optional - whether the entity may have the
+                                    name of an entity already in the model, as
+                                    when loading a file. It is then kept for
+                                    `validation.validate()` to report, and
+                                    `find_entity()` still finds the first.
+
         Raises:
             AssertionError:
                 if `new_arm_entity` supplied is not of type `EER_Entity`
+                or the model already has an entity with the same name
+                and `allow_duplicate` is False
         """
 
         assert type(new_eer_entity) == EER_Entity
+        name = new_eer_entity.get_name()
+        if name in self.__entity_index:
+            assert allow_duplicate, "Duplicate entity name: {}".format(name)
+        else:
+            self.__entity_index[name] = new_eer_entity
         self.__eer_entities.append(new_eer_entity)
 
     def add_eer_relationship(self, new_eer_relationship):
@@ -57,27 +84,35 @@ class EER_Model:
         assert type(new_eer_relationship) == EER_Relationship
         self.__eer_relationships.append(new_eer_relationship)
 
-    def load_eer(self, filename='EER_XML_Examples/EER_WeakPaymentLoan.xml'):
+    def load_eer(self, filename='EER_XML_Examples/EER_WeakPaymentLoan.xml', stream=False):
         """
         Loads and EER model from an XML file into a python object representation
+
+        If `stream` is True the file is parsed incrementally - each entity or
+        relationship is built as soon as its block has been read and the block
+        is then discarded, so the whole document is never held in memory.
+        When streaming, `filename` may also be an open file object or an
+        iterable of byte chunks. The resulting model is identical to the one
+        built when `stream` is False.
         """
-        tree = ET.parse(filename)
-        root = tree.getroot()
+        if stream:
+            blocks = xml_stream.iter_blocks(filename)
+        else:
+            blocks = ET.parse(filename).getroot()
 
-        num_elements = len(root)
-        for i in range(num_elements):
-            if(root[i].attrib["type"] == "Entity"):
-                self.load_entity(root[i])
+        for block in blocks:
+            if(block.attrib["type"] == "Entity"):
+                self.load_entity(block)
 
-            if(root[i].attrib["type"] == "Relationship"):
-                self.load_relationship(root[i])
+            if(block.attrib["type"] == "Relationship"):
+                self.load_relationship(block)
 
     def load_entity(self, entity_block):
         """
         Loads an EER entity from an XML file
         Helper method for the broader load_eer()
         """
-        entity = EER_Entity(entity_block.attrib["name"],
+        entity = EER_Entity(interning.string(entity_block.attrib["name"]),
                             self.parse_bool(entity_block.attrib["weak"]))
         entity_components = len(entity_block)
         for j in range(entity_components):
@@ -86,26 +121,28 @@ class EER_Model:
                 multi_valued = self.parse_bool(entity_block[j].attrib["multi_valued"])
                 derived = self.parse_bool(entity_block[j].attrib["derived"])
                 optional = self.parse_bool(entity_block[j].attrib["optional"])
-                entity.add_attribute(EER_Attribute(attr_name, multi_valued, derived, optional))
+                entity.add_attribute(interning.eer_attribute(attr_name, multi_valued,
+                                                             derived, optional))
             if(entity_block[j].attrib["type"] == "identifier"):
-                identifier = [entity_block[j].text]
+                identifier = [interning.string(entity_block[j].text)]
                 id_constraint = eer_constraints.Identifier_Constraint(identifier)
                 entity.add_constraint(id_constraint)
             if(entity_block[j].attrib["type"] == "inheritance"):
-                parent = entity_block[j].text
+                parent = interning.string(entity_block[j].text)
                 disjoint = self.parse_bool(entity_block[j].attrib["disjoint"])
                 covering = self.parse_bool(entity_block[j].attrib["covering"])
                 inherit_constraint = eer_constraints.Inheritance_Constraint(
                     parent, disjoint, covering)
                 entity.add_constraint(inherit_constraint)
-        self.add_eer_entity(entity)
+        # A duplicate name is reported by validation.validate(), with every other problem
+        self.add_eer_entity(entity, allow_duplicate=True)
 
     def load_relationship(self, relationship_block):
         """
         Loads an EER Relationship from an XML file
         Helper method for the broader load_eer()
         """
-        relationship = EER_Relationship(relationship_block.attrib["name"])
+        relationship = EER_Relationship(interning.string(relationship_block.attrib["name"]))
         weak = self.parse_bool(relationship_block.attrib["weak"])
         relationship.set_weak(weak)
         relationship_components = len(relationship_block)
@@ -116,20 +153,21 @@ class EER_Model:
                 multi_valued = self.parse_bool(relationship_block[j].attrib["multi_valued"])
                 derived = self.parse_bool(relationship_block[j].attrib["derived"])
                 optional = self.parse_bool(relationship_block[j].attrib["optional"])
-                relationship.add_attribute(EER_Attribute(attr_name,
-                                                         multi_valued,
-                                                         derived,
-                                                         optional))
+                relationship.add_attribute(interning.eer_attribute(attr_name,
+                                                                   multi_valued,
+                                                                   derived,
+                                                                   optional))
             if(relationship_block[j].attrib["type"] == "ent"):
+                entity_name = interning.string(relationship_block[j].text)
+                mult = (interning.string(relationship_block[j].attrib["mult_left"]),
+                        interning.string(relationship_block[j].attrib["mult_right"]))
                 if ent1 is True:
-                    relationship.set_entity1(relationship_block[j].text)
-                    relationship.set_mult1(
-                        (relationship_block[j].attrib["mult_left"], relationship_block[j].attrib["mult_right"]))
+                    relationship.set_entity1(entity_name)
+                    relationship.set_mult1(mult)
                     ent1 = False
                 else:
-                    relationship.set_entity2(relationship_block[j].text)
-                    relationship.set_mult2(
-                        (relationship_block[j].attrib["mult_left"], relationship_block[j].attrib["mult_right"]))
+                    relationship.set_entity2(entity_name)
+                    relationship.set_mult2(mult)
         self.add_eer_relationship(relationship)
 
     def parse_bool(self, value):
@@ -139,248 +177,133 @@ class EER_Model:
     def find_entity(self, entity_name):
         """
         Used to find an entity that matches an entity name
+        Returns None if there is no such entity
         """
-        for entity in self.eer_entities:
-            if(entity_name == entity.get_name()):
-                return entity
+        return self.__entity_index.get(entity_name)
 
-    def transform_to_arm(self):
+    def transform_to_arm(self, implicit_disjointness=True):
         """Applies the set of transformation rules for EER to ARM.
 
+        Args:
+            implicit_disjointness (bool): Whether to add the implicit
+                disjointness constraints (STEP VI), which span every relation
+                outside a hierarchy. They are left out when the model is only
+                part of a larger one (see `partition.py`).
+
         Returns:
             ARM: The ARM model resulting from the transformation from the
                  EER model given by `self`.
         """
-        arm_model = arm.ARM_Model()        # will store the new ARM model
+        # Parents are transformed before their subclasses, whatever the
+        # order of the entities in the model
+        eer_entities = hierarchy.schedule(self.__eer_entities)
+        arm_entities = [transform_entity_to_arm(eer_entity) for eer_entity in eer_entities]
+        return self.merge_arm_relations(eer_entities, arm_entities, implicit_disjointness)
 
-        # Create the relations for entities
-        for eer_entity in self.__eer_entities:
-            # Check first if the entity inherits from another entity
-            # If so, it will not have its own identifier
-            # since its identifier will be that of the parent entity
-            has_parent = False
-            for constraint in eer_entity.get_constraints():
-                if type(constraint) == eer_constraints.Inheritance_Constraint:
-                    has_parent = True
-
-            # STEP I: If the entity is 'strong'
-            if not eer_entity.is_weak() and not has_parent:
-                # STEP I_A - Table Declaration
-
-                name = eer_entity.get_name()
-                arm_entity = arm.ARM_Entity(name)
-                arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
-                for eer_attr in eer_entity.get_attributes():
-                    arm_attr = arm.ARM_Attribute(eer_attr.get_name(), "anyType")
-                    arm_entity.add_attribute(arm_attr)  # e.g "Runtime (anyType)"
-
-                # STEP I_B - Foreign Keys - done in the relationships section below
-
-                # STEP I_C - Primary Key
-
-                # Extract the identifier
-                pk = eer_entity.get_identifier()
-                arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
-                arm_entity.add_constraint(arm_constraints.Pathfd_Constraint(pk, "self"))
-                arm_model.add_arm_entity(arm_entity)
-            elif eer_entity.is_weak() and not has_parent:
-                # STEP II: If the entity is 'weak'
-                # STEP II_A - Table Declaration
-
-                name = eer_entity.get_name()
-                arm_entity = arm.ARM_Entity(name)
-                arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
-                for eer_attr in eer_entity.get_attributes():
-                    arm_attr = arm.ARM_Attribute(eer_attr.get_name(), "anyType")
-                    arm_entity.add_attribute(arm_attr)  # e.g "Runtime (anyType)"
-
-                # STEP II_B - Foreign Keys - done in the relationships section below
-
-                # STEP II_C - Primary Key
-
-                # Extract the PARTIAL identifier
-                pk = eer_entity.get_identifier()
-                arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
-                arm_entity.add_constraint(arm_constraints.Pathfd_Constraint(pk, "self"))
-                arm_model.add_arm_entity(arm_entity)
-            elif has_parent:
-                # Then this entity inherits from a parent
-                name = eer_entity.get_name()
-                arm_entity = arm.ARM_Entity(name)
-                arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
-                for eer_attr in eer_entity.get_attributes():
-                    arm_attr = arm.ARM_Attribute(eer_attr.get_name(), "anyType")
-                    arm_entity.add_attribute(arm_attr)
-
-                parent_name = None
-                covering = False
-                disjoint = False
-                for constraint in eer_entity.get_constraints():
-                    if type(constraint) == eer_constraints.Inheritance_Constraint:
-                        parent_name = constraint.get_parent()
-                        covering = constraint.is_covering()
-                        disjoint = constraint.is_disjoint()
-                # Since this entity inherits from a parent,
-                # there should be a corresponding inheritance constraint:
-                assert parent_name is not None
-
-                # Add an ISA constraint to this entity
-                arm_entity.add_constraint(arm_constraints.Inheritance_Constraint(parent_name))
-
-                # If disjoint, find all other entities that are disjoint
-                # subrelations of the parent and add to the disjointess constraint
-                if disjoint:
-                    disj_constraint = arm_constraints.Disjointness_Constraint([])
-                    for ent in arm_model.get_arm_entities():
-                        for constraint in ent.get_constraints():
-                            if type(constraint) == arm_constraints.Inheritance_Constraint \
-                                    and constraint.get_parent() == parent_name:
-                                # Add the other subrelation to this entity's disjointness constraint
-                                disj_constraint.add_to_disjoint_with(ent.get_name())
-                                # Find the other subrelation's disjointess constraint
-                                # and add this entity to it
-                                for in_constraint in ent.get_constraints():
-                                    if type(in_constraint) == arm_constraints.Disjointness_Constraint:
-                                        in_constraint.add_to_disjoint_with(name)
-                    arm_entity.add_constraint(disj_constraint)
-
-                # If covering, add to the cover constraint of the parent
-                if covering:
-                    parent_ent = arm_model.find_entity(parent_name)
-                    # There should be a parent ARM entity corresponding
-                    # to the parent name
-                    assert parent_ent is not None
-                    for constraint in parent_ent.get_constraints():
-                        # check for an existing cover constraint
-                        # if so, add to it
-                        if type(constraint) == arm_constraints.Cover_Constraint:
-                            constraint.add_to_covered_by(name)
-                            break
-                    else:
-                        # if there isnt yet a cover constraint in the parent
-                        parent_ent.add_constraint(arm_constraints.Cover_Constraint([name]))
-
-                arm_model.add_arm_entity(arm_entity)
-
-                # Create the relations for relationships
-        for relationship in self.__eer_relationships:
-            name = relationship.get_name()
-            entity1 = relationship.get_entity1()
-            entity2 = relationship.get_entity2()
-            mult1 = relationship.get_mult1()
-            mult2 = relationship.get_mult2()
-            attrs = relationship.get_attributes()
+    def merge_arm_relations(self, eer_entities, arm_entities, implicit_disjointness=True):
+        """Applies the transformation rules for EER to ARM that span several entities.
+
+        Args:
+            eer_entities (list of EER_Entity): The entities of the model,
+                parents before their subclasses (see `hierarchy.schedule()`).
+            arm_entities (iterable of ARM_Entity): The relation produced by
+                `transform_entity_to_arm()` for each of `eer_entities`, in order.
+            implicit_disjointness (bool): Whether to add the implicit
+                disjointness constraints (STEP VI).
 
+        Returns:
+            ARM: The ARM model resulting from the transformation from the
+                 EER model given by `self`.
+        """
+        arm_model = arm.ARM_Model()        # will store the new ARM model
+        # The subclasses of every parent, indexed once up front
+        hierarchy_index = hierarchy.Hierarchy_Index(eer_entities)
+        disjoint_groups = {}               # parent name -> Disjointness_Group
+
+        for arm_entity in arm_entities:
+            name = arm_entity.get_name()
+            parent_name = hierarchy_index.get_parent(name)
+
+            # If disjoint, this entity is disjoint with the other disjoint
+            # subrelations of the parent, which all share one group of names
+            if parent_name is not None and hierarchy_index.is_disjoint(name):
+                group = disjoint_groups.get(parent_name)
+                if group is None:
+                    group = arm_constraints.Disjointness_Group(
+                        hierarchy_index.get_disjoint_children(parent_name))
+                    disjoint_groups[parent_name] = group
+                arm_entity.add_constraint(
+                    arm_constraints.Disjointness_Constraint(group, owner=name))
+
+            arm_model.add_arm_entity(arm_entity)
+
+        # The covering subrelations of each parent make up its cover constraint
+        for parent_name in hierarchy_index.get_parents():
+            covered_by = hierarchy_index.get_covering_children(parent_name)
+            if covered_by:
+                parent_ent = arm_model.find_entity(parent_name)
+                # There should be a parent ARM entity corresponding
+                # to the parent name
+                assert parent_ent is not None
+                parent_ent.add_constraint(arm_constraints.Cover_Constraint(covered_by))
+
+        # Create the relations for relationships, each resolved in constant
+        # time to the relations it affects
+        resolver = resolution.Relationship_Resolver(self, arm_model)
+        for resolved in resolver.resolve_all(self.__eer_relationships):
             # Check for WEAK relationship
             # If so, extend the pathfd constraint of the WEAK entity beyond the partial identifier accordinly
-            if relationship.is_weak():
-                # We must first find whether it is entity1 or entity2 that is WEAK
-                weak_entity = entity1  # assume it is entity1, then check if it is actually entity2
-                for ent in self.__eer_entities:
-                    if ent.get_name() == entity2 and ent.is_weak():
-                        weak_entity = entity2
-
-                for ent in arm_model.get_arm_entities():
-                    if ent.get_name() == weak_entity:
-                        victim_entity = ent
-                        for constraint in victim_entity.get_constraints():
-                            if type(constraint) == arm_constraints.Pathfd_Constraint:
-                                if constraint.get_target() == 'self':
-                                    # If here, we have found the appropriate Pathfd to edit
-                                    if weak_entity == entity1:
-                                        constraint.set_attributes(
-                                            constraint.get_attributes() + [entity2.lower()])
-                                    else:
-                                        constraint.set_attributes(
-                                            constraint.get_attributes() + [entity1.lower()])
-                        break
-
-            # Check that multiplicities exist, before we iterate over them using 'in' in the for loop below
-            if mult1 is None or mult2 is None:
+            if resolved.weak_victim is not None:
+                extend_key_pathfd(resolved.weak_victim, resolved.owner)
+
+            # Check that multiplicities exist
+            if resolved.kind is None:
                 continue
 
-            if ("n" not in mult1 and "n" not in mult2) or ("n" in mult1 and "n" not in mult2):
-                # Then one to one, or many-to-one relationship
-                # No need for a new relation - just add foreign key to first entity
-
-                # Find the ARM_Entity object corresponding to the name entity1
-                # This corresponds to the `n` side of the many-to-one relationship
-                victim_entity = "placeholder"
-                for ent in arm_model.get_arm_entities():
-                    if ent.get_name() == entity1:
-                        victim_entity = ent  # found the ARM entity to add the foreign key to
-
-                assert victim_entity != "placeholder"  # checking a victim entity has been found
-                # Add foreign key - the name of the other entity
-                fk_name = entity2.lower()
-                victim_entity.add_attribute(arm.ARM_Attribute(fk_name, "OID"))
-                victim_entity.add_constraint(
-                    arm_constraints.FK_Constraint(fk_name,
-                                                  fk_name,
-                                                  entity2))
-            elif "n" not in mult1 and "n" in mult2:
-                # One-to-many relationship
-                # Add foreign key to the entity on the n side of the relationship
-
-                # Find the ARM_Entity object corresponding to the name entity2
-                # This corresponds to the `n` side of the one-to-many relationship
-                victim_entity = "placeholder"
-                for ent in arm_entities:
-                    if ent.get_name() == entity2:
-                        victim_entity = ent
-
-                assert victim_entity != "placeholder"  # checking a victim entity has been found
-                # Add foreign key - the name of the other entity
-                fk_name = entity1.lower()
-                victim_entity.add_attribute(arm.ARM_Attribute(fk_name, "OID"))
-                victim_entity.add_constraint(
-                    arm_constraints.FK_Constraint(fk_name, fk_name, entity1))
+            if resolved.kind != resolution.MANY_TO_MANY:
+                # One-to-one, many-to-one or one-to-many relationship
+                # No need for a new relation - just add a foreign key to the
+                # entity on the `n` side of the relationship (entity1 if neither is)
+                assert resolved.victim is not None  # checking a victim entity has been found
+                add_foreign_key(resolved.victim, resolved.referenced)
             else:
                 # Many-to-many, so add a new entity for the relationship
-                new_entity = arm.ARM_Entity(name)
-                new_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
-                new_entity.add_attribute(arm.ARM_Attribute(entity1.lower(), "anyType"))
-                new_entity.add_attribute(arm.ARM_Attribute(entity2.lower(), "anyType"))
-                for attribute in attrs:
-                    new_entity.add_attribute(arm.ARM_Attribute(attribute.get_name(), "anyType"))
-                new_entity.add_constraint(arm_constraints.PK_Constraint("self"))
-                new_entity.add_constraint(arm_constraints.Pathfd_Constraint(
-                    [entity1.lower(), entity2.lower()], "self"))
-                new_entity.add_constraint(arm_constraints.FK_Constraint(
-                    entity1.lower(), entity1.lower(), entity1))
-                new_entity.add_constraint(arm_constraints.FK_Constraint(
-                    entity2.lower(), entity2.lower(), entity2))
-                arm_model.add_arm_entity(new_entity)
+                arm_model.add_arm_entity(transform_relationship_to_arm(resolved.relationship))
 
         # STEP VI: Additional 'implicit' disjointness constraints
-        non_hierarchy_entities = []
-        for arm_entity in arm_model.get_arm_entities():
-            # Check if the entity inherits from another entity
-            has_parent = False
-            for constraint in arm_entity.get_constraints():
-                if type(constraint) == arm_constraints.Inheritance_Constraint:
-                    has_parent = True
-            if not has_parent:
-                non_hierarchy_entities.append(arm_entity.get_name())
-        for arm_entity in arm_model.get_arm_entities():
-            has_parent = False
-            for constraint in arm_entity.get_constraints():
-                if type(constraint) == arm_constraints.Inheritance_Constraint:
-                    has_parent = True
-            if not has_parent:
-                implicit_disjoint_entities = non_hierarchy_entities.copy()
-                implicit_disjoint_entities.remove(arm_entity.get_name())
-                if len(implicit_disjoint_entities) > 0:
-                    arm_entity.add_constraint(
-                        arm_constraints.Disjointness_Constraint(
-                            implicit_disjoint_entities))
+        if implicit_disjointness:
+            add_implicit_disjointness(arm_model)
 
         return arm_model
 
+    def transform_to_lazy_arm(self):
+        """Applies the set of transformation rules for EER to ARM on demand.
+
+        Returns:
+            Lazy_ARM_Model: An ARM model that produces each relation of
+                `transform_to_arm()` when it is first accessed.
+        """
+        return lazy.Lazy_ARM_Model(self)
+
     def get_eer_entities(self):
         """Returns the list of EER Entities contained in the model"""
         return self.__eer_entities
 
+    def get_relationships_by_kind(self):
+        """
+        Returns the relationships bucketed by their kind, e.g.
+        resolution.MANY_TO_MANY (None for those missing a multiplicity),
+        each bucket in the order of the model
+        """
+        buckets = {}
+        for relationship in self.__eer_relationships:
+            kind = relationship.get_kind()
+            if kind in buckets:
+                buckets[kind].append(relationship)
+            else:
+                buckets[kind] = [relationship]
+        return buckets
+
     def get_eer_relationships(self):
         """Returns the list of EER Relationships contained in the model"""
         return self.__eer_relationships
@@ -419,6 +342,11 @@ class EER_Relationship:
         The multiplicity for entity 2 e.g. ("1",)
     weak : bool
         If it is a weak EER Relationship
+
+    The multiplicities are held as shared Cardinality objects (see
+    cardinality.py), parsed once when they are set, and the kind of the
+    relationship is cached until they change. A multiplicity given as a
+    list is held, and returned, as a tuple.
     """
 
     def __init__(self, name, entity1=None, entity2=None, mult1=None, mult2=None, weak=False):
@@ -426,13 +354,17 @@ class EER_Relationship:
         self.__attributes = []
         self.__entity1 = entity1
         self.__entity2 = entity2
-        self.__mult1 = mult1
-        self.__mult2 = mult2
+        self.set_mult1(mult1)
+        self.set_mult2(mult2)
+        self.__kind = UNKNOWN_KIND         # worked out by get_kind()
         self.__weak = weak
+        # The digest cached by fingerprint.py, cleared by every setter
+        self._fingerprint = None
 
     def add_attribute(self, attribute):
         """Add an attribute to the relationship"""
         self.__attributes.append(attribute)
+        self._fingerprint = None
 
     def get_attributes(self, index=-1):
         """
@@ -445,22 +377,30 @@ class EER_Relationship:
 
     def set_name(self, name):
         self.__name = name
+        self._fingerprint = None
 
     def set_entity1(self, entity1):
         self.__entity1 = entity1
+        self._fingerprint = None
 
     def set_entity2(self, entity2):
         self.__entity2 = entity2
+        self._fingerprint = None
 
     def set_mult1(self, mult1):
-        self.__mult1 = mult1
+        self.__card1 = cardinality.parse(mult1)
+        self.__kind = UNKNOWN_KIND
+        self._fingerprint = None
 
     def set_mult2(self, mult2):
-        self.__mult2 = mult2
+        self.__card2 = cardinality.parse(mult2)
+        self.__kind = UNKNOWN_KIND
+        self._fingerprint = None
 
     def set_weak(self, is_weak):
         """Set whether or not the entity is weak"""
         self.__weak = is_weak
+        self._fingerprint = None
 
     def get_name(self):
         """Get the name of the relationship"""
@@ -476,11 +416,29 @@ class EER_Relationship:
 
     def get_mult1(self):
         """Returns entity1's multiplicity"""
-        return self.__mult1
+        return self.__card1.mult if self.__card1 is not None else None
 
     def get_mult2(self):
         """Returns entity2's multiplicity'"""
-        return self.__mult2
+        return self.__card2.mult if self.__card2 is not None else None
+
+    def get_cardinality1(self):
+        """Returns entity1's multiplicity as a Cardinality, or None"""
+        return self.__card1
+
+    def get_cardinality2(self):
+        """Returns entity2's multiplicity as a Cardinality, or None"""
+        return self.__card2
+
+    def get_kind(self):
+        """
+        Returns the kind of the relationship - resolution.ONE_TO_ONE,
+        ONE_TO_MANY, MANY_TO_ONE or MANY_TO_MANY - or None if either
+        multiplicity is missing
+        """
+        if self.__kind is UNKNOWN_KIND:
+            self.__kind = resolution.get_cardinality_kind(self.__card1, self.__card2)
+        return self.__kind
 
     def is_weak(self):
         """Check if it is a weak relationship"""
@@ -499,14 +457,16 @@ class EER_Relationship:
             for attribute in self.__attributes:
                 relationship += "   " + str(attribute) + "\n"
         relationship += "Entities:\n"
-        relationship += "   " + self.__entity1 + " (" + self.__mult1[0]
-        if(len(self.__mult1) > 1 and self.__mult1[1] != ""):
-            relationship += ".." + self.__mult1[1]
+        mult1 = self.get_mult1()
+        relationship += "   " + self.__entity1 + " (" + mult1[0]
+        if(len(mult1) > 1 and mult1[1] != ""):
+            relationship += ".." + mult1[1]
         relationship += ")\n"
 
-        relationship += "   " + self.__entity2 + " (" + self.__mult2[0]
-        if(len(self.__mult2) > 1 and self.__mult2[1] != ""):
-            relationship += ".." + self.__mult2[1]
+        mult2 = self.get_mult2()
+        relationship += "   " + self.__entity2 + " (" + mult2[0]
+        if(len(mult2) > 1 and mult2[1] != ""):
+            relationship += ".." + mult2[1]
         relationship += ")\n"
 
         return relationship
@@ -541,6 +501,11 @@ class EER_Entity:
         self.__weak = weak
         self.__attributes = []
         self.__constraints = []
+        self.__attribute_index = {}
+        self.__constraints_by_type = {}
+        self.__constraint_index = {}       # key() -> constraint, to skip duplicates
+        # The digest cached by fingerprint.py, cleared by every setter
+        self._fingerprint = None
 
     def get_name(self):
         """Returns the entity name"""
@@ -549,6 +514,7 @@ class EER_Entity:
     def set_weak(self, is_weak):
         """Set whether or not the entity is weak"""
         self.__weak = is_weak
+        self._fingerprint = None
 
     def is_weak(self):
         """Check if the entity is weak"""
@@ -557,6 +523,8 @@ class EER_Entity:
     def add_attribute(self, attribute):
         """Add an attribute to the entity"""
         self.__attributes.append(attribute)
+        self.__attribute_index.setdefault(attribute.get_name(), attribute)
+        self._fingerprint = None
 
     def get_attributes(self, index=-1):
         """
@@ -568,35 +536,59 @@ class EER_Entity:
         return self.__attributes[index]
 
     def add_constraint(self, constraint):
-        """Add a constraint on the entity"""
-        assert(len(self.__constraints) <= 2)
+        """
+        Add a constraint on the entity, unless it already has an equal one.
+        An entity should have at most one identifier and one inheritance
+        constraint (see validation.py).
+        """
+        key = constraint.key()
+        if key in self.__constraint_index:
+            return
+        self.__constraint_index[key] = constraint
         self.__constraints.append(constraint)
+        constraint_type = type(constraint)
+        if constraint_type in self.__constraints_by_type:
+            self.__constraints_by_type[constraint_type].append(constraint)
+        else:
+            self.__constraints_by_type[constraint_type] = [constraint]
+        self._fingerprint = None
 
     def get_constraints(self):
         """Get all the constraints of the entity"""
         return self.__constraints
 
+    def get_constraints_of_type(self, constraint_type):
+        """Get the constraints of the given class, e.g. Identifier_Constraint"""
+        return self.__constraints_by_type.get(constraint_type, [])
+
+    def find_attribute(self, attribute_name):
+        """Returns the attribute with the given name, or None if there is none"""
+        return self.__attribute_index.get(attribute_name)
+
     def get_identifier(self):
         """
         Get the identifier(s) constraint on the entity
         Returns a str list in format ["identifier1", "identifier2", etc...]
         """
-        identifiers = None
-        for constraint in self.__constraints:
-            if(type(constraint) == eer_constraints.Identifier_Constraint):
-                identifiers = constraint.get_identifier()
-                break
-        return identifiers
+        constraints = self.get_constraints_of_type(eer_constraints.Identifier_Constraint)
+        if constraints:
+            return constraints[0].get_identifier()
+        return None
 
     def get_inheritance_constraint(self):
         """
-        Returns the Inheritance Constraint object associated with this entity1
-        NOTE - this method should only be called after checking if the entity is
-        inherited from by calling the is_inherited_from() method first
+        Returns the Inheritance Constraint object associated with this entity,
+        or None if the entity does not inherit from a parent
         """
-        for constraint in self.__constraints:
-            if(type(constraint) == eer_constraints.Inheritance_Constraint):
-                return constraint
+        constraints = self.get_constraints_of_type(eer_constraints.Inheritance_Constraint)
+        if constraints:
+            return constraints[0]
+        return None
+
+    def get_parent(self):
+        """Returns the name of the parent entity, or None if the entity does not inherit."""
+        inheritance = self.get_inheritance_constraint()
+        return inheritance.get_parent() if inheritance is not None else None
 
     def __str__(self):
         """A textual representation of an EER Entity"""
@@ -633,6 +625,9 @@ class EER_Attribute:
         Whether or not the attribute is optional
     """
 
+    # _fingerprint caches the digest of the attribute (see fingerprint.py)
+    __slots__ = ("__name", "__multi_valued", "__derived", "__optional", "_fingerprint")
+
     def __init__(self, name, multi_valued=False, derived=False, optional=False):
         """
         Args:
@@ -685,3 +680,144 @@ class EER_Attribute:
         if(previous == True):
             attribute += ")"
         return attribute
+
+
+def add_implicit_disjointness(arm_model):
+    """
+    Applies STEP VI of the transformation from EER to ARM - every relation
+    that does not inherit from another relation is disjoint with all the others.
+    """
+    # Find the entities that do not inherit from another entity
+    non_hierarchy_entities = []
+    for arm_entity in arm_model.get_arm_entities():
+        if arm_entity.get_parent() is None:
+            non_hierarchy_entities.append(arm_entity)
+    # Each of these entities is disjoint with all the others, so they all
+    # share a single group rather than each holding a list of the others
+    if len(non_hierarchy_entities) > 1:
+        implicit_disjoint_group = arm_constraints.Disjointness_Group(
+            [arm_entity.get_name() for arm_entity in non_hierarchy_entities])
+        for arm_entity in non_hierarchy_entities:
+            arm_entity.add_constraint(
+                arm_constraints.Disjointness_Constraint(
+                    implicit_disjoint_group, owner=arm_entity.get_name()))
+
+
+def transform_entity_to_arm(eer_entity):
+    """Applies the transformation rules for EER to ARM that involve a single entity.
+
+    The foreign keys, disjointness and cover constraints, which depend on
+    other entities and relationships, are added by `EER_Model.merge_arm_relations()`.
+
+    Returns:
+        ARM_Entity: The relation for `eer_entity`.
+    """
+    # Check first if the entity inherits from another entity
+    # If so, it will not have its own identifier
+    # since its identifier will be that of the parent entity
+    inheritance = eer_entity.get_inheritance_constraint()
+    has_parent = inheritance is not None
+
+    # STEP I: If the entity is 'strong'
+    if not eer_entity.is_weak() and not has_parent:
+        # STEP I_A - Table Declaration
+
+        name = eer_entity.get_name()
+        arm_entity = arm.ARM_Entity(name)
+        arm_entity.add_attribute(interning.arm_attribute("self", "OID"))
+        for eer_attr in eer_entity.get_attributes():
+            arm_attr = interning.arm_attribute(eer_attr.get_name(), "anyType")
+            arm_entity.add_attribute(arm_attr)  # e.g "Runtime (anyType)"
+
+        # STEP I_B - Foreign Keys - done in the relationships section below
+
+        # STEP I_C - Primary Key
+
+        # Extract the identifier
+        pk = eer_entity.get_identifier()
+        arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+        arm_entity.add_constraint(arm_constraints.Pathfd_Constraint(pk, "self"))
+        return arm_entity
+    elif eer_entity.is_weak() and not has_parent:
+        # STEP II: If the entity is 'weak'
+        # STEP II_A - Table Declaration
+
+        name = eer_entity.get_name()
+        arm_entity = arm.ARM_Entity(name)
+        arm_entity.add_attribute(interning.arm_attribute("self", "OID"))
+        for eer_attr in eer_entity.get_attributes():
+            arm_attr = interning.arm_attribute(eer_attr.get_name(), "anyType")
+            arm_entity.add_attribute(arm_attr)  # e.g "Runtime (anyType)"
+
+        # STEP II_B - Foreign Keys - done in the relationships section below
+
+        # STEP II_C - Primary Key
+
+        # Extract the PARTIAL identifier
+        pk = eer_entity.get_identifier()
+        arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+        arm_entity.add_constraint(arm_constraints.Pathfd_Constraint(pk, "self"))
+        return arm_entity
+    else:
+        # Then this entity inherits from a parent
+        name = eer_entity.get_name()
+        arm_entity = arm.ARM_Entity(name)
+        arm_entity.add_attribute(interning.arm_attribute("self", "OID"))
+        for eer_attr in eer_entity.get_attributes():
+            arm_attr = interning.arm_attribute(eer_attr.get_name(), "anyType")
+            arm_entity.add_attribute(arm_attr)
+
+        # Add an ISA constraint to this entity
+        arm_entity.add_constraint(arm_constraints.Inheritance_Constraint(inheritance.get_parent()))
+        return arm_entity
+
+
+def extend_key_pathfd(arm_entity, owner):
+    """
+    Extends the key pathfd of the relation of a weak entity, if it has one,
+    with the foreign key to the entity `owner` that the weak entity belongs to.
+    """
+    constraint = arm_entity.get_key_pathfd()
+    column = interning.lower(owner)
+    # Another weak relationship to the same owner has already added its column
+    if constraint is not None and column not in constraint.get_attributes():
+        # If here, we have found the appropriate Pathfd to edit
+        constraint.set_attributes(constraint.get_attributes() + [column])
+
+
+def add_foreign_key(arm_entity, referenced):
+    """
+    Adds a foreign key to the entity named `referenced` to an ARM_Entity,
+    unless it already has that foreign key - the foreign key of another
+    relationship between the same two entities. An attribute that only has
+    the name of the foreign key becomes its column.
+    """
+    # Add foreign key - the name of the other entity
+    fk_name = interning.lower(referenced)
+    existing = arm_entity.get_fk(fk_name)
+    if existing is not None and existing.get_references() == referenced:
+        return
+    if arm_entity.find_attribute(fk_name) is None:
+        arm_entity.add_attribute(interning.arm_attribute(fk_name, "OID"))
+    arm_entity.add_constraint(arm_constraints.FK_Constraint(fk_name, fk_name, referenced))
+
+
+def transform_relationship_to_arm(relationship):
+    """Returns the new relation for a many-to-many EER_Relationship."""
+    name = relationship.get_name()
+    entity1 = relationship.get_entity1()
+    entity2 = relationship.get_entity2()
+    new_entity = arm.ARM_Entity(name)
+    new_entity.add_attribute(interning.arm_attribute("self", "OID"))
+    new_entity.add_attribute(interning.arm_attribute(interning.lower(entity1), "anyType"))
+    new_entity.add_attribute(interning.arm_attribute(interning.lower(entity2), "anyType"))
+    for attribute in relationship.get_attributes():
+        new_entity.add_attribute(interning.arm_attribute(attribute.get_name(), "anyType"))
+    new_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+    new_entity.add_constraint(arm_constraints.Pathfd_Constraint(
+        [interning.lower(entity1), interning.lower(entity2)], "self"))
+    new_entity.add_constraint(arm_constraints.FK_Constraint(
+        interning.lower(entity1), interning.lower(entity1), entity1))
+    new_entity.add_constraint(arm_constraints.FK_Constraint(
+        interning.lower(entity2), interning.lower(entity2), entity2))
+    return new_entity
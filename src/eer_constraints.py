@@ -7,8 +7,30 @@ class Constraint:
     Acts as an abstract class - it is never itself instantiated, instead
     the Identifier_Constraint and Inheritance_Constraint classes below
     inherit from this class and are themselves instantiated.
+
+    Constraints are values: two constraints are equal, and hash alike, if
+    their `key()`s are equal.
     """
 
+    # _fingerprint caches the digest of the constraint (see fingerprint.py),
+    # and is cleared by every setter
+    __slots__ = ("_fingerprint",)
+
+    def key(self):
+        """
+        Returns the values the constraint constrains, after a tag naming its
+        class - with the names of an unordered list sorted.
+        """
+        return (type(self).__name__,)
+
+    def __eq__(self, other):
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
     def __str__(self):
         return "Constraint object"
 
@@ -23,6 +45,8 @@ class Identifier_Constraint(Constraint):
         The name of the EER Attribute/s that forms the identifier
     """
 
+    __slots__ = ("__identifier",)
+
     def __init__(self, identifier):
         assert(type(identifier) == list)
         self.__identifier = identifier
@@ -31,6 +55,9 @@ class Identifier_Constraint(Constraint):
         """Getter for the identifier."""
         return self.__identifier
 
+    def key(self):
+        return ("identifier",) + tuple(sorted(self.__identifier))
+
     def __str__(self):
         """
         String representation of the identifier constraint.
@@ -50,6 +77,8 @@ class Inheritance_Constraint(Constraint):
         The name of the parent entity
     """
 
+    __slots__ = ("__parent", "__disjoint", "__covering")
+
     def __init__(self, parent_name, disjoint, covering):
         """
         Disjoint and covering are booleans declaring whether the
@@ -71,6 +100,9 @@ class Inheritance_Constraint(Constraint):
         """Check for covering inheritance."""
         return self.__covering
 
+    def key(self):
+        return ("isa", self.__parent, self.__disjoint, self.__covering)
+
     def __str__(self):
         """
         String representation of the inheritance constraint.
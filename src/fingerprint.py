@@ -0,0 +1,261 @@
+"""
+Canonical Merkle fingerprints of EER and ARM models.
+
+`fingerprint()` returns a SHA-256 digest of an attribute, constraint,
+entity, relationship or model, built from the digests of its parts - so
+two objects have the same fingerprint exactly when they have the same
+structure. Parts whose order carries no meaning are combined as a
+multiset (the sum of their digests modulo 2**256), which makes the
+fingerprint independent of their order:
+    - the entities and relationships of a model,
+    - the attributes and constraints of an entity or relationship,
+    - the names in identifiers, pathfds, cover and disjointness constraints.
+The two ends of a relationship keep their order, since each has its own
+multiplicity.
+
+Digests are cached on the objects. Attributes are immutable, and every
+setter of a constraint, disjointness group, entity and relationship clears
+its cached digest, so these must be modified through their setters. As
+constraints can be modified after they are added to an entity, an entity
+keeps the digests of its constraints alongside its own and recomputes it
+if one of those has changed; a model does the same with the digests of its
+entities and relationships. Fingerprinting a model again after editing a
+few entities therefore only hashes those entities.
+"""
+import hashlib
+import arm
+import arm_constraints
+import eer
+import eer_constraints
+
+MODULUS = 2**256
+
+
+def digest(*parts):
+    """
+    Returns the SHA-256 digest of a sequence of str, bytes, bool, None and
+    tuple parts. A tuple, such as a multiplicity, is digested as a sequence.
+    """
+    data = []
+    for part in parts:
+        if type(part) is str:
+            part = part.encode("utf-8")
+        elif part is None:
+            part = b"\x00"
+        elif part is True:
+            part = b"\x01"
+        elif part is False:
+            part = b"\x02"
+        elif type(part) is tuple:
+            part = digest(*part)
+        data.append(len(part).to_bytes(4, "big"))
+        data.append(part)
+    return hashlib.sha256(b"".join(data)).digest()
+
+
+def multiset_sum(digests):
+    """Returns the order-independent sum of a collection of digests, as an int."""
+    return sum(int.from_bytes(part, "big") for part in digests) % MODULUS
+
+
+def multiset_digest(digests):
+    """Returns the order-independent combination of a collection of digests."""
+    return multiset_sum(digests).to_bytes(32, "big")
+
+
+def name_set_digest(names):
+    """Returns the order-independent digest of a collection of names."""
+    return multiset_digest(digest(name) for name in names)
+
+
+def fingerprint(obj):
+    """Returns the Merkle fingerprint of a model or of any of its parts.
+
+    Args:
+        obj: An EER_Model, ARM_Model or one of their entities, relationships,
+             attributes or constraints.
+
+    Returns:
+        bytes: The 32 byte digest.
+
+    Raises:
+        AssertionError:
+            if `obj` is not part of an EER or ARM model
+    """
+    function = FINGERPRINTS.get(type(obj))
+    assert function is not None, "Cannot fingerprint {}".format(type(obj).__name__)
+    return function(obj)
+
+
+def hexdigest(obj):
+    """Returns the fingerprint of `obj` as a hex string."""
+    return fingerprint(obj).hex()
+
+
+def equal(obj1, obj2):
+    """Checks if two models, or parts of models, have the same structure."""
+    return type(obj1) == type(obj2) and fingerprint(obj1) == fingerprint(obj2)
+
+
+def get_entity_fingerprints(model):
+    """Returns the fingerprint of every entity (and relationship) of a model keyed by name."""
+    if isinstance(model, arm.ARM_Model):
+        items = model.get_arm_entities()
+    else:
+        items = model.get_eer_entities() + model.get_eer_relationships()
+    return {item.get_name(): fingerprint(item) for item in items}
+
+
+def cached(obj, function):
+    """Returns the digest cached on a leaf `obj`, computing it with `function` if cleared."""
+    value = getattr(obj, "_fingerprint", None)
+    if value is None:
+        value = function(obj)
+        obj._fingerprint = value
+    return value
+
+
+def cached_composite(obj, stamp, function):
+    """
+    Returns the digest cached on a composite `obj` if it was computed from
+    the same `stamp` - the digests of the parts that can change without
+    `obj` clearing its cache - otherwise computes it with `function`.
+    """
+    cache = getattr(obj, "_fingerprint", None)
+    if cache is not None and cache[0] == stamp:
+        return cache[1]
+    value = function(obj)
+    obj._fingerprint = (stamp, value)
+    return value
+
+
+# ARM
+
+def arm_attribute_fingerprint(attribute):
+    return cached(attribute, lambda a: digest("arm.attribute", a.get_name(),
+                                              a.get_data_type()))
+
+
+def pk_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("arm.pk", c.get_pk()))
+
+
+def fk_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("arm.fk", c.get_name(), c.get_fk(),
+                                               c.get_references()))
+
+
+def arm_inheritance_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("arm.isa", c.get_parent()))
+
+
+def cover_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("arm.cover",
+                                               name_set_digest(c.get_covered_by())))
+
+
+def group_sum(group):
+    """Returns the multiset sum of the names in a Disjointness_Group, cached on the group."""
+    return cached(group, lambda g: multiset_sum(digest(name) for name in g.get_members()))
+
+
+def disjointness_fingerprint(constraint):
+    # A shared group is hashed once, and each member's constraint removes
+    # itself from the group's sum rather than hashing the other members
+    total = group_sum(constraint.get_group())
+    cache = getattr(constraint, "_fingerprint", None)
+    if cache is not None and cache[0] is total:
+        return cache[1]
+    owner = constraint.get_owner()
+    if owner is None:
+        disjoint_with = total
+    else:
+        disjoint_with = (total - int.from_bytes(digest(owner), "big")) % MODULUS
+    value = digest("arm.disjoint", disjoint_with.to_bytes(32, "big"))
+    constraint._fingerprint = (total, value)
+    return value
+
+
+def pathfd_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("arm.pathfd",
+                                               name_set_digest(c.get_attributes()),
+                                               c.get_target()))
+
+
+def arm_entity_fingerprint(arm_entity):
+    constraints = tuple(fingerprint(c) for c in arm_entity.get_constraints())
+    return cached_composite(arm_entity, constraints,
+                            lambda e: digest("arm.entity", e.get_name(),
+                                             multiset_digest(arm_attribute_fingerprint(a)
+                                                             for a in e.get_attributes()),
+                                             multiset_digest(constraints)))
+
+
+def arm_model_fingerprint(arm_model):
+    entities = tuple(arm_entity_fingerprint(e) for e in arm_model.get_arm_entities())
+    return cached_composite(arm_model, entities,
+                            lambda m: digest("arm.model", multiset_digest(entities)))
+
+
+# EER
+
+def eer_attribute_fingerprint(attribute):
+    return cached(attribute, lambda a: digest("eer.attribute", a.get_name(),
+                                              a.is_multi_valued(), a.is_derived(),
+                                              a.is_optional()))
+
+
+def identifier_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("eer.identifier",
+                                               name_set_digest(c.get_identifier())))
+
+
+def eer_inheritance_fingerprint(constraint):
+    return cached(constraint, lambda c: digest("eer.isa", c.get_parent(),
+                                               bool(c.is_disjoint()),
+                                               bool(c.is_covering())))
+
+
+def eer_entity_fingerprint(eer_entity):
+    constraints = tuple(fingerprint(c) for c in eer_entity.get_constraints())
+    return cached_composite(eer_entity, constraints,
+                            lambda e: digest("eer.entity", e.get_name(), bool(e.is_weak()),
+                                             multiset_digest(eer_attribute_fingerprint(a)
+                                                             for a in e.get_attributes()),
+                                             multiset_digest(constraints)))
+
+
+def eer_relationship_fingerprint(relationship):
+    return cached(relationship, lambda r: digest("eer.relationship", r.get_name(),
+                                                 r.get_entity1(), r.get_mult1(),
+                                                 r.get_entity2(), r.get_mult2(),
+                                                 bool(r.is_weak()),
+                                                 multiset_digest(eer_attribute_fingerprint(a)
+                                                                 for a in r.get_attributes())))
+
+
+def eer_model_fingerprint(eer_model):
+    stamp = (tuple(eer_entity_fingerprint(e) for e in eer_model.get_eer_entities()),
+             tuple(eer_relationship_fingerprint(r) for r in eer_model.get_eer_relationships()))
+    return cached_composite(eer_model, stamp,
+                            lambda m: digest("eer.model", multiset_digest(stamp[0]),
+                                             multiset_digest(stamp[1])))
+
+
+FINGERPRINTS = {
+    arm.ARM_Attribute: arm_attribute_fingerprint,
+    arm_constraints.PK_Constraint: pk_fingerprint,
+    arm_constraints.FK_Constraint: fk_fingerprint,
+    arm_constraints.Inheritance_Constraint: arm_inheritance_fingerprint,
+    arm_constraints.Cover_Constraint: cover_fingerprint,
+    arm_constraints.Disjointness_Constraint: disjointness_fingerprint,
+    arm_constraints.Pathfd_Constraint: pathfd_fingerprint,
+    arm.ARM_Entity: arm_entity_fingerprint,
+    arm.ARM_Model: arm_model_fingerprint,
+    eer.EER_Attribute: eer_attribute_fingerprint,
+    eer_constraints.Identifier_Constraint: identifier_fingerprint,
+    eer_constraints.Inheritance_Constraint: eer_inheritance_fingerprint,
+    eer.EER_Entity: eer_entity_fingerprint,
+    eer.EER_Relationship: eer_relationship_fingerprint,
+    eer.EER_Model: eer_model_fingerprint,
+}
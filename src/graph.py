@@ -0,0 +1,346 @@
+"""
+Graph analytics of the inheritance and foreign key graphs of a model.
+
+`build_graph()` builds a Model_Graph once, in a single pass over the
+entities of an EER or ARM model, with two kinds of edges between entity
+names:
+    - isa edges, from each entity to the parent of its inheritance
+      constraint, and
+    - reference edges, from each relation to the relations its foreign keys
+      reference. For an EER model these are the foreign keys the
+      transformation to ARM creates for each relationship, and a
+      many-to-many relationship is a node of its own, referencing both of
+      its ends, as it becomes a relation of its own.
+
+The analyses are computed on the first query, in time linear in the size
+of the graph, and cached until the graph changes:
+    - the inheritance forest is numbered in preorder, so that a descendant
+      check is two comparisons and the descendants of an entity are a slice
+      of that order (the transitive closure, in linear space), and
+    - the strongly connected components of the reference graph are found
+      with Tarjan's algorithm, which also orders them so that every
+      component comes after the components it references.
+"""
+import arm
+import eer
+import resolution
+
+
+class Model_Graph:
+    """
+    A class used to represent the inheritance and foreign key graphs of a model.
+
+    Attributes
+    ----------
+    parents : dict of str to str
+        The parent of every entity that inherits from another entity.
+    children : dict of str to list of str
+        The subclasses of every parent entity, in the order of the model.
+    references : dict of str to dict of str to None
+        The names referenced by each node, as an ordered set.
+    referenced_by : dict of str to dict of str to None
+        The names of the nodes referencing each node, as an ordered set.
+    """
+
+    def __init__(self):
+        self.parents = {}
+        self.children = {}
+        self.references = {}
+        self.referenced_by = {}
+        self.__nodes = {}           # name -> None, in order of insertion
+        self.__order = None         # the names of the nodes in preorder
+        self.__first = None         # name -> index in the preorder
+        self.__last = None          # name -> index after its last descendant
+        self.__depths = None        # name -> number of ancestors
+        self.__ancestors = {}       # name -> tuple of ancestors, parent first
+        self.__components = None    # the strongly connected components
+        self.__component_of = None  # name -> index of its component
+
+    def add_node(self, name):
+        """Adds a node to the graph, if it is not already in it."""
+        if name not in self.__nodes:
+            self.__nodes[name] = None
+            self.clear_analyses()
+
+    def add_parent(self, name, parent):
+        """Adds an isa edge from `name` to `parent`, replacing any previous parent."""
+        self.add_node(name)
+        self.add_node(parent)
+        previous = self.parents.get(name)
+        if previous == parent:
+            return
+        if previous is not None:
+            self.children[previous].remove(name)
+        self.parents[name] = parent
+        self.children.setdefault(parent, []).append(name)
+        self.clear_analyses()
+
+    def add_reference(self, source, target):
+        """Adds a reference edge from `source` to `target`."""
+        self.add_node(source)
+        self.add_node(target)
+        if target not in self.references.setdefault(source, {}):
+            self.references[source][target] = None
+            self.referenced_by.setdefault(target, {})[source] = None
+            self.clear_analyses()
+
+    def clear_analyses(self):
+        """Clears the cached analyses, after the graph has changed."""
+        self.__order = self.__first = self.__last = self.__depths = None
+        self.__ancestors = {}
+        self.__components = self.__component_of = None
+
+    def get_nodes(self):
+        """Returns the names of all the nodes, in the order they were added."""
+        return list(self.__nodes)
+
+    def get_parent(self, name):
+        """Returns the name of the parent of `name`, or None if it has none."""
+        return self.parents.get(name)
+
+    def get_children(self, name):
+        """Returns the names of the subclasses of `name`."""
+        return self.children.get(name, [])
+
+    def get_references(self, name):
+        """Returns the names of the nodes `name` references."""
+        return list(self.references.get(name, ()))
+
+    def get_referenced_by(self, name):
+        """Returns the names of the nodes that reference `name`."""
+        return list(self.referenced_by.get(name, ()))
+
+    def index_hierarchy(self):
+        """
+        Numbers the inheritance forest in preorder, recording the depth of
+        every node, in time linear in the number of nodes.
+
+        Raises:
+            AssertionError:
+                if the isa edges form a cycle
+        """
+        order = []
+        first = {}
+        last = {}
+        depths = {}
+        for root in self.__nodes:
+            if root in self.parents:
+                continue
+            stack = [(root, 0)]
+            while stack:
+                name, depth = stack.pop()
+                if depth < 0:
+                    # All the descendants of `name` have been numbered
+                    last[name] = len(order)
+                    continue
+                first[name] = len(order)
+                depths[name] = depth
+                order.append(name)
+                stack.append((name, -1))
+                for child in reversed(self.get_children(name)):
+                    stack.append((child, depth + 1))
+        # The nodes of a cycle are not reachable from any root
+        for name in self.__nodes:
+            if name not in first:
+                cycle = [name]
+                seen = {name}
+                while self.parents[cycle[-1]] not in seen:
+                    cycle.append(self.parents[cycle[-1]])
+                    seen.add(cycle[-1])
+                cycle = cycle[cycle.index(self.parents[cycle[-1]]):]
+                assert False, "Inheritance cycle: {}".format(" -> ".join(cycle + cycle[:1]))
+        self.__order = order
+        self.__first = first
+        self.__last = last
+        self.__depths = depths
+
+    def get_ancestors(self, name):
+        """
+        Returns the names of the ancestors of `name`, its parent first. The
+        result is cached, and reused by the queries of its descendants.
+        """
+        ancestors = self.__ancestors.get(name)
+        if ancestors is None:
+            if self.__order is None:
+                self.index_hierarchy()
+            chain = []
+            parent = self.parents.get(name)
+            while parent is not None:
+                cached = self.__ancestors.get(parent)
+                if cached is not None:
+                    chain.append(parent)
+                    chain.extend(cached)
+                    break
+                chain.append(parent)
+                parent = self.parents.get(parent)
+            ancestors = self.__ancestors[name] = tuple(chain)
+        return list(ancestors)
+
+    def get_descendants(self, name):
+        """Returns the names of the descendants of `name`, in preorder."""
+        if self.__order is None:
+            self.index_hierarchy()
+        if name not in self.__first:
+            return []
+        return self.__order[self.__first[name] + 1:self.__last[name]]
+
+    def is_ancestor(self, ancestor, name):
+        """Checks if `ancestor` is a (proper) ancestor of `name`, in constant time."""
+        if self.__order is None:
+            self.index_hierarchy()
+        if ancestor not in self.__first or name not in self.__first:
+            return False
+        return self.__first[ancestor] < self.__first[name] < self.__last[ancestor]
+
+    def get_depth(self, name):
+        """Returns the number of ancestors of `name`, or None if it is not in the graph."""
+        if self.__depths is None:
+            self.index_hierarchy()
+        return self.__depths.get(name)
+
+    def get_longest_chain(self):
+        """
+        Returns the longest isa chain, from its root down to the deepest node,
+        or an empty list if the graph is empty.
+        """
+        if self.__depths is None:
+            self.index_hierarchy()
+        if not self.__depths:
+            return []
+        deepest = max(self.__depths, key=self.__depths.get)
+        return list(reversed(self.get_ancestors(deepest))) + [deepest]
+
+    def index_components(self):
+        """
+        Finds the strongly connected components of the reference graph with
+        an iterative version of Tarjan's algorithm, in time linear in the
+        size of the graph.
+        """
+        index = {}                # name -> order in which it was visited
+        low = {}                  # name -> lowest index reachable from it
+        on_stack = set()
+        stack = []
+        components = []
+        component_of = {}
+        for start in self.__nodes:
+            if start in index:
+                continue
+            index[start] = low[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(self.references.get(start, ())))]
+            while work:
+                name, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        index[target] = low[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.references.get(target, ()))))
+                        break
+                    if target in on_stack and index[target] < low[name]:
+                        low[name] = index[target]
+                else:
+                    # Every reference of `name` has been followed
+                    work.pop()
+                    if work and low[name] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[name]
+                    if low[name] == index[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component_of[member] = len(components)
+                            component.append(member)
+                            if member == name:
+                                break
+                        component.reverse()
+                        components.append(component)
+        self.__components = components
+        self.__component_of = component_of
+
+    def get_components(self):
+        """
+        Returns the strongly connected components of the reference graph,
+        each a list of names. Every component comes after the components it
+        references - the order in which relations can be created.
+        """
+        if self.__components is None:
+            self.index_components()
+        return [list(component) for component in self.__components]
+
+    def get_component(self, name):
+        """Returns the names in the strongly connected component of `name`."""
+        if self.__components is None:
+            self.index_components()
+        if name not in self.__component_of:
+            return []
+        return list(self.__components[self.__component_of[name]])
+
+    def in_reference_cycle(self, name):
+        """Checks if `name` is on a cycle of references, in constant time."""
+        if self.__components is None:
+            self.index_components()
+        if name not in self.__component_of:
+            return False
+        return len(self.__components[self.__component_of[name]]) > 1 or \
+            name in self.references.get(name, ())
+
+    def get_reference_cycles(self):
+        """Returns the strongly connected components that contain a cycle of references."""
+        if self.__components is None:
+            self.index_components()
+        return [list(component) for component in self.__components
+                if self.in_reference_cycle(component[0])]
+
+    def __len__(self):
+        """Returns the number of nodes."""
+        return len(self.__nodes)
+
+
+def build_graph(model):
+    """Builds the graph of an EER_Model or ARM_Model.
+
+    Args:
+        model (EER_Model or ARM_Model): The model to build the graph of.
+
+    Returns:
+        Model_Graph: The inheritance and foreign key graphs of the model.
+
+    Raises:
+        AssertionError:
+            if `model` is neither an EER_Model nor an ARM_Model
+    """
+    graph = Model_Graph()
+    if isinstance(model, eer.EER_Model):
+        add_entities(graph, model.get_eer_entities())
+        for relationship in model.get_eer_relationships():
+            entity1 = relationship.get_entity1()
+            entity2 = relationship.get_entity2()
+            kind = relationship.get_kind()
+            # The foreign keys go where the transformation to ARM puts them
+            if kind == resolution.ONE_TO_ONE or kind == resolution.MANY_TO_ONE:
+                graph.add_reference(entity1, entity2)
+            elif kind == resolution.ONE_TO_MANY:
+                graph.add_reference(entity2, entity1)
+            elif kind == resolution.MANY_TO_MANY:
+                graph.add_reference(relationship.get_name(), entity1)
+                graph.add_reference(relationship.get_name(), entity2)
+        return graph
+
+    assert isinstance(model, arm.ARM_Model), "Cannot build a graph of {}".format(
+        type(model).__name__)
+    add_entities(graph, model.get_arm_entities())
+    for arm_entity in model.get_arm_entities():
+        for constraint in arm_entity.get_fk_constraints():
+            graph.add_reference(arm_entity.get_name(), constraint.get_references())
+    return graph
+
+
+def add_entities(graph, entities):
+    """Adds EER or ARM entities and their isa edges to a graph."""
+    for entity in entities:
+        graph.add_node(entity.get_name())
+        parent = entity.get_parent()
+        if parent is not None:
+            graph.add_parent(entity.get_name(), parent)
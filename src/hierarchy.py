@@ -0,0 +1,173 @@
+"""
+An index of the inheritance hierarchy of an EER model.
+
+The index is built once, in a single pass over the EER entities'
+Inheritance_Constraints, so that the transformations can look up a
+parent's subclasses (and whether they are disjoint or covering) in
+constant time rather than scanning the entities produced so far.
+
+`schedule()` orders the entities of either model so that every parent
+comes before its subclasses, which lets the transformations handle files
+whose entities appear in any order.
+"""
+
+VISITING = 1
+SCHEDULED = 2
+
+
+def schedule(entities):
+    """
+    Orders EER or ARM entities so that every parent comes before its
+    subclasses, in time linear in the number of entities.
+
+    Entities that are already ordered parent-first keep their order, and
+    otherwise each entity is moved only as far as needed - just after its
+    parent. Parents that are not among `entities` are ignored. Entities
+    sharing a name are all kept, and a parent name refers to the first.
+
+    Args:
+        entities (list of EER_Entity or ARM_Entity): The entities to order.
+
+    Returns:
+        list: The entities in their new order.
+
+    Raises:
+        AssertionError:
+            if the inheritance constraints of the entities form a cycle
+    """
+    by_name = {}
+    for entity in entities:
+        by_name.setdefault(entity.get_name(), entity)
+    # Keyed by identity, as a loaded model may have entities sharing a name
+    state = {}                    # id of entity -> VISITING or SCHEDULED
+    order = []
+    for entity in entities:
+        # Walk up the hierarchy to the first ancestor already scheduled,
+        # then schedule the entities on the way back down
+        path = []
+        current = entity
+        while current is not None:
+            if id(current) in state:
+                assert state[id(current)] == SCHEDULED, "Inheritance cycle: {}".format(
+                    " -> ".join([ent.get_name() for ent in path + [current]]))
+                break
+            state[id(current)] = VISITING
+            path.append(current)
+            current = by_name.get(current.get_parent())
+        for ent in reversed(path):
+            state[id(ent)] = SCHEDULED
+            order.append(ent)
+    return order
+
+
+def find_cycles(entities):
+    """
+    Finds every inheritance cycle among EER or ARM entities, in time linear
+    in the number of entities - where `schedule()` stops at the first one.
+
+    Args:
+        entities (list of EER_Entity or ARM_Entity): The entities to check.
+
+    Returns:
+        list of list of str: The names of the entities in each cycle, e.g.
+            ["A", "B"] if A inherits from B and B from A.
+    """
+    by_name = {entity.get_name(): entity for entity in entities}
+    state = {}                    # entity name -> VISITING or SCHEDULED
+    cycles = []
+    for entity in entities:
+        path = []
+        current = entity
+        while current is not None:
+            name = current.get_name()
+            if name in state:
+                if state[name] == VISITING:
+                    names = [ent.get_name() for ent in path]
+                    cycles.append(names[names.index(name):])
+                break
+            state[name] = VISITING
+            path.append(current)
+            current = by_name.get(current.get_parent())
+        for ent in path:
+            state[ent.get_name()] = SCHEDULED
+    return cycles
+
+
+class Hierarchy_Index:
+    """
+    A class used to look up the parent and the subclasses of EER entities.
+
+    Attributes
+    ----------
+    children : dict of str to list of str
+        The subclasses of every parent entity, in the order of the model.
+    parents : dict of str to str
+        The parent of every entity that inherits from another entity.
+    disjoint : set of str
+        The names of the subclasses declared as disjoint.
+    covering : set of str
+        The names of the subclasses declared as covering.
+    """
+
+    def __init__(self, eer_entities=()):
+        """
+        Args:
+            eer_entities (iterable of EER_Entity): Optional entities to index.
+        """
+        self.children = {}
+        self.parents = {}
+        self.disjoint = set()
+        self.covering = set()
+        for eer_entity in eer_entities:
+            self.add_entity(eer_entity)
+
+    def add_entity(self, eer_entity):
+        """Adds an EER_Entity to the index if it inherits from a parent."""
+        inheritance = eer_entity.get_inheritance_constraint()
+        if inheritance is None:
+            return
+        name = eer_entity.get_name()
+        parent_name = inheritance.get_parent()
+        # Since this entity inherits from a parent,
+        # there should be a corresponding parent name:
+        assert parent_name is not None
+        self.parents[name] = parent_name
+        if parent_name in self.children:
+            self.children[parent_name].append(name)
+        else:
+            self.children[parent_name] = [name]
+        if inheritance.is_disjoint():
+            self.disjoint.add(name)
+        if inheritance.is_covering():
+            self.covering.add(name)
+
+    def get_parent(self, name):
+        """Returns the name of the parent of `name`, or None if it has none."""
+        return self.parents.get(name)
+
+    def get_children(self, parent_name):
+        """Returns the names of the subclasses of `parent_name`."""
+        return self.children.get(parent_name, [])
+
+    def get_covering_children(self, parent_name):
+        """Returns the names of the subclasses that cover `parent_name`."""
+        return [name for name in self.get_children(parent_name) if name in self.covering]
+
+    def get_disjoint_children(self, parent_name):
+        """
+        Returns the names of the subclasses of `parent_name` declared as
+        disjoint - the members of the group they share.
+        """
+        return [name for name in self.get_children(parent_name) if name in self.disjoint]
+
+    def get_parents(self):
+        """Returns the names of all the entities that have subclasses."""
+        return list(self.children)
+
+    def is_disjoint(self, name):
+        """Checks if `name` is a disjoint subclass."""
+        return name in self.disjoint
+
+    def is_covering(self, name):
+        """Checks if `name` is a covering subclass."""
+        return name in self.covering
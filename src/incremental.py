@@ -0,0 +1,411 @@
+"""
+Incremental re-transformation of edited models.
+
+An incremental transformation holds the entities of a model, the relation
+(or EER entity) produced for each of them, and a dependency graph recording
+which source entities and relationships each result was derived from. When
+entities or relationships are added, removed or replaced, only the results
+that depend on them are marked dirty, and the next call to
+`get_arm_model()`/`get_eer_model()` recomputes just those before assembling
+the model in the same order as a full transformation - so the result prints
+identically to transforming the edited model from scratch.
+
+Entities and relationships must not be modified once they have been added;
+an edit is made by replacing them. The model returned is only valid until
+the next edit, since unaffected relations are shared between the models
+returned.
+"""
+import arm
+import arm_constraints
+import eer
+import hierarchy
+import resolution
+
+
+class Incremental_EER_To_ARM:
+    """
+    A class used to keep the ARM model of an edited EER model up to date.
+
+    Attributes
+    ----------
+    eer_entities : dict of str to EER_Entity
+        The entities of the EER model, in the order of the model.
+    eer_relationships : dict of int to EER_Relationship
+        The relationships of the EER model keyed by their id, in order.
+    relationships_of : dict of str to dict of int to EER_Relationship
+        The relationships each entity takes part in, in order.
+    relations : dict of str to ARM_Entity
+        The relation produced for each entity.
+    relationship_relations : dict of int to ARM_Entity
+        The relation produced for each many-to-many relationship.
+    sources : dict of str to set of str
+        The entities the relation of each entity was derived from.
+    dependents : dict of str to set of str
+        The reverse of `sources` - the entities whose relations were
+        derived from each entity.
+    dirty_entities, dirty_relationships : set
+        The entities (by name) and relationships (by id) whose relations
+        must be recomputed.
+    disjoint_groups : dict of str to Disjointness_Group
+        The group shared by the disjoint subclasses of each parent that has any.
+    implicit_group : Disjointness_Group
+        The group shared by the relations outside a hierarchy (STEP VI).
+    implicit_disjointness : bool
+        Whether the relations outside a hierarchy are implicitly disjoint.
+    recomputed : int
+        The number of relations recomputed by the last update.
+    """
+
+    def __init__(self, eer_model=None):
+        """
+        Args:
+            eer_model (EER_Model): Optional model whose entities and
+                relationships to start with.
+        """
+        self.eer_entities = {}
+        self.eer_relationships = {}
+        self.relationships_of = {}
+        self.relations = {}
+        self.relationship_relations = {}
+        self.sources = {}
+        self.dependents = {}
+        self.dirty_entities = set()
+        self.dirty_relationships = set()
+        self.disjoint_groups = {}
+        self.implicit_group = arm_constraints.Disjointness_Group([])
+        self.implicit_disjointness = False
+        self.recomputed = 0
+        if eer_model is not None:
+            for eer_entity in eer_model.get_eer_entities():
+                self.add_eer_entity(eer_entity)
+            for relationship in eer_model.get_eer_relationships():
+                self.add_eer_relationship(relationship)
+
+    def find_entity(self, entity_name):
+        """Returns the EER entity with the given name, or None if there is none."""
+        return self.eer_entities.get(entity_name)
+
+    def add_eer_entity(self, eer_entity):
+        """Adds an EER_Entity to the model.
+
+        Raises:
+            AssertionError:
+                if the model already has an entity with the same name
+        """
+        name = eer_entity.get_name()
+        assert name not in self.eer_entities, "Duplicate entity name: {}".format(name)
+        self.eer_entities[name] = eer_entity
+        self.mark_entity_dirty(name, eer_entity.get_parent())
+
+    def replace_eer_entity(self, eer_entity):
+        """Replaces the EER_Entity with the same name as `eer_entity`, keeping its position."""
+        name = eer_entity.get_name()
+        old_parent = self.eer_entities[name].get_parent()
+        self.eer_entities[name] = eer_entity
+        self.mark_entity_dirty(name, old_parent, eer_entity.get_parent())
+
+    def remove_eer_entity(self, name):
+        """Removes the EER_Entity with the given name."""
+        eer_entity = self.eer_entities.pop(name)
+        self.mark_entity_dirty(name, eer_entity.get_parent())
+
+    def add_eer_relationship(self, relationship):
+        """Adds an EER_Relationship to the model."""
+        key = id(relationship)
+        self.eer_relationships[key] = relationship
+        for name in (relationship.get_entity1(), relationship.get_entity2()):
+            self.relationships_of.setdefault(name, {})[key] = relationship
+        self.mark_relationship_dirty(relationship)
+
+    def remove_eer_relationship(self, relationship):
+        """Removes an EER_Relationship previously added to the model."""
+        key = id(relationship)
+        del self.eer_relationships[key]
+        for name in (relationship.get_entity1(), relationship.get_entity2()):
+            self.relationships_of[name].pop(key, None)
+        self.mark_relationship_dirty(relationship)
+
+    def mark_entity_dirty(self, name, *parents):
+        """
+        Marks the relation of an edited entity dirty, along with the
+        relations derived from it and those of its parents (whose cover
+        constraints list it).
+        """
+        self.dirty_entities.add(name)
+        self.dirty_entities.update(self.dependents.get(name, ()))
+        self.dirty_entities.update(parent for parent in parents if parent is not None)
+        for relationship in self.relationships_of.get(name, {}).values():
+            self.dirty_entities.add(relationship.get_entity1())
+            self.dirty_entities.add(relationship.get_entity2())
+
+    def mark_relationship_dirty(self, relationship):
+        """Marks the relations affected by an edited relationship dirty."""
+        self.dirty_entities.add(relationship.get_entity1())
+        self.dirty_entities.add(relationship.get_entity2())
+        self.dirty_relationships.add(id(relationship))
+
+    def to_eer_model(self):
+        """Returns an EER_Model holding the current entities and relationships."""
+        eer_model = eer.EER_Model()
+        for eer_entity in self.eer_entities.values():
+            eer_model.add_eer_entity(eer_entity)
+        for relationship in self.eer_relationships.values():
+            eer_model.add_eer_relationship(relationship)
+        return eer_model
+
+    def get_sources(self, relation_name):
+        """
+        Returns the entities (by name) and relationships the relation
+        `relation_name` was derived from.
+        """
+        if relation_name in self.sources:
+            return (self.sources[relation_name],
+                    list(self.relationships_of.get(relation_name, {}).values()))
+        for key, arm_entity in self.relationship_relations.items():
+            if arm_entity.get_name() == relation_name:
+                return set(), [self.eer_relationships[key]]
+        return set(), []
+
+    def get_arm_model(self):
+        """
+        Recomputes the dirty relations. Returns the ARM model of the
+        current EER model, as `EER_Model.transform_to_arm()` would.
+        """
+        eer_entities, hierarchy_index, many_to_many = self.update_indexes()
+        self.recomputed = len(self.dirty_entities) + len(self.dirty_relationships)
+        for name in self.dirty_entities:
+            self.forget_sources(name)
+            if name in self.eer_entities:
+                self.relations[name] = self.transform_entity(name, hierarchy_index)
+            else:
+                self.relations.pop(name, None)
+        for key in self.dirty_relationships:
+            self.relationship_relations.pop(key, None)
+        for relationship in many_to_many:
+            key = id(relationship)
+            if key in self.dirty_relationships:
+                self.relationship_relations[key] = self.transform_relationship(relationship)
+        self.dirty_entities = set()
+        self.dirty_relationships = set()
+
+        arm_model = arm.ARM_Model()
+        for eer_entity in eer_entities:
+            arm_model.add_arm_entity(self.relations[eer_entity.get_name()])
+        for relationship in many_to_many:
+            arm_model.add_arm_entity(self.relationship_relations[id(relationship)])
+        return arm_model
+
+    def update_indexes(self):
+        """
+        Orders the entities, indexes their hierarchy and updates the shared
+        disjointness groups, without recomputing any relation.
+
+        Returns:
+            (list of EER_Entity, Hierarchy_Index, list of EER_Relationship):
+                The entities parents first, their hierarchy, and the
+                many-to-many relationships in order.
+        """
+        eer_entities = hierarchy.schedule(list(self.eer_entities.values()))
+        hierarchy_index = hierarchy.Hierarchy_Index(eer_entities)
+        self.update_disjoint_groups(hierarchy_index)
+        many_to_many = [relationship for relationship in self.eer_relationships.values()
+                        if relationship.get_kind() == resolution.MANY_TO_MANY]
+        self.update_implicit_group(eer_entities, many_to_many)
+        return eer_entities, hierarchy_index, many_to_many
+
+    def update_disjoint_groups(self, hierarchy_index):
+        """Updates the members of the group shared by the disjoint subclasses of each parent."""
+        disjoint_groups = {}
+        for parent_name in hierarchy_index.get_parents():
+            members = hierarchy_index.get_disjoint_children(parent_name)
+            if members:
+                group = self.disjoint_groups.get(parent_name)
+                if group is None:
+                    group = arm_constraints.Disjointness_Group([])
+                group.set_members(members)
+                disjoint_groups[parent_name] = group
+        self.disjoint_groups = disjoint_groups
+
+    def update_implicit_group(self, eer_entities, many_to_many):
+        """
+        Updates the members of the group shared by the relations outside a
+        hierarchy (STEP VI), and marks those relations dirty if they gain or
+        lose their implicit disjointness constraint.
+        """
+        members = [eer_entity.get_name() for eer_entity in eer_entities
+                   if eer_entity.get_parent() is None]
+        members.extend(relationship.get_name() for relationship in many_to_many)
+        self.implicit_group.set_members(members)
+        implicit_disjointness = len(members) > 1
+        if implicit_disjointness != self.implicit_disjointness:
+            self.implicit_disjointness = implicit_disjointness
+            self.dirty_entities.update(eer_entity.get_name() for eer_entity in eer_entities
+                                       if eer_entity.get_parent() is None)
+            self.dirty_relationships.update(id(relationship) for relationship in many_to_many)
+
+    def forget_sources(self, name):
+        """Removes the relation of `name` from the dependency graph."""
+        for source in self.sources.pop(name, ()):
+            self.dependents[source].discard(name)
+
+    def transform_entity(self, name, hierarchy_index):
+        """Returns the relation for the entity `name`, recording what it was derived from."""
+        eer_entity = self.eer_entities[name]
+        arm_entity = eer.transform_entity_to_arm(eer_entity)
+        sources = {name}
+
+        parent_name = eer_entity.get_parent()
+        if parent_name is not None and hierarchy_index.is_disjoint(name):
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(
+                self.disjoint_groups[parent_name], owner=name))
+        covered_by = hierarchy_index.get_covering_children(name)
+        if covered_by:
+            arm_entity.add_constraint(arm_constraints.Cover_Constraint(covered_by))
+        sources.update(hierarchy_index.get_children(name))
+
+        # Resolve the relationships against this relation alone, so that
+        # only the keys they add to it are applied
+        single_relation = arm.ARM_Model()
+        single_relation.add_arm_entity(arm_entity)
+        resolver = resolution.Relationship_Resolver(self, single_relation)
+        for resolved in resolver.resolve_all(self.relationships_of.get(name, {}).values()):
+            relationship = resolved.relationship
+            sources.add(relationship.get_entity1())
+            sources.add(relationship.get_entity2())
+            if resolved.weak_victim is not None:
+                eer.extend_key_pathfd(resolved.weak_victim, resolved.owner)
+            if resolved.kind != resolution.MANY_TO_MANY and resolved.victim is not None:
+                eer.add_foreign_key(resolved.victim, resolved.referenced)
+
+        if parent_name is None and self.implicit_disjointness:
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(
+                self.implicit_group, owner=name))
+
+        self.sources[name] = sources
+        for source in sources:
+            self.dependents.setdefault(source, set()).add(name)
+        return arm_entity
+
+    def transform_relationship(self, relationship):
+        """Returns the relation for a many-to-many relationship."""
+        arm_entity = eer.transform_relationship_to_arm(relationship)
+        if self.implicit_disjointness:
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(
+                self.implicit_group, owner=relationship.get_name()))
+        return arm_entity
+
+
+class Incremental_ARM_To_EER:
+    """
+    A class used to keep the EER model of an edited ARM model up to date.
+
+    Attributes
+    ----------
+    arm_entities : dict of str to ARM_Entity
+        The relations of the ARM model, in the order of the model.
+    children : dict of str to set of str
+        The subrelations of each relation - whose EER inheritance
+        constraints depend on the cover constraint of their parent.
+    results : dict of str to tuple
+        The (EER_Entity or None, list of EER_Relationship) produced for
+        each relation.
+    dirty : set of str
+        The relations whose results must be recomputed.
+    recomputed : int
+        The number of relations recomputed by the last update.
+    """
+
+    def __init__(self, arm_model=None):
+        """
+        Args:
+            arm_model (ARM_Model): Optional model whose relations to start with.
+        """
+        self.arm_entities = {}
+        self.children = {}
+        self.results = {}
+        self.dirty = set()
+        self.recomputed = 0
+        if arm_model is not None:
+            for arm_entity in arm_model.get_arm_entities():
+                self.add_arm_entity(arm_entity)
+
+    def find_entity(self, entity_name):
+        """Returns the relation with the given name, or None if there is none."""
+        return self.arm_entities.get(entity_name)
+
+    def add_arm_entity(self, arm_entity):
+        """Adds an ARM_Entity to the model.
+
+        Raises:
+            AssertionError:
+                if the model already has a relation with the same name
+        """
+        name = arm_entity.get_name()
+        assert name not in self.arm_entities, "Duplicate entity name: {}".format(name)
+        self.arm_entities[name] = arm_entity
+        self.link(arm_entity)
+
+    def replace_arm_entity(self, arm_entity):
+        """Replaces the ARM_Entity with the same name as `arm_entity`, keeping its position."""
+        name = arm_entity.get_name()
+        self.unlink(self.arm_entities[name])
+        self.arm_entities[name] = arm_entity
+        self.link(arm_entity)
+
+    def remove_arm_entity(self, name):
+        """Removes the ARM_Entity with the given name."""
+        self.unlink(self.arm_entities.pop(name))
+        self.results.pop(name, None)
+
+    def link(self, arm_entity):
+        """Records the parent of a new relation and marks the affected results dirty."""
+        name = arm_entity.get_name()
+        parent_name = arm_entity.get_parent()
+        if parent_name is not None:
+            self.children.setdefault(parent_name, set()).add(name)
+        self.dirty.add(name)
+        self.dirty.update(self.children.get(name, ()))
+
+    def unlink(self, arm_entity):
+        """Forgets the parent of an old relation and marks the affected results dirty."""
+        name = arm_entity.get_name()
+        parent_name = arm_entity.get_parent()
+        if parent_name is not None:
+            self.children[parent_name].discard(name)
+        self.dirty.add(name)
+        self.dirty.update(self.children.get(name, ()))
+
+    def to_arm_model(self):
+        """Returns an ARM_Model holding the current relations."""
+        arm_model = arm.ARM_Model()
+        for arm_entity in self.arm_entities.values():
+            arm_model.add_arm_entity(arm_entity)
+        return arm_model
+
+    def get_eer_model(self):
+        """
+        Recomputes the dirty results. Returns the EER model of the current
+        ARM model, as `ARM_Model.transform_to_eer()` would.
+        """
+        self.recomputed = 0
+        for name in self.dirty:
+            arm_entity = self.arm_entities.get(name)
+            if arm_entity is None:
+                continue
+            new_ent, relationships = arm.transform_entity_to_eer(arm_entity)
+            parent_name = arm_entity.get_parent()
+            if new_ent is not None and parent_name is not None:
+                new_ent.add_constraint(arm.transform_inheritance_to_eer(
+                    arm_entity, self.arm_entities.get(parent_name)))
+            self.results[name] = (new_ent, relationships)
+            self.recomputed += 1
+        self.dirty = set()
+
+        eer_model = eer.EER_Model()
+        for arm_entity in hierarchy.schedule(list(self.arm_entities.values())):
+            new_ent, relationships = self.results[arm_entity.get_name()]
+            for relationship in relationships:
+                eer_model.add_eer_relationship(relationship)
+            if new_ent is not None:
+                eer_model.add_eer_entity(new_ent)
+        return eer_model
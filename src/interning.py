@@ -0,0 +1,173 @@
+"""
+A shared interning layer for the strings and attribute objects created
+while loading and transforming models.
+
+Entity and attribute names, data types such as "OID" and "anyType", and
+the lower-cased foreign key names created by the transformations recur
+many times in a model. Every string that passes through `string()` is
+replaced by a single shared copy, and attributes are created through
+`arm_attribute()`/`eer_attribute()` so that identical attributes are one
+flyweight object. This reduces the memory used by large models and lets
+equality checks between shared strings succeed on identity.
+
+Attributes have no setters, and interned attributes must be treated as
+immutable since they may be shared between entities and between models.
+The tables are cleared once they hold `MAX_ENTRIES` entries, which bounds
+the memory used by long-running processes.
+"""
+import arm
+import eer
+
+MAX_ENTRIES = 1000000
+
+
+class Interner:
+    """
+    A class used to share identical strings and attribute objects.
+
+    Attributes
+    ----------
+    strings : dict of str to str
+        The shared copy of every string seen.
+    lowered : dict of str to str
+        The shared lower-case form of strings passed to `lower()`.
+    arm_attributes : dict of str to dict of str to ARM_Attribute
+        The shared ARM attributes keyed by data type and then by name.
+    eer_attributes : dict of tuple to dict of str to EER_Attribute
+        The shared EER attributes keyed by their flags and then by name.
+    string_lookups, strings_deduplicated : int
+        The number of strings interned, and how many of those were
+        replaced by an already shared copy.
+    attribute_lookups, attributes_deduplicated : int
+        The number of attributes requested, and how many of those were
+        answered with an already existing object.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.strings = {}
+        self.lowered = {}
+        self.arm_attributes = {}
+        self.eer_attributes = {}
+        self.num_attributes = 0
+        self.string_lookups = 0
+        self.strings_deduplicated = 0
+        self.attribute_lookups = 0
+        self.attributes_deduplicated = 0
+
+    def string(self, value):
+        """Returns the shared copy of the string `value` (None is returned as is)."""
+        if value is None:
+            return None
+        self.string_lookups += 1
+        shared = self.strings.get(value)
+        if shared is None:
+            if len(self.strings) >= self.max_entries:
+                self.clear()
+            self.strings[value] = value
+            return value
+        if shared is not value:
+            self.strings_deduplicated += 1
+        return shared
+
+    def lower(self, value):
+        """Returns the shared lower-case form of the string `value`."""
+        lowered = self.lowered.get(value)
+        if lowered is None:
+            if len(self.lowered) >= self.max_entries:
+                self.lowered.clear()
+            lowered = self.string(value.lower())
+            self.lowered[value] = lowered
+        return lowered
+
+    def arm_attribute(self, name, data_type="anyType"):
+        """Returns a shared ARM_Attribute with the given name and data type."""
+        self.attribute_lookups += 1
+        by_name = self.arm_attributes.get(data_type)
+        if by_name is None:
+            by_name = self.arm_attributes[self.string(data_type)] = {}
+        attribute = by_name.get(name)
+        if attribute is None:
+            self.make_room()
+            attribute = arm.ARM_Attribute(self.string(name), self.string(data_type))
+            by_name[attribute.get_name()] = attribute
+            self.num_attributes += 1
+        else:
+            self.attributes_deduplicated += 1
+        return attribute
+
+    def eer_attribute(self, name, multi_valued=False, derived=False, optional=False):
+        """Returns a shared EER_Attribute with the given name and flags."""
+        self.attribute_lookups += 1
+        flags = (multi_valued, derived, optional)
+        by_name = self.eer_attributes.get(flags)
+        if by_name is None:
+            by_name = self.eer_attributes[flags] = {}
+        attribute = by_name.get(name)
+        if attribute is None:
+            self.make_room()
+            attribute = eer.EER_Attribute(self.string(name), multi_valued, derived, optional)
+            by_name[attribute.get_name()] = attribute
+            self.num_attributes += 1
+        else:
+            self.attributes_deduplicated += 1
+        return attribute
+
+    def make_room(self):
+        """Empties the attribute tables if they are full."""
+        if self.num_attributes >= self.max_entries:
+            self.arm_attributes.clear()
+            self.eer_attributes.clear()
+            self.num_attributes = 0
+
+    def clear(self):
+        """Empties the tables - objects already handed out remain valid."""
+        self.strings.clear()
+        self.lowered.clear()
+        self.arm_attributes.clear()
+        self.eer_attributes.clear()
+        self.num_attributes = 0
+
+    def get_stats(self):
+        """Returns the interning counters as a dictionary."""
+        return {"strings": len(self.strings),
+                "string_lookups": self.string_lookups,
+                "strings_deduplicated": self.strings_deduplicated,
+                "attributes": self.num_attributes,
+                "attribute_lookups": self.attribute_lookups,
+                "attributes_deduplicated": self.attributes_deduplicated}
+
+
+# The interner shared by the loaders and transformations
+shared = Interner()
+
+
+def string(value):
+    """Returns the shared copy of `value` from the shared interner."""
+    return shared.string(value)
+
+
+def lower(value):
+    """Returns the shared lower-case form of `value` from the shared interner."""
+    return shared.lower(value)
+
+
+def arm_attribute(name, data_type="anyType"):
+    """Returns a shared ARM_Attribute from the shared interner."""
+    return shared.arm_attribute(name, data_type)
+
+
+def eer_attribute(name, multi_valued=False, derived=False, optional=False):
+    """Returns a shared EER_Attribute from the shared interner."""
+    return shared.eer_attribute(name, multi_valued, derived, optional)
+
+
+def get_stats():
+    """Returns the counters of the shared interner."""
+    return shared.get_stats()
+
+
+def reset():
+    """Replaces the shared interner with an empty one, resetting its counters."""
+    global shared
+    shared = Interner()
@@ -0,0 +1,94 @@
+"""
+A lazily transformed ARM model.
+
+`Lazy_ARM_Model` is the result of transforming an EER model to ARM in which
+each relation is only produced when it is first accessed, and then kept.
+Creating it indexes the EER model by name - its hierarchy, the
+relationships of each entity and the relations outside a hierarchy
+(STEP VI) - but produces no relation, so looking up a few relations of a
+huge model is cheap. Each relation is identical to the one produced by
+`EER_Model.transform_to_arm()`.
+
+The EER model must not be modified while the lazy model is in use.
+"""
+import arm
+import incremental
+
+
+class Lazy_ARM_Model:
+    """
+    A class used to represent an ARM model whose relations are produced on demand.
+
+    Supports the read-only methods of ARM_Model - `find_entity()`,
+    `get_arm_entities()`, `len()`, iteration and `str()`.
+
+    Attributes
+    ----------
+    transformation : Incremental_EER_To_ARM
+        Produces the relation of a single entity or relationship.
+    hierarchy_index : Hierarchy_Index
+        The hierarchy of the EER model.
+    names : list of str
+        The names of the relations, in the order of the eager ARM model.
+    many_to_many : dict of str to EER_Relationship
+        The many-to-many relationships keyed by the name of their relation.
+    relations : dict of str to ARM_Entity
+        The relations produced so far.
+    """
+
+    def __init__(self, eer_model):
+        """
+        Args:
+            eer_model (EER_Model): The model to transform.
+        """
+        self.transformation = incremental.Incremental_EER_To_ARM(eer_model)
+        eer_entities, self.hierarchy_index, many_to_many = \
+            self.transformation.update_indexes()
+        self.names = [eer_entity.get_name() for eer_entity in eer_entities]
+        self.names.extend(relationship.get_name() for relationship in many_to_many)
+        self.many_to_many = {}
+        for relationship in many_to_many:
+            self.many_to_many.setdefault(relationship.get_name(), relationship)
+        self.relations = {}
+
+    def find_entity(self, entity_name):
+        """Returns the ARM entity object corresponding to a given entity name"""
+        arm_entity = self.relations.get(entity_name)
+        if arm_entity is None:
+            if self.transformation.find_entity(entity_name) is not None:
+                arm_entity = self.transformation.transform_entity(entity_name,
+                                                                  self.hierarchy_index)
+            elif entity_name in self.many_to_many:
+                arm_entity = self.transformation.transform_relationship(
+                    self.many_to_many[entity_name])
+            else:
+                return None
+            self.relations[entity_name] = arm_entity
+        return arm_entity
+
+    def get_arm_entities(self):
+        """Returns every relation, producing those not yet produced."""
+        return [self.find_entity(name) for name in self.names]
+
+    def get_materialised_count(self):
+        """Returns the number of relations produced so far."""
+        return len(self.relations)
+
+    def to_arm_model(self):
+        """Returns an ARM_Model holding every relation."""
+        arm_model = arm.ARM_Model()
+        for arm_entity in self:
+            arm_model.add_arm_entity(arm_entity)
+        return arm_model
+
+    def __iter__(self):
+        """Iterates over the relations, producing each one as it is reached."""
+        for name in self.names:
+            yield self.find_entity(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __str__(self):
+        """A textual representation of the ARM Model, as `ARM_Model.__str__()`."""
+        return str(self.to_arm_model())
@@ -0,0 +1,169 @@
+"""
+Generates large synthetic EER and ARM XML documents in the same format as
+the files in EER_XML_Examples/ and ARM_XML_Examples/.
+
+Used by the benchmarks and tests that need models far bigger than the
+hand-written examples. The documents are written line by line, so even
+very large files can be produced without holding them in memory.
+"""
+import io
+
+# Attribute names shared by many entities, as in real schemas
+VOCABULARY = ["name", "description", "code", "status", "created", "updated",
+              "owner", "category", "amount", "quantity", "price", "email",
+              "phone", "address", "city", "country", "notes", "priority",
+              "version", "active"]
+DATA_TYPES = ["INT", "STRING", "DATE", "anyType"]
+
+
+def attribute_name(entity_number, attribute_number):
+    """
+    Returns the name of an attribute of a generated entity - the first
+    attribute is unique to the entity, the others are drawn from VOCABULARY.
+    """
+    if attribute_number == 0:
+        return "id{}".format(entity_number)
+    return VOCABULARY[(entity_number + attribute_number) % len(VOCABULARY)]
+
+
+def eer_xml_lines(num_entities, num_attributes=5):
+    """
+    Yields the lines of an EER XML document with `num_entities` entities.
+
+    Entities are generated in groups of ten, each group containing:
+        - a strong parent entity with two disjoint, covering subclasses
+        - a many-to-many relationship between two strong entities
+        - a weak entity together with its weak relationship
+        - a many-to-one relationship between two strong entities
+    Parents always appear before their subclasses.
+    """
+    yield "<eer>\n"
+    for i in range(num_entities):
+        position = i % 10
+        weak = position == 5
+        yield '\t<entity name="E{}" type="Entity" weak="{}">\n'.format(i, weak)
+        for j in range(num_attributes):
+            yield ('\t\t<attribute type="attr" multi_valued="False" '
+                   'derived="False" optional="False">{}</attribute>\n'
+                   .format(attribute_name(i, j)))
+        if position in (1, 2):
+            yield ('\t\t<constraint type="inheritance" covering="True" '
+                   'disjoint="True">E{}</constraint>\n'.format(i - position))
+        else:
+            yield ('\t\t<constraint type="identifier">{}</constraint>\n'
+                   .format(attribute_name(i, 0)))
+        yield "\t</entity>\n"
+
+        if position == 4 and i >= 4:
+            yield from _eer_relationship_lines("R{}".format(i), "E{}".format(i), "E{}".format(i - 1),
+                                               ("0", "n"), ("0", "n"), False)
+        if position == 5:
+            yield from _eer_relationship_lines("R{}".format(i), "E{}".format(i), "E{}".format(i - 1),
+                                               ("0", "n"), ("1", ""), True)
+        if position == 7:
+            yield from _eer_relationship_lines("R{}".format(i), "E{}".format(i), "E{}".format(i - 1),
+                                               ("0", "n"), ("1", ""), False)
+    yield "</eer>\n"
+
+
+def eer_relationship_xml_lines(num_relationships, num_entities=1000):
+    """
+    Yields the lines of an EER XML document with `num_relationships`
+    relationships between `num_entities` strong entities.
+
+    The relationships cycle through the one-to-one, one-to-many,
+    many-to-one and many-to-many kinds, each between two consecutive
+    entities, so every entity takes part in many relationships.
+    """
+    mults = [(("1", ""), ("1", "")), (("1", ""), ("0", "n")),
+             (("0", "n"), ("1", "")), (("0", "n"), ("0", "n"))]
+    yield "<eer>\n"
+    for i in range(num_entities):
+        yield '\t<entity name="E{}" type="Entity" weak="False">\n'.format(i)
+        yield ('\t\t<attribute type="attr" multi_valued="False" '
+               'derived="False" optional="False">{}</attribute>\n'.format(attribute_name(i, 0)))
+        yield ('\t\t<constraint type="identifier">{}</constraint>\n'
+               .format(attribute_name(i, 0)))
+        yield "\t</entity>\n"
+    for i in range(num_relationships):
+        mult1, mult2 = mults[i % len(mults)]
+        entity1 = "E{}".format(i % num_entities)
+        entity2 = "E{}".format((i + 1) % num_entities)
+        yield from _eer_relationship_lines("R{}".format(i), entity1, entity2,
+                                           mult1, mult2, False)
+    yield "</eer>\n"
+
+
+def _eer_relationship_lines(name, entity1, entity2, mult1, mult2, weak):
+    """Yields the lines of a single EER relationship block."""
+    yield '\t<relationship name="{}" type="Relationship" weak="{}">\n'.format(name, weak)
+    yield ('\t\t<attribute type="attr" multi_valued="False" '
+           'derived="False" optional="False">{}_attr</attribute>\n'.format(name.lower()))
+    for entity, mult in ((entity1, mult1), (entity2, mult2)):
+        yield ('\t\t<related_entity type="ent" mult_left="{}" mult_right="{}">'
+               '{}</related_entity>\n'.format(mult[0], mult[1], entity))
+    yield "\t</relationship>\n"
+
+
+def arm_xml_lines(num_entities, num_attributes=5):
+    """
+    Yields the lines of an ARM XML document with `num_entities` relations.
+
+    Relations are generated in groups of ten, each group containing:
+        - a parent relation covered by two disjoint subrelations
+        - a relation with a foreign key to the previous relation
+        - a weak relation whose primary key includes a foreign key
+        - a relationship relation whose primary key is two foreign keys
+    """
+    yield "<arm>\n"
+    for i in range(num_entities):
+        position = i % 10
+        yield '<entity name="A{}" type="Entity">\n'.format(i)
+        yield '    <attribute type="attr" data_type="OID">self</attribute>\n'
+        for j in range(num_attributes):
+            yield '    <attribute type="attr" data_type="{}">{}</attribute>\n'.format(
+                DATA_TYPES[j % len(DATA_TYPES)], attribute_name(i, j))
+        fd_attribs = [attribute_name(i, 0)]
+        fks = []
+        if position in (4, 5, 6) and i >= 1:
+            fks.append(("fk{}".format(i), "A{}".format(i - 1)))
+        if position == 6 and i >= 2:
+            fks.append(("fk{}b".format(i), "A{}".format(i - 2)))
+        for fk, _ in fks:
+            yield '    <attribute type="attr" data_type="OID">{}</attribute>\n'.format(fk)
+        if position == 5 and fks:
+            fd_attribs.append(fks[0][0])
+        if position == 6 and len(fks) == 2:
+            fd_attribs = [fk for fk, _ in fks]
+        yield '    <constraint type="pk">self</constraint>\n'
+        yield '    <constraint type="path_fd" target="self">\n'
+        for attr in fd_attribs:
+            yield '      <fd_attrib>{}</fd_attrib>\n'.format(attr)
+        yield '    </constraint>\n'
+        for fk, references in fks:
+            yield ('    <constraint type="fk" fk="{}" references="{}">{}</constraint>\n'
+                   .format(fk, references, fk))
+        if position == 0:
+            yield '    <constraint type="cover">\n'
+            yield '      <covered_by>A{}</covered_by>\n'.format(i + 1)
+            yield '      <covered_by>A{}</covered_by>\n'.format(i + 2)
+            yield '    </constraint>\n'
+        if position in (1, 2):
+            sibling = i + 1 if position == 1 else i - 1
+            yield '    <constraint type="inheritance">A{}</constraint>\n'.format(i - position)
+            yield '    <constraint type="disjoint">\n'
+            yield '      <disjoint_with>A{}</disjoint_with>\n'.format(sibling)
+            yield '    </constraint>\n'
+        yield '</entity>\n'
+    yield "</arm>\n"
+
+
+def write_xml(filename, lines):
+    """Writes the lines produced by one of the generators above to a file."""
+    with open(filename, "w") as f:
+        f.writelines(lines)
+
+
+def xml_file_object(lines):
+    """Returns an in-memory file object containing the generated document."""
+    return io.StringIO("".join(lines))
@@ -0,0 +1,81 @@
+"""
+Parallel transformation of large models.
+
+The transformation rules that involve a single entity (table declaration,
+attribute mapping, primary key and pathfd construction for EER to ARM, and
+the h/k classification and entity/relationship construction for ARM to EER)
+are applied to chunks of entities by a pool of worker processes. The rules
+that span several entities (foreign keys, hierarchies and the implicit
+disjointness constraints) are then applied in the main process by the
+model's own merge step, in the same order as a serial transformation, so
+the resulting model prints identically.
+
+Models with fewer than `threshold` entities are transformed serially, since
+starting the workers and copying the entities to them costs more than it
+saves.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import arm
+import eer
+import hierarchy
+
+DEFAULT_THRESHOLD = 5000
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _use_serial(num_entities, workers, threshold):
+    """Checks if a model of `num_entities` entities should be transformed serially."""
+    return num_entities < threshold or workers == 1
+
+
+def map_in_pool(function, items, workers, chunk_size):
+    """Applies `function` to `items` in a process pool. Returns the results in order."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items, chunksize=chunk_size))
+
+
+def transform_to_arm(eer_model, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     threshold=DEFAULT_THRESHOLD):
+    """Applies EER_Model.transform_to_arm() using a pool of worker processes.
+
+    Args:
+        eer_model (EER_Model): The model to transform.
+        workers (int): The number of worker processes. Defaults to the
+            number of CPUs.
+        chunk_size (int): The number of entities sent to a worker at a time.
+        threshold (int): Models with fewer entities are transformed serially.
+
+    Returns:
+        ARM: The same model as `eer_model.transform_to_arm()`.
+    """
+    workers = workers or os.cpu_count()
+    eer_entities = eer_model.get_eer_entities()
+    if _use_serial(len(eer_entities), workers, threshold):
+        return eer_model.transform_to_arm()
+    eer_entities = hierarchy.schedule(eer_entities)
+    arm_entities = map_in_pool(eer.transform_entity_to_arm, eer_entities, workers, chunk_size)
+    return eer_model.merge_arm_relations(eer_entities, arm_entities)
+
+
+def transform_to_eer(arm_model, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     threshold=DEFAULT_THRESHOLD):
+    """Applies ARM_Model.transform_to_eer() using a pool of worker processes.
+
+    Args:
+        arm_model (ARM_Model): The model to transform.
+        workers (int): The number of worker processes. Defaults to the
+            number of CPUs.
+        chunk_size (int): The number of relations sent to a worker at a time.
+        threshold (int): Models with fewer relations are transformed serially.
+
+    Returns:
+        EER: The same model as `arm_model.transform_to_eer()`.
+    """
+    workers = workers or os.cpu_count()
+    arm_entities = arm_model.get_arm_entities()
+    if _use_serial(len(arm_entities), workers, threshold):
+        return arm_model.transform_to_eer()
+    arm_entities = hierarchy.schedule(arm_entities)
+    results = map_in_pool(arm.transform_entity_to_eer, arm_entities, workers, chunk_size)
+    return arm_model.merge_eer_components(arm_entities, results)
@@ -0,0 +1,227 @@
+import hashlib
+import io
+import json
+import os
+import arm
+import eer
+import snapshot
+
+
+class Parse_Cache:
+    """
+    An opt-in, on-disk cache of models loaded from EER and ARM XML files.
+
+    Entries are keyed by the SHA-256 hash of the XML file's contents, so a
+    renamed or copied file still hits the cache and an edited file never
+    does. To avoid re-hashing unchanged files, the (mtime, size) of every
+    file seen is remembered and the previously computed hash is reused when
+    both are unchanged. A file is forgotten once it no longer exists or
+    its entries have all been evicted.
+
+    Models are stored in the binary snapshot format (see snapshot.py). When
+    the total size of the cached entries exceeds `max_bytes`, the least
+    recently used entries are evicted.
+
+    Attributes
+    ----------
+    directory : str
+        The directory the cache entries and index are stored in.
+    max_bytes : int
+        The maximum total size of the cached entries.
+    hits : int
+        The number of loads answered from the cache.
+    misses : int
+        The number of loads that required parsing the XML file.
+    evictions : int
+        The number of entries evicted to respect `max_bytes`.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, directory, max_bytes=256 * 2**20):
+        """
+        Args:
+            directory (str): The cache directory - created if it doesn't exist.
+            max_bytes (int): Optional maximum total size of the cached entries.
+                             Defaults to 256 MiB.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.index = self.read_index()
+
+    def load_eer(self, filename):
+        """Returns the EER_Model for `filename`, parsing it only on a cache miss."""
+        return self.load("eer", filename)
+
+    def load_arm(self, filename):
+        """Returns the ARM_Model for `filename`, parsing it only on a cache miss."""
+        return self.load("arm", filename)
+
+    def verify_eer(self, filename):
+        """Checks the cached EER_Model for `filename` against a fresh parse."""
+        return self.verify("eer", filename)
+
+    def verify_arm(self, filename):
+        """Checks the cached ARM_Model for `filename` against a fresh parse."""
+        return self.verify("arm", filename)
+
+    def load(self, kind, filename):
+        """
+        Returns the model of the given kind ("eer" or "arm") for `filename`,
+        from the cache if possible, otherwise by parsing the file and then
+        adding the resulting model to the cache.
+        """
+        digest, data = self.content_digest(filename)
+        key = "{}-{}".format(kind, digest)
+        model = self.read_entry(key)
+        if model is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if data is None:
+                with open(filename, "rb") as f:
+                    data = f.read()
+            model = parse(kind, io.BytesIO(data))
+            self.write_entry(key, model)
+            self.evict()
+            self.prune_files()
+        self.write_index()
+        return model
+
+    def verify(self, kind, filename):
+        """
+        Returns True if the cached model for `filename` is the same as the
+        model obtained by parsing the file afresh, False if it differs or
+        the file has not been cached yet.
+        """
+        digest, _ = self.content_digest(filename)
+        cached = self.read_entry("{}-{}".format(kind, digest))
+        if cached is None:
+            return False
+        return str(cached) == str(parse(kind, filename))
+
+    def content_digest(self, filename):
+        """
+        Returns the content hash of `filename` and, if the file had to be read
+        to compute it, its contents (otherwise None).
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        known = self.index["files"].get(path)
+        if known is not None and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2], None
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        self.index["files"][path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest, data
+
+    def entry_path(self, key):
+        """Returns the path of the file storing the entry for `key`."""
+        return os.path.join(self.directory, key + ".snapshot")
+
+    def read_entry(self, key):
+        """Returns the cached model for `key`, or None if it is not cached."""
+        if key not in self.index["entries"]:
+            return None
+        try:
+            model = snapshot.load(self.entry_path(key))
+        except (OSError, ValueError, snapshot.Snapshot_Error):
+            # The entry was removed or corrupted by another process
+            del self.index["entries"][key]
+            return None
+        self.touch(key)
+        return model
+
+    def write_entry(self, key, model):
+        """Adds `model` to the cache under `key`."""
+        path = self.entry_path(key)
+        temp_path = path + ".tmp"
+        snapshot.dump(model, temp_path)
+        os.replace(temp_path, path)
+        self.index["entries"][key] = [os.path.getsize(path), 0]
+        self.touch(key)
+
+    def touch(self, key):
+        """Marks the entry for `key` as the most recently used."""
+        self.index["clock"] += 1
+        self.index["entries"][key][1] = self.index["clock"]
+
+    def evict(self):
+        """Removes least recently used entries until `max_bytes` is respected."""
+        entries = self.index["entries"]
+        total = sum(size for size, _ in entries.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(entries, key=lambda key: entries[key][1]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(key)[0]
+            self.evictions += 1
+            try:
+                os.remove(self.entry_path(key))
+            except OSError:
+                pass
+
+    def prune_files(self):
+        """
+        Forgets the files that no longer exist or no longer have a cached
+        entry, so that the index is bounded like the entries.
+        """
+        digests = {key.split("-", 1)[1] for key in self.index["entries"]}
+        files = self.index["files"]
+        for path in list(files):
+            if files[path][2] not in digests or not os.path.exists(path):
+                del files[path]
+
+    def read_index(self):
+        """Reads the cache index, or returns an empty index if there is none."""
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILENAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"clock": 0, "files": {}, "entries": {}}
+
+    def write_index(self):
+        """Atomically writes the cache index to disk."""
+        path = os.path.join(self.directory, self.INDEX_FILENAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.index, f)
+        os.replace(path + ".tmp", path)
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        for key in list(self.index["entries"]):
+            try:
+                os.remove(self.entry_path(key))
+            except OSError:
+                pass
+        self.index = {"clock": 0, "files": {}, "entries": {}}
+        self.write_index()
+
+    def get_stats(self):
+        """Returns the cache counters and current size as a dictionary."""
+        entries = self.index["entries"]
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": sum(size for size, _ in entries.values())}
+
+
+def parse(kind, source):
+    """Parses an EER ("eer") or ARM ("arm") model from an XML file or file object."""
+    if kind == "eer":
+        model = eer.EER_Model()
+        model.load_eer(source)
+    elif kind == "arm":
+        model = arm.ARM_Model()
+        model.load_arm(source)
+    else:
+        raise ValueError("Unknown model kind: {}".format(kind))
+    return model
@@ -0,0 +1,174 @@
+"""
+Partitioning of an EER model into independently transformable components.
+
+Two entities are in the same component if they are linked, directly or
+indirectly, by an EER_Relationship or an Inheritance_Constraint. Every
+transformation rule except the implicit disjointness constraints (STEP VI)
+only involves the entities of one component, so each component can be
+transformed on its own - in a worker process, or not at all if it is
+unchanged since a previous run - and the results stitched together before
+STEP VI is applied to the whole model. The stitched model prints
+identically to `EER_Model.transform_to_arm()`.
+
+Each component carries a digest of its content (the SHA-256 of its binary
+snapshot), which keys the transformed relations in a cache.
+"""
+import hashlib
+import arm
+import eer
+import hierarchy
+import parallel
+import snapshot
+
+
+class Component:
+    """
+    A class used to represent a connected component of an EER model.
+
+    Attributes
+    ----------
+    eer_entities : list of EER_Entity
+        The entities of the component, in the order of the model.
+    eer_relationships : list of EER_Relationship
+        The relationships between those entities, in the order of the model.
+    """
+
+    def __init__(self):
+        self.eer_entities = []
+        self.eer_relationships = []
+        self.__digest = None
+
+    def to_eer_model(self):
+        """Returns an EER_Model holding just the entities and relationships of the component."""
+        eer_model = eer.EER_Model()
+        for eer_entity in self.eer_entities:
+            eer_model.add_eer_entity(eer_entity)
+        for relationship in self.eer_relationships:
+            eer_model.add_eer_relationship(relationship)
+        return eer_model
+
+    def get_digest(self):
+        """Returns the hex SHA-256 digest of the content of the component."""
+        if self.__digest is None:
+            self.__digest = hashlib.sha256(snapshot.dumps(self.to_eer_model())).hexdigest()
+        return self.__digest
+
+
+def find_components(eer_model):
+    """
+    Partitions an EER model into its connected components, in time linear in
+    the size of the model.
+
+    Returns:
+        list of Component: The components, ordered by their first entity
+            (components of relationships between entities missing from the
+            model come last).
+    """
+    parents = {}                  # name -> parent in the union-find forest
+
+    def find(name):
+        root = parents.setdefault(name, name)
+        while root != parents[root]:
+            root = parents[root]
+        # Compress the path to the root
+        while name != root:
+            parents[name], name = root, parents[name]
+        return root
+
+    def union(name1, name2):
+        root1, root2 = find(name1), find(name2)
+        if root1 != root2:
+            parents[root2] = root1
+
+    for eer_entity in eer_model.get_eer_entities():
+        find(eer_entity.get_name())
+        parent_name = eer_entity.get_parent()
+        if parent_name is not None:
+            union(parent_name, eer_entity.get_name())
+    for relationship in eer_model.get_eer_relationships():
+        union(relationship.get_entity1(), relationship.get_entity2())
+
+    components = {}               # root name -> Component, in order of creation
+    for eer_entity in eer_model.get_eer_entities():
+        root = find(eer_entity.get_name())
+        components.setdefault(root, Component()).eer_entities.append(eer_entity)
+    for relationship in eer_model.get_eer_relationships():
+        root = find(relationship.get_entity1())
+        components.setdefault(root, Component()).eer_relationships.append(relationship)
+    return list(components.values())
+
+
+def transform_component(component):
+    """Applies the transformation rules for EER to ARM, except STEP VI, to a Component."""
+    return component.to_eer_model().transform_to_arm(implicit_disjointness=False)
+
+
+def transform_to_arm(eer_model, workers=1, cache=None):
+    """Applies EER_Model.transform_to_arm() one connected component at a time.
+
+    Args:
+        eer_model (EER_Model): The model to transform.
+        workers (int): The number of worker processes that transform the
+            components. With a single worker they are transformed serially.
+        cache (dict of str to bytes): Optional snapshots of the transformed
+            components keyed by their digest, e.g. from a previous run. The
+            components found in it are not transformed again, and the others
+            are added to it.
+
+    Returns:
+        ARM: The same model as `eer_model.transform_to_arm()`.
+    """
+    components = find_components(eer_model)
+    if cache is None:
+        pending = components
+    else:
+        pending = [component for component in components
+                   if component.get_digest() not in cache]
+
+    if workers > 1 and len(pending) > 1:
+        transformed = parallel.map_in_pool(transform_component, pending, workers, 1)
+    else:
+        transformed = [transform_component(component) for component in pending]
+
+    arm_models = dict(zip(map(id, pending), transformed))
+    if cache is not None:
+        for component in pending:
+            cache[component.get_digest()] = snapshot.dumps(arm_models[id(component)])
+        # Components taken from the cache are loaded from their snapshot,
+        # so the cached relations are never modified
+        for component in components:
+            if id(component) not in arm_models:
+                arm_models[id(component)] = snapshot.loads(cache[component.get_digest()])
+
+    return stitch(eer_model, [arm_models[id(component)] for component in components])
+
+
+def stitch(eer_model, arm_models):
+    """
+    Combines the transformed components of an EER model into one ARM model,
+    in the order `EER_Model.transform_to_arm()` would produce the relations,
+    and applies STEP VI to it.
+
+    Args:
+        eer_model (EER_Model): The model the components were found in.
+        arm_models (list of ARM_Model): The transformed components.
+
+    Returns:
+        ARM: The ARM model for the whole of `eer_model`.
+    """
+    relations = {}                # relation name -> ARM_Entity
+    for arm_model in arm_models:
+        for arm_entity in arm_model.get_arm_entities():
+            relations[arm_entity.get_name()] = arm_entity
+
+    arm_model = arm.ARM_Model()
+    # The relations for entities come first, then those for relationships
+    for eer_entity in hierarchy.schedule(eer_model.get_eer_entities()):
+        arm_model.add_arm_entity(relations.pop(eer_entity.get_name()))
+    for relationship in eer_model.get_eer_relationships():
+        arm_entity = relations.pop(relationship.get_name(), None)
+        if arm_entity is not None:
+            arm_model.add_arm_entity(arm_entity)
+
+    eer.add_implicit_disjointness(arm_model)
+    return arm_model
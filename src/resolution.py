@@ -0,0 +1,139 @@
+"""
+Resolution of the relationships of an EER model to the ARM relations they
+affect.
+
+Each EER_Relationship is resolved once, using the name-keyed indexes of the
+EER entities and of the ARM relations produced so far, to the relation that
+receives its foreign key (or to a new relation for many-to-many
+relationships) and, for weak relationships, to the relation whose key
+pathfd is extended. Every lookup is constant time, so resolving all the
+relationships of a model is linear in their number.
+
+The kind of each relationship is worked out from the Cardinality of each
+end once, when its multiplicities are set, and cached on the relationship.
+"""
+import cardinality
+
+ONE_TO_ONE = "one-to-one"
+ONE_TO_MANY = "one-to-many"
+MANY_TO_ONE = "many-to-one"
+MANY_TO_MANY = "many-to-many"
+
+
+# (entity1 side is many, entity2 side is many) -> kind
+KINDS = {(False, False): ONE_TO_ONE, (False, True): ONE_TO_MANY,
+         (True, False): MANY_TO_ONE, (True, True): MANY_TO_MANY}
+
+
+def get_kind(mult1, mult2):
+    """
+    Returns the kind of a relationship with the given multiplicities,
+    e.g. MANY_TO_ONE for ("0", "n") and ("1", ""), or None if either
+    multiplicity is missing.
+    """
+    return get_cardinality_kind(cardinality.parse(mult1), cardinality.parse(mult2))
+
+
+def get_cardinality_kind(card1, card2):
+    """
+    Returns the kind of a relationship whose ends have the Cardinalities
+    `card1` and `card2`, or None if either is missing or invalid.
+    """
+    if card1 is None or card2 is None or not card1.is_valid() or not card2.is_valid():
+        return None
+    return KINDS[(card1.is_many(), card2.is_many())]
+
+
+class Resolved_Relationship:
+    """
+    A class used to represent an EER_Relationship resolved to ARM relations.
+
+    Attributes
+    ----------
+    relationship : EER_Relationship
+        The relationship that was resolved.
+    kind : str
+        One of ONE_TO_ONE, ONE_TO_MANY, MANY_TO_ONE or MANY_TO_MANY, or None
+        if the relationship has no multiplicities.
+    victim : ARM_Entity
+        The relation that receives the foreign key, or None for
+        many-to-many relationships (which become a new relation).
+    referenced : str
+        The name of the entity referenced by the foreign key, or None for
+        many-to-many relationships.
+    weak_victim : ARM_Entity
+        The relation of the weak entity of a weak relationship, or None.
+    owner : str
+        The name of the entity that owns the weak entity, or None.
+    """
+
+    __slots__ = ("relationship", "kind", "victim", "referenced", "weak_victim", "owner")
+
+    def __init__(self, relationship, kind, victim=None, referenced=None,
+                 weak_victim=None, owner=None):
+        self.relationship = relationship
+        self.kind = kind
+        self.victim = victim
+        self.referenced = referenced
+        self.weak_victim = weak_victim
+        self.owner = owner
+
+
+class Relationship_Resolver:
+    """
+    A class used to resolve EER relationships to the ARM relations they affect.
+
+    Attributes
+    ----------
+    eer_model : EER_Model
+        The model whose entities are looked up by name.
+    arm_model : ARM_Model
+        The model holding the relations produced for those entities.
+    """
+
+    def __init__(self, eer_model, arm_model):
+        """
+        Args:
+            eer_model (EER_Model): The model the relationships belong to.
+            arm_model (ARM_Model): The relations produced for its entities.
+        """
+        self.eer_model = eer_model
+        self.arm_model = arm_model
+
+    def get_weak_entity(self, relationship):
+        """
+        Returns the name of the weak entity of a weak relationship - entity2
+        if it is a weak entity, otherwise entity1.
+        """
+        entity2 = relationship.get_entity2()
+        ent = self.eer_model.find_entity(entity2)
+        if ent is not None and ent.is_weak():
+            return entity2
+        return relationship.get_entity1()
+
+    def resolve(self, relationship):
+        """Resolves a single EER_Relationship. Returns a Resolved_Relationship."""
+        entity1 = relationship.get_entity1()
+        entity2 = relationship.get_entity2()
+        kind = relationship.get_kind()
+        resolved = Resolved_Relationship(relationship, kind)
+
+        if relationship.is_weak():
+            weak_entity = self.get_weak_entity(relationship)
+            resolved.weak_victim = self.arm_model.find_entity(weak_entity)
+            resolved.owner = entity2 if weak_entity == entity1 else entity1
+
+        if kind == ONE_TO_ONE or kind == MANY_TO_ONE:
+            # The foreign key goes in entity1, on the `n` side (if any)
+            resolved.victim = self.arm_model.find_entity(entity1)
+            resolved.referenced = entity2
+        elif kind == ONE_TO_MANY:
+            # The foreign key goes in entity2, on the `n` side
+            resolved.victim = self.arm_model.find_entity(entity2)
+            resolved.referenced = entity1
+        return resolved
+
+    def resolve_all(self, relationships):
+        """Yields a Resolved_Relationship for each of `relationships`, in order."""
+        for relationship in relationships:
+            yield self.resolve(relationship)
@@ -0,0 +1,305 @@
+"""
+Round-trip verification of the transformations.
+
+`verify_eer()` transforms an EER model to ARM and back (EER -> ARM -> EER),
+and `verify_arm()` an ARM model to EER and back (ARM -> EER -> ARM). Both
+ends are normalised to a canonical form and compared with
+`diff.diff_models()`, so the result lists exactly the entities,
+attributes, relationships and constraints that did not survive.
+
+Some differences are made by the transformation rules themselves, and are
+removed by the normalisation rather than reported:
+    - Names generated by the rules: relationships are named after their
+      ends, and foreign key columns and constraints after the relation
+      they reference.
+    - The implicit disjointness constraints of relations outside a
+      hierarchy (STEP VI), which EER cannot express.
+    - Empty identifiers, which the ARM -> EER rules give to subclasses.
+    - How a multiplicity is written, e.g. ("1", "") and ("1", "1") for ("1",).
+    - Data types, as EER has none (unless `ignore_data_types` is False).
+Order never matters, as models are compared by fingerprint.
+
+`verify_directory()` verifies every XML model in a directory in a pool of
+worker processes and reports the time taken by each.
+"""
+import functools
+import os
+import time
+import xml.etree.ElementTree as ET
+import arm
+import arm_constraints
+import diff
+import eer
+import eer_constraints
+import parallel
+
+
+class Round_Trip_Result:
+    """
+    A class used to represent the outcome of a round trip of one model.
+
+    Attributes
+    ----------
+    name : str
+        The name of the model, e.g. its file name.
+    kind : str
+        The kind of the model the round trip starts from - "eer" or "arm".
+    model_diff : Model_Diff
+        The differences between the normalised model and its normalised
+        round trip, or None if the round trip failed.
+    error : str
+        The error that stopped the round trip, otherwise None.
+    seconds : float
+        The time taken, including loading the model from a file.
+    """
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.model_diff = None
+        self.error = None
+        self.seconds = 0.0
+
+    def is_ok(self):
+        """Checks if every element of the model survived the round trip."""
+        return self.error is None and self.model_diff.is_empty()
+
+    def to_dict(self):
+        """Returns the outcome as a dictionary of lists and strings."""
+        result = {"name": self.name, "kind": self.kind, "ok": self.is_ok(),
+                  "seconds": round(self.seconds, 6)}
+        if self.error is not None:
+            result["error"] = self.error
+        else:
+            result["diff"] = self.model_diff.to_dict()
+        return result
+
+    def __str__(self):
+        """
+        String representation of the outcome.
+        e.g.
+        'ARM_Inheritance.xml (arm): FAILED in 0.004s
+        ~ Postgrad
+            - constraint: primary key (self)'
+        """
+        status = "OK" if self.is_ok() else "FAILED"
+        header = "{} ({}): {} in {:.3f}s".format(self.name, self.kind, status, self.seconds)
+        if self.error is not None:
+            return header + "\n" + self.error
+        if self.is_ok():
+            return header
+        return header + "\n" + str(self.model_diff)
+
+
+def verify_eer(eer_model, name="EER model"):
+    """Verifies that an EER model survives EER -> ARM -> EER.
+
+    Args:
+        eer_model (EER_Model): The model to verify.
+        name (str): Optional name of the model for the result.
+
+    Returns:
+        Round_Trip_Result: The elements that did not survive.
+    """
+    return verify("eer", eer_model, name)
+
+
+def verify_arm(arm_model, name="ARM model", ignore_data_types=True):
+    """Verifies that an ARM model survives ARM -> EER -> ARM.
+
+    Args:
+        arm_model (ARM_Model): The model to verify.
+        name (str): Optional name of the model for the result.
+        ignore_data_types (bool): Whether data types, which are lost in
+            EER, are left out of the comparison.
+
+    Returns:
+        Round_Trip_Result: The elements that did not survive.
+    """
+    return verify("arm", arm_model, name, ignore_data_types)
+
+
+def verify(kind, model, name, ignore_data_types=True, start=None):
+    """
+    Runs the round trip of a model of the given kind ("eer" or "arm"),
+    timing it from `start` (by default, from now).
+    """
+    result = Round_Trip_Result(name, kind)
+    if start is None:
+        start = time.perf_counter()
+    try:
+        if kind == "eer":
+            round_trip = model.transform_to_arm().transform_to_eer()
+            result.model_diff = diff.diff_models(normalise_eer(model),
+                                                 normalise_eer(round_trip))
+        else:
+            round_trip = model.transform_to_eer().transform_to_arm()
+            result.model_diff = diff.diff_models(normalise_arm(model, ignore_data_types),
+                                                 normalise_arm(round_trip, ignore_data_types))
+    except Exception as e:
+        result.error = "{}: {}".format(type(e).__name__, e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def verify_file(filename, ignore_data_types=True):
+    """
+    Loads the EER or ARM model in an XML file - by the tag of its root
+    element - and verifies its round trip.
+    """
+    start = time.perf_counter()
+    name = os.path.basename(filename)
+    try:
+        kind = detect_kind(filename)
+        if kind == "eer":
+            model = eer.EER_Model()
+            model.load_eer(filename)
+        else:
+            model = arm.ARM_Model()
+            model.load_arm(filename)
+    except Exception as e:
+        result = Round_Trip_Result(name, None)
+        result.error = "{}: {}".format(type(e).__name__, e)
+        result.seconds = time.perf_counter() - start
+        return result
+    return verify(kind, model, name, ignore_data_types, start)
+
+
+def verify_directory(directory, workers=None, chunk_size=1, ignore_data_types=True):
+    """Verifies the round trip of every XML model in a directory.
+
+    Args:
+        directory (str): The directory holding the models.
+        workers (int): The number of worker processes. Defaults to the
+            number of CPUs; with one worker the models are verified serially.
+        chunk_size (int): The number of models sent to a worker at a time.
+        ignore_data_types (bool): Whether data types are left out of the
+            comparison of ARM models.
+
+    Returns:
+        list of Round_Trip_Result: The result of each model, in the order
+            of their file names.
+    """
+    filenames = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if name.lower().endswith(".xml"))
+    function = functools.partial(verify_file, ignore_data_types=ignore_data_types)
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(filenames) <= 1:
+        return [function(filename) for filename in filenames]
+    return parallel.map_in_pool(function, filenames, workers, chunk_size)
+
+
+def detect_kind(filename):
+    """
+    Returns "eer" or "arm" from the root element of an XML model, reading
+    only as far as the root element.
+
+    Raises:
+        AssertionError:
+            if the root element is neither <eer> nor <arm>
+    """
+    for _, element in ET.iterparse(filename, events=("start",)):
+        kind = element.tag.lower()
+        assert kind in ("eer", "arm"), "Not an EER or ARM model: <{}>".format(element.tag)
+        return kind
+
+
+def normalise_eer(eer_model):
+    """
+    Returns a canonical copy of an EER model, without generated
+    relationship names and empty identifiers, and with canonical
+    multiplicities.
+    """
+    normalised = eer.EER_Model()
+    for eer_entity in eer_model.get_eer_entities():
+        copy = eer.EER_Entity(eer_entity.get_name(), eer_entity.is_weak())
+        for attribute in eer_entity.get_attributes():
+            copy.add_attribute(attribute)
+        for constraint in eer_entity.get_constraints():
+            if type(constraint) == eer_constraints.Identifier_Constraint and \
+                    constraint.get_identifier() == []:
+                continue
+            copy.add_constraint(constraint)
+        normalised.add_eer_entity(copy)
+
+    for relationship in eer_model.get_eer_relationships():
+        # Each end keeps its multiplicity, and the ends are put in a canonical order
+        ends = sorted([(relationship.get_entity1(),
+                        normalise_multiplicity(relationship.get_mult1())),
+                       (relationship.get_entity2(),
+                        normalise_multiplicity(relationship.get_mult2()))],
+                      key=lambda end: (str(end[0]), end[1]))
+        (entity1, mult1), (entity2, mult2) = ends
+        copy = eer.EER_Relationship("{}-{}".format(entity1, entity2), entity1, entity2,
+                                    mult1, mult2, relationship.is_weak())
+        for attribute in relationship.get_attributes():
+            copy.add_attribute(attribute)
+        normalised.add_eer_relationship(copy)
+    return normalised
+
+
+def normalise_multiplicity(mult):
+    """
+    Returns a multiplicity in a canonical form without empty bounds, in
+    which an exact multiplicity such as ("1", "1") is written ("1",).
+    """
+    bounds = tuple(bound for bound in (mult or ()) if bound != "")
+    if len(bounds) == 2 and bounds[0] == bounds[1]:
+        return bounds[:1]
+    return bounds
+
+
+def normalise_arm(arm_model, ignore_data_types=True):
+    """
+    Returns a canonical copy of an ARM model, without generated foreign key
+    names, the implicit disjointness constraints of relations outside a
+    hierarchy and, if `ignore_data_types` is True, data types.
+    """
+    normalised = arm.ARM_Model()
+    for arm_entity in arm_model.get_arm_entities():
+        # Foreign key columns are named after the relation they reference
+        renamed = {}
+        for constraint in arm_entity.get_fk_constraints():
+            name = "->{}".format(constraint.get_references())
+            occurrence = 1
+            while name in renamed.values():
+                occurrence += 1
+                name = "->{}#{}".format(constraint.get_references(), occurrence)
+            renamed[constraint.get_fk()] = name
+
+        copy = arm.ARM_Entity(arm_entity.get_name())
+        for attribute in arm_entity.get_attributes():
+            data_type = "anyType" if ignore_data_types else attribute.get_data_type()
+            copy.add_attribute(arm.ARM_Attribute(renamed.get(attribute.get_name(),
+                                                             attribute.get_name()), data_type))
+        is_subclass = arm_entity.get_parent() is not None
+        for constraint in arm_entity.get_constraints():
+            constraint_type = type(constraint)
+            if constraint_type == arm_constraints.FK_Constraint:
+                name = renamed[constraint.get_fk()]
+                constraint = arm_constraints.FK_Constraint(name, name,
+                                                           constraint.get_references())
+            elif constraint_type == arm_constraints.Pathfd_Constraint:
+                constraint = arm_constraints.Pathfd_Constraint(
+                    [renamed.get(a, a) for a in constraint.get_attributes()],
+                    renamed.get(constraint.get_target(), constraint.get_target()))
+            elif constraint_type == arm_constraints.PK_Constraint:
+                constraint = arm_constraints.PK_Constraint(renamed.get(constraint.get_pk(),
+                                                                       constraint.get_pk()))
+            elif constraint_type == arm_constraints.Disjointness_Constraint and \
+                    not is_subclass:
+                continue
+            copy.add_constraint(constraint)
+        normalised.add_arm_entity(copy)
+    return normalised
+
+
+if __name__ == '__main__':
+    # e.g. `python3 roundtrip.py ../EER_XML_Examples ../ARM_XML_Examples`
+    import sys
+    failed = 0
+    for directory in sys.argv[1:]:
+        for result in verify_directory(directory):
+            print(result)
+            failed += not result.is_ok()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,374 @@
+"""
+A compact, versioned binary snapshot format for EER_Model and ARM_Model.
+
+Unlike the textual `__str__` output, a snapshot can be loaded back into an
+identical model, and doing so is much faster than parsing the XML the model
+was originally loaded from.
+
+Layout (all integers are unsigned 32-bit little-endian):
+
+    header   magic b"VKSN", version (u16), model kind (u8), padding (u8),
+             number of strings, length of the string table in bytes,
+             number of record integers
+    records  the model as a flat sequence of integers - counts, flags,
+             constraint tags and indices into the string table
+    strings  every distinct string in the model, UTF-8 encoded and
+             separated by NUL characters
+
+Shared disjointness groups (see Disjointness_Group) are also stored once:
+the first constraint referring to a group stores 0 followed by its members,
+later ones store the group's position among the groups seen so far plus one.
+
+Strings are stored once and referred to by index, with index 0 reserved
+for None. Lists of strings are stored as their length plus one followed by
+their items, with a length of 0 marking a missing (None) list. The record
+section starts at a 4-byte aligned offset so that it can be read in place
+from a memory-mapped file.
+"""
+import array
+import mmap
+import struct
+import sys
+import arm
+import arm_constraints as AC
+import eer
+import eer_constraints as EC
+
+MAGIC = b"VKSN"
+VERSION = 2
+READABLE_VERSIONS = (1, 2)
+HEADER = struct.Struct("<4sHBxIII")
+
+EER_KIND = 1
+ARM_KIND = 2
+
+# Constraint tags
+ARM_PK = 1
+ARM_FK = 2
+ARM_INHERITANCE = 3
+ARM_COVER = 4
+ARM_DISJOINTNESS = 5
+ARM_PATHFD = 6
+ARM_SHARED_DISJOINTNESS = 7  # since version 2
+EER_IDENTIFIER = 1
+EER_INHERITANCE = 2
+
+
+class Snapshot_Error(Exception):
+    """Raised when data is not a snapshot this version can read."""
+
+
+class _Writer:
+    """Accumulates the string table and integer records of a snapshot."""
+
+    def __init__(self):
+        self.strings = {None: 0}
+        self.groups = {}
+        self.ints = []
+
+    def string(self, value):
+        """Appends the string table index of `value` (0 for None)."""
+        index = self.strings.get(value)
+        if index is None:
+            assert "\0" not in value
+            index = len(self.strings)
+            self.strings[value] = index
+        self.ints.append(index)
+
+    def strings_list(self, values):
+        """Appends the length of `values` plus one, followed by its strings."""
+        if values is None:
+            self.ints.append(0)
+            return
+        self.ints.append(len(values) + 1)
+        for value in values:
+            self.string(value)
+
+    def group(self, group):
+        """Appends a reference to a shared group, or the group itself if it is new."""
+        index = self.groups.get(id(group))
+        if index is not None:
+            self.ints.append(index + 1)
+            return
+        self.groups[id(group)] = len(self.groups)
+        self.ints.append(0)
+        self.strings_list(group.get_members())
+
+    def to_bytes(self, kind):
+        """Returns the complete snapshot."""
+        records = array.array("I", self.ints)
+        if sys.byteorder != "little":
+            records.byteswap()
+        strings = list(self.strings)[1:]  # skip None
+        table = "\0".join(strings).encode("utf-8")
+        header = HEADER.pack(MAGIC, VERSION, kind, len(strings), len(table), len(records))
+        return header + records.tobytes() + table
+
+
+def dumps(model):
+    """Returns the snapshot of an EER_Model or ARM_Model as bytes."""
+    writer = _Writer()
+    if isinstance(model, eer.EER_Model):
+        _write_eer(writer, model)
+        return writer.to_bytes(EER_KIND)
+    if isinstance(model, arm.ARM_Model):
+        _write_arm(writer, model)
+        return writer.to_bytes(ARM_KIND)
+    raise TypeError("Can only snapshot an EER_Model or ARM_Model")
+
+
+def dump(model, filename):
+    """Writes the snapshot of an EER_Model or ARM_Model to a file."""
+    data = dumps(model)
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+def loads(data):
+    """Returns the model stored in a snapshot held in a bytes-like object."""
+    view = memoryview(data)
+    try:
+        return _read(view)
+    finally:
+        view.release()
+
+
+def load(filename, use_mmap=True):
+    """
+    Returns the model stored in a snapshot file.
+
+    By default the file is memory-mapped and decoded in place rather than
+    first being read into a bytes object.
+    """
+    with open(filename, "rb") as f:
+        if not use_mmap:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped)
+
+
+def _read(view):
+    """Decodes the snapshot held in the memoryview `view`."""
+    if len(view) < HEADER.size:
+        raise Snapshot_Error("Truncated snapshot header")
+    magic, version, kind, num_strings, table_size, num_ints = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise Snapshot_Error("Not a model snapshot")
+    if version not in READABLE_VERSIONS:
+        raise Snapshot_Error("Unsupported snapshot version {}".format(version))
+    records_end = HEADER.size + 4 * num_ints
+    if len(view) != records_end + table_size:
+        raise Snapshot_Error("Snapshot size does not match its header")
+
+    strings = str(view[records_end:], "utf-8").split("\0") if num_strings else []
+    if len(strings) != num_strings:
+        raise Snapshot_Error("Corrupt snapshot string table")
+    strings.insert(0, None)
+
+    records = view[HEADER.size:records_end]
+    if sys.byteorder == "little":
+        records = records.cast("I")
+    else:
+        # array("I", records) would make an int of each byte, not of each word
+        words = array.array("I")
+        words.frombytes(records)
+        words.byteswap()
+        records = words
+    try:
+        reader = iter(records).__next__
+        if kind == EER_KIND:
+            return _read_eer(reader, strings)
+        if kind == ARM_KIND:
+            return _read_arm(reader, strings)
+        raise Snapshot_Error("Unknown model kind {}".format(kind))
+    except (StopIteration, IndexError):
+        raise Snapshot_Error("Corrupt snapshot records")
+    finally:
+        if isinstance(records, memoryview):
+            records.release()
+
+
+def _strings_list(reader, strings):
+    """Reads a list of strings written by `_Writer.strings_list`."""
+    length = reader()
+    if length == 0:
+        return None
+    return [strings[reader()] for _ in range(length - 1)]
+
+
+def _write_arm(writer, model):
+    """Appends the records of an ARM_Model."""
+    ints = writer.ints
+    entities = model.get_arm_entities()
+    ints.append(len(entities))
+    for entity in entities:
+        writer.string(entity.get_name())
+        attributes = entity.get_attributes()
+        ints.append(len(attributes))
+        for attribute in attributes:
+            writer.string(attribute.get_name())
+            writer.string(attribute.get_data_type())
+        constraints = entity.get_constraints()
+        ints.append(len(constraints))
+        for constraint in constraints:
+            constraint_type = type(constraint)
+            if constraint_type == AC.PK_Constraint:
+                ints.append(ARM_PK)
+                writer.string(constraint.get_pk())
+            elif constraint_type == AC.FK_Constraint:
+                ints.append(ARM_FK)
+                writer.string(constraint.get_name())
+                writer.string(constraint.get_fk())
+                writer.string(constraint.get_references())
+            elif constraint_type == AC.Inheritance_Constraint:
+                ints.append(ARM_INHERITANCE)
+                writer.string(constraint.get_parent())
+            elif constraint_type == AC.Cover_Constraint:
+                ints.append(ARM_COVER)
+                writer.strings_list(constraint.get_covered_by())
+            elif constraint_type == AC.Disjointness_Constraint:
+                if constraint.get_owner() is None:
+                    ints.append(ARM_DISJOINTNESS)
+                    writer.strings_list(constraint.get_disjoint_with())
+                else:
+                    ints.append(ARM_SHARED_DISJOINTNESS)
+                    writer.group(constraint.get_group())
+                    writer.string(constraint.get_owner())
+            elif constraint_type == AC.Pathfd_Constraint:
+                ints.append(ARM_PATHFD)
+                writer.strings_list(constraint.get_attributes())
+                writer.string(constraint.get_target())
+            else:
+                raise TypeError("Cannot snapshot constraint {!r}".format(constraint))
+
+
+def _read_arm(reader, strings):
+    """Rebuilds an ARM_Model from its records."""
+    model = arm.ARM_Model()
+    ARM_Attribute = arm.ARM_Attribute
+    groups = []
+    for _ in range(reader()):
+        entity = arm.ARM_Entity(strings[reader()])
+        add_attribute = entity.add_attribute
+        for _ in range(reader()):
+            name = strings[reader()]
+            add_attribute(ARM_Attribute(name, strings[reader()]))
+        for _ in range(reader()):
+            tag = reader()
+            if tag == ARM_PK:
+                constraint = AC.PK_Constraint(strings[reader()])
+            elif tag == ARM_FK:
+                name = strings[reader()]
+                fk = strings[reader()]
+                constraint = AC.FK_Constraint(name, fk, strings[reader()])
+            elif tag == ARM_INHERITANCE:
+                constraint = AC.Inheritance_Constraint(strings[reader()])
+            elif tag == ARM_COVER:
+                constraint = AC.Cover_Constraint(_strings_list(reader, strings))
+            elif tag == ARM_DISJOINTNESS:
+                constraint = AC.Disjointness_Constraint(_strings_list(reader, strings))
+            elif tag == ARM_SHARED_DISJOINTNESS:
+                reference = reader()
+                if reference == 0:
+                    group = AC.Disjointness_Group(_strings_list(reader, strings))
+                    groups.append(group)
+                else:
+                    group = groups[reference - 1]
+                constraint = AC.Disjointness_Constraint(group, owner=strings[reader()])
+            elif tag == ARM_PATHFD:
+                attributes = _strings_list(reader, strings)
+                constraint = AC.Pathfd_Constraint(attributes, strings[reader()])
+            else:
+                raise Snapshot_Error("Unknown ARM constraint tag {}".format(tag))
+            entity.add_constraint(constraint)
+        model.add_arm_entity(entity, allow_duplicate=True)
+    return model
+
+
+def _write_eer_attributes(writer, attributes):
+    """Appends the records of a list of EER_Attribute."""
+    writer.ints.append(len(attributes))
+    for attribute in attributes:
+        writer.string(attribute.get_name())
+        writer.ints.append(attribute.is_multi_valued()
+                           | attribute.is_derived() << 1
+                           | attribute.is_optional() << 2)
+
+
+def _read_eer_attributes(reader, strings, owner):
+    """Reads a list of EER_Attribute and adds them to `owner`."""
+    EER_Attribute = eer.EER_Attribute
+    add_attribute = owner.add_attribute
+    for _ in range(reader()):
+        name = strings[reader()]
+        flags = reader()
+        add_attribute(EER_Attribute(name, bool(flags & 1), bool(flags & 2), bool(flags & 4)))
+
+
+def _write_eer(writer, model):
+    """Appends the records of an EER_Model."""
+    ints = writer.ints
+    entities = model.get_eer_entities()
+    ints.append(len(entities))
+    for entity in entities:
+        writer.string(entity.get_name())
+        ints.append(int(entity.is_weak()))
+        _write_eer_attributes(writer, entity.get_attributes())
+        constraints = entity.get_constraints()
+        ints.append(len(constraints))
+        for constraint in constraints:
+            constraint_type = type(constraint)
+            if constraint_type == EC.Identifier_Constraint:
+                ints.append(EER_IDENTIFIER)
+                writer.strings_list(constraint.get_identifier())
+            elif constraint_type == EC.Inheritance_Constraint:
+                ints.append(EER_INHERITANCE)
+                writer.string(constraint.get_parent())
+                ints.append(constraint.is_disjoint() | constraint.is_covering() << 1)
+            else:
+                raise TypeError("Cannot snapshot constraint {!r}".format(constraint))
+
+    relationships = model.get_eer_relationships()
+    ints.append(len(relationships))
+    for relationship in relationships:
+        writer.string(relationship.get_name())
+        ints.append(int(relationship.is_weak()))
+        writer.string(relationship.get_entity1())
+        writer.string(relationship.get_entity2())
+        writer.strings_list(relationship.get_mult1())
+        writer.strings_list(relationship.get_mult2())
+        _write_eer_attributes(writer, relationship.get_attributes())
+
+
+def _read_eer(reader, strings):
+    """Rebuilds an EER_Model from its records."""
+    model = eer.EER_Model()
+    for _ in range(reader()):
+        name = strings[reader()]
+        entity = eer.EER_Entity(name, bool(reader()))
+        _read_eer_attributes(reader, strings, entity)
+        for _ in range(reader()):
+            tag = reader()
+            if tag == EER_IDENTIFIER:
+                constraint = EC.Identifier_Constraint(_strings_list(reader, strings))
+            elif tag == EER_INHERITANCE:
+                parent = strings[reader()]
+                flags = reader()
+                constraint = EC.Inheritance_Constraint(parent, bool(flags & 1), bool(flags & 2))
+            else:
+                raise Snapshot_Error("Unknown EER constraint tag {}".format(tag))
+            entity.add_constraint(constraint)
+        model.add_eer_entity(entity, allow_duplicate=True)
+
+    for _ in range(reader()):
+        relationship = eer.EER_Relationship(strings[reader()])
+        relationship.set_weak(bool(reader()))
+        relationship.set_entity1(strings[reader()])
+        relationship.set_entity2(strings[reader()])
+        mult1 = _strings_list(reader, strings)
+        mult2 = _strings_list(reader, strings)
+        relationship.set_mult1(None if mult1 is None else tuple(mult1))
+        relationship.set_mult2(None if mult2 is None else tuple(mult2))
+        _read_eer_attributes(reader, strings, relationship)
+        model.add_eer_relationship(relationship)
+    return model
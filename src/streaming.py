@@ -0,0 +1,211 @@
+"""
+Streaming transformations that yield each result as soon as it is final.
+
+`transform_to_arm()` yields the ARM_Entity objects of an EER model's
+transformation one at a time, so that a consumer can serialise each relation
+(see `dump_arm()`) and drop it rather than hold the whole ARM model in
+memory. The rules are the same as `EER_Model.transform_to_arm()`, and each
+relation yielded prints identically to the same relation in the eager
+result, but relations come out in the order they are finished rather than
+in the order of the eager model.
+
+Which relations are held back:
+    - The relation of an entity is held back until every relationship it
+      takes part in has been applied (its foreign keys and, for a weak
+      entity, its key pathfd extension). Relationships are applied in the
+      order of the model as soon as the relations of both their entities
+      exist, so a relation taking part in a late relationship is held until
+      that relationship is reached.
+    - Disjointness and cover constraints never hold a relation back: the
+      hierarchy and the relations outside it (STEP VI) are indexed by name
+      before any relation is produced, and the disjointness groups are
+      complete from the start.
+    - Entities are produced parents first (see `hierarchy.schedule()`),
+      which holds nothing back but reorders subclasses listed before their
+      parents.
+Models whose relationships are listed close to their entities - as in most
+exports - therefore hold only a few relations at any time.
+
+`transform_to_eer()` yields the EER_Entity and EER_Relationship objects of
+an ARM model's transformation. Each relation only depends on itself and its
+parent relation, so nothing is held back.
+"""
+import arm
+import arm_constraints
+import eer
+import hierarchy
+import resolution
+
+
+def transform_to_arm(eer_model):
+    """Applies the transformation rules for EER to ARM, one relation at a time.
+
+    Args:
+        eer_model (EER_Model): The model to transform.
+
+    Yields:
+        ARM_Entity: Each relation of the ARM model, once it is final.
+    """
+    eer_entities = hierarchy.schedule(eer_model.get_eer_entities())
+    relationships = eer_model.get_eer_relationships()
+    hierarchy_index = hierarchy.Hierarchy_Index(eer_entities)
+    disjoint_groups = {}          # parent name -> Disjointness_Group
+
+    # STEP VI: the relations outside a hierarchy are all known by name up
+    # front, so their shared group is complete before any of them is yielded
+    many_to_many = set()
+    for position, relationship in enumerate(relationships):
+        if relationship.get_kind() == resolution.MANY_TO_MANY:
+            many_to_many.add(position)
+    implicit_members = [eer_entity.get_name() for eer_entity in eer_entities
+                        if eer_entity.get_parent() is None]
+    implicit_members.extend(relationships[position].get_name()
+                            for position in sorted(many_to_many))
+    implicit_group = None
+    if len(implicit_members) > 1:
+        implicit_group = arm_constraints.Disjointness_Group(implicit_members)
+
+    def finish(arm_entity):
+        """Adds the STEP VI constraint to a relation that is otherwise final."""
+        if implicit_group is not None and arm_entity.get_parent() is None:
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(
+                implicit_group, owner=arm_entity.get_name()))
+        return arm_entity
+
+    # The position of the last relationship each entity takes part in
+    last_relationship = {}
+    for position, relationship in enumerate(relationships):
+        last_relationship[relationship.get_entity1()] = position
+        last_relationship[relationship.get_entity2()] = position
+
+    pending = Pending_Relations()  # relations awaiting relationships
+    produced = set()               # names of the entities transformed so far
+    resolver = resolution.Relationship_Resolver(eer_model, pending)
+    next_relationship = 0
+
+    def is_ready(name):
+        """Checks if the relation of `name` exists, or never will."""
+        return name in produced or eer_model.find_entity(name) is None
+
+    def apply_relationships():
+        """Applies the relationships whose relations all exist, in order."""
+        nonlocal next_relationship
+        while next_relationship < len(relationships):
+            relationship = relationships[next_relationship]
+            entity1 = relationship.get_entity1()
+            entity2 = relationship.get_entity2()
+            if not (is_ready(entity1) and is_ready(entity2)):
+                return
+            resolved = resolver.resolve(relationship)
+            if resolved.weak_victim is not None:
+                eer.extend_key_pathfd(resolved.weak_victim, resolved.owner)
+            if next_relationship in many_to_many:
+                yield finish(eer.transform_relationship_to_arm(relationship))
+            elif resolved.kind is not None:
+                # checking a victim entity has been found
+                assert resolved.victim is not None
+                eer.add_foreign_key(resolved.victim, resolved.referenced)
+            # The relations taking part in no later relationship are final
+            for name in (entity1, entity2):
+                if last_relationship[name] == next_relationship:
+                    arm_entity = pending.remove_arm_entity(name)
+                    if arm_entity is not None:
+                        yield finish(arm_entity)
+            next_relationship += 1
+
+    for eer_entity in eer_entities:
+        name = eer_entity.get_name()
+        arm_entity = eer.transform_entity_to_arm(eer_entity)
+        parent_name = hierarchy_index.get_parent(name)
+        if parent_name is not None and hierarchy_index.is_disjoint(name):
+            group = disjoint_groups.get(parent_name)
+            if group is None:
+                group = arm_constraints.Disjointness_Group(
+                    hierarchy_index.get_disjoint_children(parent_name))
+                disjoint_groups[parent_name] = group
+            arm_entity.add_constraint(
+                arm_constraints.Disjointness_Constraint(group, owner=name))
+        covered_by = hierarchy_index.get_covering_children(name)
+        if covered_by:
+            arm_entity.add_constraint(arm_constraints.Cover_Constraint(covered_by))
+        produced.add(name)
+
+        if name in last_relationship:
+            pending.add_arm_entity(arm_entity)
+            yield from apply_relationships()
+        else:
+            yield finish(arm_entity)
+
+    # Every relation exists now, so the remaining relationships can be applied
+    yield from apply_relationships()
+
+
+class Pending_Relations:
+    """
+    A class used to hold the relations awaiting relationships, which can be
+    looked up by name like the relations of an ARM_Model.
+
+    Attributes
+    ----------
+    relations : dict of str to ARM_Entity
+        The relations keyed by name.
+    """
+
+    def __init__(self):
+        self.relations = {}
+
+    def add_arm_entity(self, arm_entity):
+        """Adds an ARM_Entity to the relations held."""
+        self.relations[arm_entity.get_name()] = arm_entity
+
+    def remove_arm_entity(self, name):
+        """Removes and returns the relation with the given name, or None if there is none."""
+        return self.relations.pop(name, None)
+
+    def find_entity(self, entity_name):
+        """Returns the relation with the given name, or None if there is none."""
+        return self.relations.get(entity_name)
+
+    def __len__(self):
+        return len(self.relations)
+
+
+def transform_to_eer(arm_model):
+    """Applies the transformation rules for ARM to EER, one relation at a time.
+
+    Args:
+        arm_model (ARM_Model): The model to transform.
+
+    Yields:
+        EER_Entity or EER_Relationship: Each entity and relationship of the
+            EER model, in the order they are added by `transform_to_eer()`.
+    """
+    for arm_entity in hierarchy.schedule(arm_model.get_arm_entities()):
+        new_ent, relationships = arm.transform_entity_to_eer(arm_entity)
+        yield from relationships
+        if new_ent is None:
+            continue
+        parent = arm_entity.get_parent()
+        if parent is not None:
+            new_ent.add_constraint(
+                arm.transform_inheritance_to_eer(arm_entity, arm_model.find_entity(parent)))
+        yield new_ent
+
+
+def dump_arm(eer_model, f):
+    """
+    Writes the ARM model of `eer_model` to the file object `f` in the format
+    of `ARM_Model.__str__()`, one relation at a time as it is produced.
+
+    Returns:
+        int: The number of relations written.
+    """
+    header = "ARM Model:"
+    f.write(header + "\n" + "-"*len(header) + "\n\n")
+    count = 0
+    for arm_entity in transform_to_arm(eer_model):
+        if count > 0:
+            f.write("\n")
+        f.write(str(arm_entity))
+        count += 1
+    return count
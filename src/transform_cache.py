@@ -0,0 +1,202 @@
+import collections
+import arm_constraints
+import eer
+import fingerprint as merkle
+import parse_cache
+import snapshot
+
+
+def fingerprint(model):
+    """
+    Returns a canonical content fingerprint of an EER_Model or ARM_Model -
+    its Merkle fingerprint (see fingerprint.py) as a hex string - so that
+    models with the same structure have the same fingerprint however they
+    were built, and in whatever order their entities are listed.
+    """
+    return merkle.hexdigest(model)
+
+
+def order_fingerprint(model):
+    """
+    Returns a hex digest of the order of the parts of a model that
+    `fingerprint()` ignores - its entities and relationships, their
+    attributes, their constraints and the names listed in each constraint.
+    The result of a transformation lists its parts in the order of the
+    input, so models that only differ in this order must not share a result.
+
+    A disjointness group shared by its members is listed once, when it is
+    first met, and each member's constraint only refers to it, so that the
+    digest takes time linear in the size of the model.
+    """
+    parts = []
+    groups = {}                   # id of a shared group -> its number
+    if isinstance(model, eer.EER_Model):
+        entities = model.get_eer_entities()
+        for relationship in model.get_eer_relationships():
+            parts.append("relationship")
+            parts.append(relationship.get_name())
+            parts.extend(attribute.get_name() for attribute in relationship.get_attributes())
+    else:
+        entities = model.get_arm_entities()
+    for entity in entities:
+        parts.append("entity")
+        parts.append(entity.get_name())
+        parts.extend(attribute.get_name() for attribute in entity.get_attributes())
+        for constraint in entity.get_constraints():
+            if type(constraint) is arm_constraints.Disjointness_Constraint and \
+                    constraint.get_owner() is not None:
+                group = constraint.get_group()
+                number = groups.get(id(group))
+                if number is None:
+                    number = groups[id(group)] = str(len(groups))
+                    parts.append("group")
+                    parts.extend(group.get_members())
+                parts.extend(["disjoint", constraint.get_owner(), number])
+            else:
+                # A constraint prints the names it lists in their order
+                parts.append(str(constraint))
+    return merkle.digest(*parts).hex()
+
+
+class Transform_Cache:
+    """
+    A memoising cache of the results of `EER_Model.transform_to_arm()` and
+    `ARM_Model.transform_to_eer()`, keyed by the fingerprint of the input model
+    and, if `ordered` is True, by its `order_fingerprint()`. Otherwise, as the
+    fingerprint does not depend on the order of the entities, a model listing
+    its entities in another order gets the structurally equal result of the
+    model first cached, in the order of that model.
+
+    Results are stored in the binary snapshot format (see snapshot.py) and
+    every hit returns a new model loaded from the snapshot, so a caller can
+    modify the model it is given without affecting the cache. Recently used
+    results are kept in memory, up to `max_entries` entries and `max_bytes`
+    bytes. If a `directory` is given, results are also stored on disk (see
+    Parse_Cache) up to `max_disk_bytes`, so that they survive the process.
+    The least recently used entries of each tier are evicted first.
+
+    Attributes
+    ----------
+    ordered : bool
+        Whether results are only shared between models listing their parts
+        in the same order.
+    max_entries : int
+        The maximum number of results kept in memory.
+    max_bytes : int
+        The maximum total size of the results kept in memory.
+    memory : OrderedDict of str to bytes
+        The snapshots of the results kept in memory, least recently used first.
+    memory_size : int
+        The total size of the snapshots kept in memory.
+    disk : Parse_Cache
+        The on-disk tier, or None.
+    memory_hits, disk_hits : int
+        The number of transformations answered from each tier.
+    misses : int
+        The number of transformations that had to be computed.
+    evictions : int
+        The number of results evicted from memory.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=64 * 2**20, directory=None,
+                 max_disk_bytes=256 * 2**20, ordered=True):
+        """
+        Args:
+            max_entries (int): Optional maximum number of results kept in memory.
+            max_bytes (int): Optional maximum total size of the results kept
+                             in memory. Defaults to 64 MiB.
+            directory (str): Optional directory for the on-disk tier.
+            max_disk_bytes (int): Optional maximum total size of the results
+                                  stored on disk. Defaults to 256 MiB.
+            ordered (bool): Optional - whether a result is returned in the
+                            order of the model it was asked for.
+        """
+        self.ordered = ordered
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory = collections.OrderedDict()
+        self.memory_size = 0
+        self.disk = None
+        if directory is not None:
+            self.disk = parse_cache.Parse_Cache(directory, max_disk_bytes)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def transform_to_arm(self, eer_model):
+        """Returns `eer_model.transform_to_arm()`, computing it only on a cache miss."""
+        return self.transform("arm", eer_model)
+
+    def transform_to_eer(self, arm_model):
+        """Returns `arm_model.transform_to_eer()`, computing it only on a cache miss."""
+        return self.transform("eer", arm_model)
+
+    def transform(self, kind, model):
+        """
+        Returns the result of transforming `model` to the given kind of
+        model ("arm" or "eer"), from the cache if possible.
+        """
+        key = "{}-{}".format(kind, fingerprint(model))
+        if self.ordered:
+            key += "-" + order_fingerprint(model)
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory_hits += 1
+            self.memory.move_to_end(key)
+            return snapshot.loads(data)
+
+        if self.disk is not None:
+            result = self.disk.read_entry(key)
+            if result is not None:
+                self.disk_hits += 1
+                self.disk.write_index()
+                self.remember(key, snapshot.dumps(result))
+                return result
+
+        self.misses += 1
+        if kind == "arm":
+            result = model.transform_to_arm()
+        elif kind == "eer":
+            result = model.transform_to_eer()
+        else:
+            raise ValueError("Unknown model kind: {}".format(kind))
+        self.remember(key, snapshot.dumps(result))
+        if self.disk is not None:
+            self.disk.write_entry(key, result)
+            self.disk.evict()
+            self.disk.write_index()
+        # The cached snapshot was taken before the caller could modify the result
+        return result
+
+    def remember(self, key, data):
+        """Keeps the snapshot `data` in memory, evicting the least recently used results."""
+        self.memory[key] = data
+        self.memory_size += len(data)
+        while self.memory and (len(self.memory) > self.max_entries
+                               or self.memory_size > self.max_bytes):
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """Removes every result from both tiers."""
+        self.memory.clear()
+        self.memory_size = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self):
+        """Returns the cache counters and current sizes as a dictionary."""
+        stats = {"memory_hits": self.memory_hits,
+                 "disk_hits": self.disk_hits,
+                 "misses": self.misses,
+                 "evictions": self.evictions,
+                 "entries": len(self.memory),
+                 "bytes": self.memory_size}
+        if self.disk is not None:
+            disk_stats = self.disk.get_stats()
+            stats["disk_evictions"] = disk_stats["evictions"]
+            stats["disk_entries"] = disk_stats["entries"]
+            stats["disk_bytes"] = disk_stats["bytes"]
+        return stats
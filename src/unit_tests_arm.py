@@ -1,7 +1,10 @@
+import os
 import arm_constraints
 import arm
 import unittest2
 
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
 
 class Tests(unittest2.TestCase):
 
@@ -73,6 +76,60 @@ class Tests(unittest2.TestCase):
         self.assertEqual(ent.get_constraints()[0].get_pk(), "self",
                          "Should be self")
 
+        # Test the typed constraint and attribute accessors
+        fk_constraint = arm_constraints.FK_Constraint("dept", "department", "Department")
+        ent.add_constraint(fk_constraint)
+        ent.add_constraint(arm_constraints.Pathfd_Constraint(["pnum"], "self"))
+        ent.add_constraint(arm_constraints.Inheritance_Constraint("Person"))
+        self.assertEqual(ent.get_constraints_of_type(arm_constraints.PK_Constraint),
+                         [pk_constraint], "Should be [pk_constraint]")
+        self.assertEqual(ent.get_constraints_of_type(arm_constraints.Cover_Constraint),
+                         [], "Should be []")
+        self.assertEqual(ent.get_fk_constraints(), [fk_constraint],
+                         "Should be [fk_constraint]")
+        self.assertEqual(ent.get_fk("department"), fk_constraint,
+                         "Should be fk_constraint")
+        self.assertEqual(ent.get_fk("pnum"), None, "Should be None")
+        self.assertEqual(ent.get_key_pathfd().get_attributes(), ["pnum"],
+                         "Should be [\"pnum\"]")
+        self.assertEqual(ent.get_parent(), "Person", "Should be Person")
+        self.assertEqual(ent.find_attribute("pnum"), attribute,
+                         "Should be the pnum attribute")
+        self.assertEqual(ent.find_attribute("name"), None, "Should be None")
+
+    def test_Duplicate_Constraints(self):
+        ent = arm.ARM_Entity("Payment")
+        ent.add_constraint(arm_constraints.PK_Constraint("self"))
+        ent.add_constraint(arm_constraints.PK_Constraint("self"))
+        ent.add_constraint(arm_constraints.FK_Constraint("loan", "loan", "Loan"))
+        ent.add_constraint(arm_constraints.FK_Constraint("loan", "loan", "Loan"))
+        group = arm_constraints.Disjointness_Group(["Payment", "Loan"])
+        ent.add_constraint(arm_constraints.Disjointness_Constraint(group, owner="Payment"))
+        ent.add_constraint(arm_constraints.Disjointness_Constraint(group, owner="Payment"))
+        self.assertEqual([str(c) for c in ent.get_constraints()],
+                         ["primary key (self)", "constraint loan foreign key (loan) references Loan",
+                          "disjoint with (Loan)"], "Should be equal")
+        self.assertEqual(len(ent.get_fk_constraints()), 1, "Should be 1")
+        # A constraint changed after it was added no longer hides an equal one
+        pathfd = arm_constraints.Pathfd_Constraint(["pnum"], "self")
+        ent.add_constraint(pathfd)
+        pathfd.set_attributes(["pnum", "loan"])
+        ent.add_constraint(arm_constraints.Pathfd_Constraint(["pnum"], "self"))
+        self.assertEqual(len(ent.get_constraints_of_type(arm_constraints.Pathfd_Constraint)), 2,
+                         "Should be 2")
+
+    def test_Weak_Entity_Identifier(self):
+        # A weak entity gets one identifier of all its partial identifier attributes
+        ent = arm.ARM_Entity("Payment")
+        for name in ["self", "loan", "pnum", "paytime"]:
+            ent.add_attribute(arm.ARM_Attribute(name))
+        ent.add_constraint(arm_constraints.PK_Constraint("self"))
+        ent.add_constraint(arm_constraints.Pathfd_Constraint(["loan", "pnum", "paytime"], "self"))
+        ent.add_constraint(arm_constraints.FK_Constraint("loan", "loan", "Loan"))
+        eer_entity, _ = arm.transform_entity_to_eer(ent)
+        self.assertEqual(len(eer_entity.get_constraints()), 1, "Should be 1")
+        self.assertEqual(eer_entity.get_identifier(), ["pnum", "paytime"], "Should be equal")
+
     def test_ARM_Model(self):
         # Test add_arm_entity()
         arm_model = arm.ARM_Model()
@@ -81,6 +138,37 @@ class Tests(unittest2.TestCase):
         self.assertEqual(arm_model.get_arm_entities()[0].get_name(),
                          "Professor", "Should be Professor")
 
+        # Test find_entity()
+        self.assertEqual(arm_model.find_entity("Professor"), ent,
+                         "Should be the Professor entity")
+        self.assertEqual(arm_model.find_entity("Student"), None,
+                         "Should be None")
+
+        # Test that duplicate entity names are rejected
+        with self.assertRaises(AssertionError):
+            arm_model.add_arm_entity(arm.ARM_Entity("Professor"))
+
+    def test_load_arm_stream(self):
+        # Test that streaming load_arm() builds the same model as the tree
+        # parse, whether given a file name or an iterable of byte chunks
+        for example in ["ARM_WeakPaymentLoan", "ARM_PartSupplier",
+                        "ARM_ProfDept", "ARM_Inheritance"]:
+            filename = os.path.join(BASE_DIR, "ARM_XML_Examples", example + ".xml")
+            tree_model = arm.ARM_Model()
+            tree_model.load_arm(filename)
+            stream_model = arm.ARM_Model()
+            stream_model.load_arm(filename, stream=True)
+            self.assertEqual(str(stream_model), str(tree_model),
+                             "Should be identical for " + example)
+
+            with open(filename, "rb") as f:
+                data = f.read()
+            chunks = (data[i:i + 64] for i in range(0, len(data), 64))
+            chunk_model = arm.ARM_Model()
+            chunk_model.load_arm(chunks, stream=True)
+            self.assertEqual(str(chunk_model), str(tree_model),
+                             "Should be identical for " + example)
+
 
 if __name__ == '__main__':
     unittest2.main()
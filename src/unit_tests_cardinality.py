@@ -0,0 +1,94 @@
+import os
+import cardinality
+import eer
+import fingerprint
+import resolution
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_parse(self):
+        card = cardinality.parse(("0", "n"))
+        self.assertEqual((card.min, card.max), (0, cardinality.UNBOUNDED), "Should be equal")
+        self.assertEqual(card.is_many(), True, "Should be True")
+        self.assertEqual(card.mult, ("0", "n"), "Should be equal")
+        self.assertEqual(str(card), "0..n", "Should be 0..n")
+        # An upper bound that is not given is the lower bound
+        card = cardinality.parse(("1", ""))
+        self.assertEqual((card.min, card.max), (1, 1), "Should be equal")
+        self.assertEqual(card.is_many(), False, "Should be False")
+        self.assertEqual(str(card), "1", "Should be 1")
+        self.assertEqual(card, cardinality.parse(("1",)), "Should be equal")
+        self.assertEqual(card.mult, ("1", ""), "Should keep the multiplicity as written")
+        self.assertEqual(str(cardinality.parse(("0", "1"))), "0..1", "Should be 0..1")
+        self.assertEqual(cardinality.parse(None), None, "Should be None")
+        # Many may be written "N" or "*", and whitespace around a bound is ignored
+        for mult in [("0", "N"), ("0", "*"), (" 0", "n ")]:
+            self.assertEqual(cardinality.parse(mult), cardinality.parse(("0", "n")),
+                             "Should be equal")
+        self.assertEqual(cardinality.parse((" 1", "")).max, 1, "Should be 1")
+        # Any other bound makes the cardinality invalid, for validation.py to report
+        card = cardinality.parse(("0", "many"))
+        self.assertEqual(card.is_valid(), False, "Should be False")
+        self.assertEqual(str(card), "0..many", "Should be 0..many")
+        self.assertEqual(resolution.get_kind(("0", "many"), ("1", "")), None, "Should be None")
+
+    def test_Shared(self):
+        # Each multiplicity is parsed once, and shared
+        self.assertEqual(cardinality.parse(("0", "n")) is cardinality.parse(("0", "n")), True,
+                         "Should be True")
+        # A Cardinality holds its multiplicity as a tuple, the key it is shared by
+        self.assertEqual(cardinality.parse(["0", "n"]).mult, ("0", "n"), "Should be a tuple")
+        self.assertEqual(cardinality.parse(["0", "n"]) is cardinality.parse(("0", "n")), True,
+                         "Should be True")
+        # and so does a relationship given a list, which can then be fingerprinted
+        relationship = eer.EER_Relationship("Works", "Professor", "Department",
+                                            ["0", "n"], ("1", ""))
+        self.assertEqual(relationship.get_mult1(), ("0", "n"), "Should be a tuple")
+        self.assertEqual(relationship.get_mult2(), ("1", ""), "Should be equal")
+        eer_model = eer.EER_Model()
+        eer_model.add_eer_relationship(relationship)
+        self.assertEqual(fingerprint.hexdigest(eer_model), fingerprint.hexdigest(eer_model),
+                         "Should be equal")
+
+    def test_Relationship_Kind(self):
+        relationship = eer.EER_Relationship("Works", "Professor", "Department")
+        self.assertEqual(relationship.get_kind(), None, "Should be None")
+        relationship.set_mult1(("1", "n"))
+        relationship.set_mult2(("0", "1"))
+        self.assertEqual(relationship.get_kind(), resolution.MANY_TO_ONE, "Should be many-to-one")
+        # The cached kind follows the multiplicities
+        relationship.set_mult2(("0", "n"))
+        self.assertEqual(relationship.get_kind(), resolution.MANY_TO_MANY,
+                         "Should be many-to-many")
+        self.assertEqual(relationship.get_mult2(), ("0", "n"), "Should be equal")
+        self.assertEqual(relationship.get_cardinality1().min, 1, "Should be 1")
+        self.assertEqual(resolution.get_kind(("1",), ("0", "n")), resolution.ONE_TO_MANY,
+                         "Should be one-to-many")
+        self.assertEqual(resolution.get_kind(("1", ""), ("1", "1")), resolution.ONE_TO_ONE,
+                         "Should be one-to-one")
+
+    def test_Relationships_By_Kind(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        eer_model.add_eer_relationship(eer.EER_Relationship("Stocks", "Part", "Supplier",
+                                                            ("0", "n"), ("1", "")))
+        eer_model.add_eer_relationship(eer.EER_Relationship("Untyped", "Part", "Supplier"))
+        buckets = eer_model.get_relationships_by_kind()
+        self.assertEqual([r.get_name() for r in buckets[resolution.MANY_TO_MANY]], ["Supplies"],
+                         "Should be equal")
+        self.assertEqual([r.get_name() for r in buckets[resolution.MANY_TO_ONE]], ["Stocks"],
+                         "Should be equal")
+        self.assertEqual([r.get_name() for r in buckets[None]], ["Untyped"], "Should be equal")
+        # Relationships still print their multiplicities as written
+        self.assertEqual("Part (0..n)" in str(buckets[resolution.MANY_TO_ONE][0]), True,
+                         "Should be True")
+        self.assertEqual("Supplier (1)" in str(buckets[resolution.MANY_TO_ONE][0]), True,
+                         "Should be True")
+
+
+if __name__ == '__main__':
+    unittest2.main()
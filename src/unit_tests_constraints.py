@@ -49,6 +49,18 @@ class Tests(unittest2.TestCase):
         self.assertEqual(constraint.get_disjoint_with()[1], "y", "should be x")
         self.assertEqual(len(constraint.get_disjoint_with()), 2, "should be 2")
 
+    #ARM - Disjointness Constraint sharing a group
+    def test_Shared_Disjointness_Constraint(self):
+        group = AC.Disjointness_Group(["x", "y", "z"])
+        x = AC.Disjointness_Constraint(group, owner="x")
+        y = AC.Disjointness_Constraint(group, owner="y")
+        self.assertEqual(x.get_disjoint_with(), ["y", "z"], "should be [y, z]")
+        self.assertEqual(y.get_disjoint_with(), ["x", "z"], "should be [x, z]")
+        self.assertEqual(str(y), "disjoint with (x, z)", "should be disjoint with (x, z)")
+        x.add_to_disjoint_with("w")
+        self.assertEqual(y.get_disjoint_with(), ["x", "z", "w"], "should be [x, z, w]")
+        self.assertEqual(x.get_group() is y.get_group(), True, "should be True")
+
     #ARM - Pathfd Constraint
     def test_Pathfd_Constraint(self):
         constraint = AC.Pathfd_Constraint(["x", "y"], "target")
@@ -57,5 +69,53 @@ class Tests(unittest2.TestCase):
         self.assertEqual(len(constraint.get_attributes()), 2, "should be 2")
         self.assertEqual(constraint.get_target(), "target", "should be target")
 
+    #Constraints are slotted to keep large models compact
+    def test_Constraints_Have_No_Dict(self):
+        constraints = [EC.Identifier_Constraint(["x"]),
+                       EC.Inheritance_Constraint("Parent", True, False),
+                       AC.PK_Constraint("pid"),
+                       AC.FK_Constraint("name", "fk", "references"),
+                       AC.Inheritance_Constraint("parent"),
+                       AC.Cover_Constraint(["x"]),
+                       AC.Disjointness_Constraint(["x"]),
+                       AC.Pathfd_Constraint(["x"], "target")]
+        for constraint in constraints:
+            self.assertEqual(hasattr(constraint, "__dict__"), False, "should be False")
+
+    #Constraints are compared and hashed by value
+    def test_Constraint_Values(self):
+        self.assertEqual(AC.FK_Constraint("d", "d", "Dept"), AC.FK_Constraint("d", "d", "Dept"),
+                         "should be equal")
+        self.assertNotEqual(AC.FK_Constraint("d", "d", "Dept"), AC.FK_Constraint("d", "d", "Unit"),
+                            "should not be equal")
+        self.assertNotEqual(AC.Inheritance_Constraint("P"), EC.Inheritance_Constraint("P", False, False),
+                            "should not be equal")
+        # The order of the names in a constraint does not matter
+        self.assertEqual(AC.Pathfd_Constraint(["x", "y"], "self"),
+                         AC.Pathfd_Constraint(["y", "x"], "self"), "should be equal")
+        self.assertEqual(EC.Identifier_Constraint(["a", "b"]), EC.Identifier_Constraint(["b", "a"]),
+                         "should be equal")
+        group = AC.Disjointness_Group(["x", "y", "z"])
+        self.assertEqual(AC.Disjointness_Constraint(group, owner="x"),
+                         AC.Disjointness_Constraint(["z", "y"]), "should be equal")
+        constraints = {AC.PK_Constraint("self"), AC.PK_Constraint("self"),
+                       AC.Cover_Constraint(["x", "y"]), AC.Cover_Constraint(["y", "x"])}
+        self.assertEqual(len(constraints), 2, "should be 2")
+
+    #Cover and disjointness members are ordered sets
+    def test_Unique_Members(self):
+        cover = AC.Cover_Constraint(["x", "y", "x"])
+        self.assertEqual(cover.get_covered_by(), ["x", "y"], "should be [x, y]")
+        cover.add_to_covered_by("y")
+        cover.add_to_covered_by("z")
+        self.assertEqual(cover.get_covered_by(), ["x", "y", "z"], "should be [x, y, z]")
+        disjoint = AC.Disjointness_Constraint(["x"])
+        disjoint.add_to_disjoint_with("x")
+        self.assertEqual(disjoint.get_disjoint_with(), ["x"], "should be [x]")
+        group = AC.Disjointness_Group([])
+        group.set_members(["a", "b", "a"])
+        group.add_member("b")
+        self.assertEqual(group.get_members(), ["a", "b"], "should be [a, b]")
+
 if __name__ == '__main__':
     unittest2.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import arm
+import arm_constraints
+import diff
+import eer
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def load_eer(self, name):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", name))
+        return eer_model
+
+    def test_No_Differences(self):
+        model_diff = diff.diff_models(self.load_eer("EER_PartSupplier.xml"),
+                                      self.load_eer("EER_PartSupplier.xml"))
+        self.assertEqual(model_diff.is_empty(), True, "Should be True")
+        self.assertEqual(model_diff.dumps(), '{"kind":"eer"}', "Should be equal")
+        self.assertEqual(str(model_diff), "No differences", "Should be equal")
+
+    def test_EER_Differences(self):
+        old = self.load_eer("EER_PartSupplier.xml")
+        new = self.load_eer("EER_PartSupplier.xml")
+        supplier = new.find_entity("Supplier")
+        supplier.add_attribute(eer.EER_Attribute("rating", optional=True))
+        supplier.set_weak(True)
+        new.get_eer_relationships()[0].set_mult1(("1", "1"))
+        new.add_eer_entity(eer.EER_Entity("Warehouse"))
+        old.add_eer_relationship(eer.EER_Relationship("Stocks", "Part", "Supplier",
+                                                      ("0", "n"), ("0", "n")))
+        model_diff = diff.diff_models(old, new)
+        self.assertEqual(model_diff.is_empty(), False, "Should be False")
+        self.assertEqual(model_diff.added_entities, ["Warehouse"], "Should be equal")
+        self.assertEqual(model_diff.removed_relationships, ["Stocks"], "Should be equal")
+        self.assertEqual([d.name for d in model_diff.changed_entities], ["Supplier"],
+                         "Should be equal")
+        supplier_diff = model_diff.changed_entities[0]
+        self.assertEqual(supplier_diff.added_attributes, ["rating (optional)"], "Should be equal")
+        self.assertEqual(supplier_diff.changed_fields, {"weak": ("False", "True")},
+                         "Should be equal")
+        self.assertEqual(model_diff.changed_relationships[0].changed_fields,
+                         {"mult1": ("0..n", "1..1")}, "Should be equal")
+
+        # The compact form holds the same differences
+        compact = json.loads(model_diff.dumps())
+        self.assertEqual(compact["entities"]["added"], ["Warehouse"], "Should be equal")
+        self.assertEqual(compact["entities"]["changed"]["Supplier"]["fields"]["weak"],
+                         ["False", "True"], "Should be equal")
+        self.assertEqual(compact["relationships"]["removed"], ["Stocks"], "Should be equal")
+
+    def test_ARM_Differences(self):
+        old = arm.ARM_Model()
+        new = arm.ARM_Model()
+        for arm_model, data_type, disjoint_with in [(old, "INT", ["B", "C"]),
+                                                   (new, "STRING", ["C", "B"])]:
+            arm_entity = arm.ARM_Entity("A")
+            arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
+            arm_entity.add_attribute(arm.ARM_Attribute("num", data_type))
+            arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(disjoint_with))
+            arm_model.add_arm_entity(arm_entity)
+        new.find_entity("A").add_constraint(arm_constraints.FK_Constraint("b", "b", "B"))
+        old.find_entity("A").add_constraint(arm_constraints.Pathfd_Constraint(["num"], "self"))
+        model_diff = diff.diff_models(old, new)
+        entity_diff = model_diff.changed_entities[0]
+        self.assertEqual(entity_diff.changed_attributes, [("num (INT)", "num (STRING)")],
+                         "Should be equal")
+        # Reordering the disjoint-with list is not a difference
+        self.assertEqual(entity_diff.added_constraints,
+                         ["constraint b foreign key (b) references B"], "Should be equal")
+        self.assertEqual(entity_diff.removed_constraints, ["pathfd (num) -> self"],
+                         "Should be equal")
+
+    def test_Duplicate_Names(self):
+        # Relationships with the same name are paired in order
+        old = eer.EER_Model()
+        new = eer.EER_Model()
+        old.add_eer_relationship(eer.EER_Relationship("R", "A", "B", ("0", "n"), ("1", "")))
+        new.add_eer_relationship(eer.EER_Relationship("R", "A", "B", ("0", "n"), ("1", "")))
+        new.add_eer_relationship(eer.EER_Relationship("R", "A", "C", ("0", "n"), ("1", "")))
+        model_diff = diff.diff_models(old, new)
+        self.assertEqual(model_diff.added_relationships, ["R"], "Should be equal")
+        self.assertEqual(model_diff.changed_relationships, [], "Should be empty")
+
+    def test_Transformed_Models(self):
+        old = self.load_eer("EER_PartSupplier.xml")
+        new = self.load_eer("EER_PartSupplier.xml")
+        new.add_eer_entity(eer.EER_Entity("Warehouse"))
+        model_diff = diff.diff_models(old.transform_to_arm(), new.transform_to_arm())
+        self.assertEqual(model_diff.kind, "arm", "Should be arm")
+        self.assertEqual(model_diff.added_entities, ["Warehouse"], "Should be equal")
+        # The other relations outside a hierarchy are now also disjoint with Warehouse
+        self.assertEqual(len(model_diff.changed_entities) > 0, True, "Should be True")
+
+    def test_Different_Kinds(self):
+        with self.assertRaises(AssertionError):
+            diff.diff_models(eer.EER_Model(), arm.ARM_Model())
+
+
+if __name__ == '__main__':
+    unittest2.main()
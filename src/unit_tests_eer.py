@@ -1,9 +1,15 @@
+import os
 import eer
 import eer_constraints
+import incremental
+import streaming
 import arm
+import arm_constraints
 
 import unittest2
 
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
 
 class Tests(unittest2.TestCase):
 
@@ -42,6 +48,11 @@ class Tests(unittest2.TestCase):
         inheritance_constraint = entity.get_inheritance_constraint()
         self.assertEqual(inheritance_constraint.is_disjoint(), True, "Should be True")
         self.assertEqual(inheritance_constraint.is_covering(), False, "Should be False")
+        # Test get_constraints_of_type() and find_attribute()
+        self.assertEqual(entity.get_constraints_of_type(eer_constraints.Inheritance_Constraint),
+                         [constraint], "Should be [constraint]")
+        self.assertEqual(entity.find_attribute("pid"), attribute2, "Should be pid attribute")
+        self.assertEqual(entity.find_attribute("age"), None, "Should be None")
 
     def test_EER_Relationship(self):
         relationship = eer.EER_Relationship("WORK",
@@ -73,6 +84,50 @@ class Tests(unittest2.TestCase):
                                             True)
         EER.add_eer_relationship(relationship)
         self.assertEqual(EER.get_eer_relationships()[0].get_name(), "WORK", "Should be WORK")
+        # Test find_entity()
+        self.assertEqual(EER.find_entity("Professor"), entity, "Should be the Professor entity")
+        self.assertEqual(EER.find_entity("Department"), None, "Should be None")
+        # Test that duplicate entity names are rejected
+        with self.assertRaises(AssertionError):
+            EER.add_eer_entity(eer.EER_Entity("Professor"))
+
+    def test_Mixed_Disjoint_Subclasses(self):
+        # Only the subclasses declared disjoint are disjoint with one another
+        eer_model = eer.EER_Model()
+        person = eer.EER_Entity("Person")
+        person.add_attribute(eer.EER_Attribute("pid"))
+        person.add_constraint(eer_constraints.Identifier_Constraint(["pid"]))
+        eer_model.add_eer_entity(person)
+        for name, disjoint in [("Staff", False), ("Student", True),
+                               ("Alumnus", False), ("Visitor", True)]:
+            subclass = eer.EER_Entity(name)
+            subclass.add_constraint(eer_constraints.Inheritance_Constraint("Person", disjoint, False))
+            eer_model.add_eer_entity(subclass)
+        arm_model = eer_model.transform_to_arm()
+        disjoint_with = {}
+        for arm_entity in arm_model.get_arm_entities():
+            constraints = arm_entity.get_constraints_of_type(arm_constraints.Disjointness_Constraint)
+            disjoint_with[arm_entity.get_name()] = [c.get_disjoint_with() for c in constraints]
+        self.assertEqual(disjoint_with, {"Person": [], "Staff": [], "Student": [["Visitor"]],
+                                         "Alumnus": [], "Visitor": [["Student"]]},
+                         "Should be equal")
+        # The streaming and incremental transformations agree
+        self.assertEqual([str(r) for r in streaming.transform_to_arm(eer_model)],
+                         [str(r) for r in arm_model.get_arm_entities()], "Should be equal")
+        self.assertEqual(str(incremental.Incremental_EER_To_ARM(eer_model).get_arm_model()),
+                         str(arm_model), "Should be equal")
+
+    def test_load_eer_stream(self):
+        # Test that streaming load_eer() builds the same model as the tree parse
+        for example in ["EER_WeakPaymentLoan", "EER_PartSupplier",
+                        "EER_ProfDept", "EER_Inheritance"]:
+            filename = os.path.join(BASE_DIR, "EER_XML_Examples", example + ".xml")
+            tree_model = eer.EER_Model()
+            tree_model.load_eer(filename)
+            stream_model = eer.EER_Model()
+            stream_model.load_eer(filename, stream=True)
+            self.assertEqual(str(stream_model), str(tree_model),
+                             "Should be identical for " + example)
 
 if __name__ == '__main__':
     unittest2.main()
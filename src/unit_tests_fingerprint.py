@@ -0,0 +1,128 @@
+import os
+import arm
+import arm_constraints
+import eer
+import eer_constraints
+import fingerprint
+import model_generator
+import partition
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def load_eer(self, name):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", name))
+        return eer_model
+
+    def make_arm_model(self, names, disjoint_with, covered_by):
+        arm_model = arm.ARM_Model()
+        for name in names:
+            arm_entity = arm.ARM_Entity(name)
+            arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
+            arm_entity.add_attribute(arm.ARM_Attribute("num", "INT"))
+            arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+            arm_entity.add_constraint(arm_constraints.Disjointness_Constraint(
+                [other for other in disjoint_with if other != name]))
+            arm_entity.add_constraint(arm_constraints.Cover_Constraint(list(covered_by)))
+            arm_model.add_arm_entity(arm_entity)
+        return arm_model
+
+    def test_Equal_Models(self):
+        first = self.load_eer("EER_PartSupplier.xml")
+        second = self.load_eer("EER_PartSupplier.xml")
+        self.assertEqual(fingerprint.fingerprint(first), fingerprint.fingerprint(second),
+                         "Should be equal")
+        self.assertEqual(len(fingerprint.fingerprint(first)), 32, "Should be 32")
+        self.assertEqual(fingerprint.equal(first, self.load_eer("EER_ProfDept.xml")), False,
+                         "Should be False")
+        self.assertEqual(fingerprint.equal(first.transform_to_arm(), second.transform_to_arm()),
+                         True, "Should be True")
+        # Different kinds of object are never equal
+        self.assertEqual(fingerprint.equal(first, first.transform_to_arm()), False,
+                         "Should be False")
+
+    def test_Order_Insensitive(self):
+        first = self.make_arm_model(["A", "B", "C"], ["A", "B", "C"], ["B", "C"])
+        second = self.make_arm_model(["C", "A", "B"], ["C", "B", "A"], ["C", "B"])
+        self.assertEqual(str(first) == str(second), False, "Should be False")
+        self.assertEqual(fingerprint.equal(first, second), True, "Should be True")
+        # A shared group hashes like the lists it stands for
+        shared = arm.ARM_Model()
+        group = arm_constraints.Disjointness_Group(["B", "A", "C"])
+        for arm_entity in first.get_arm_entities():
+            copy = arm.ARM_Entity(arm_entity.get_name())
+            for attribute in arm_entity.get_attributes():
+                copy.add_attribute(attribute)
+            copy.add_constraint(arm_constraints.PK_Constraint("self"))
+            copy.add_constraint(arm_constraints.Disjointness_Constraint(
+                group, owner=arm_entity.get_name()))
+            copy.add_constraint(arm_constraints.Cover_Constraint(["B", "C"]))
+            shared.add_arm_entity(copy)
+        self.assertEqual(fingerprint.equal(first, shared), True, "Should be True")
+        # The ends of a relationship keep their order
+        relationship = eer.EER_Relationship("R", "A", "B", ("0", "n"), ("1", "1"))
+        swapped = eer.EER_Relationship("R", "B", "A", ("0", "n"), ("1", "1"))
+        self.assertEqual(fingerprint.equal(relationship, swapped), False, "Should be False")
+
+    def test_Invalidated_On_Mutation(self):
+        arm_model = self.make_arm_model(["A", "B", "C"], ["A", "B", "C"], ["B"])
+        before = fingerprint.fingerprint(arm_model)
+        arm_model.find_entity("A").get_constraint_of_type(
+            arm_constraints.Cover_Constraint).add_to_covered_by("C")
+        after_cover = fingerprint.fingerprint(arm_model)
+        self.assertEqual(before == after_cover, False, "Should be False")
+        self.assertEqual(fingerprint.fingerprint(arm_model), after_cover, "Should be equal")
+
+        arm_model.find_entity("B").add_attribute(arm.ARM_Attribute("extra", "INT"))
+        self.assertEqual(fingerprint.fingerprint(arm_model) == after_cover, False,
+                         "Should be False")
+
+        # Modifying a shared group changes every member's constraint
+        group = arm_constraints.Disjointness_Group(["A", "B"])
+        constraint = arm_constraints.Disjointness_Constraint(group, owner="A")
+        other = arm_constraints.Disjointness_Constraint(group, owner="B")
+        before_a = fingerprint.fingerprint(constraint)
+        before_b = fingerprint.fingerprint(other)
+        other.add_to_disjoint_with("C")
+        self.assertEqual(fingerprint.fingerprint(constraint) == before_a, False, "Should be False")
+        self.assertEqual(fingerprint.fingerprint(other) == before_b, False, "Should be False")
+        self.assertEqual(fingerprint.fingerprint(constraint), fingerprint.fingerprint(
+            arm_constraints.Disjointness_Constraint(["C", "B"])), "Should be equal")
+
+        eer_model = self.load_eer("EER_PartSupplier.xml")
+        before = fingerprint.fingerprint(eer_model)
+        relationship = eer_model.get_eer_relationships()[0]
+        mult1 = relationship.get_mult1()
+        relationship.set_mult1(("7", "7"))
+        self.assertEqual(fingerprint.fingerprint(eer_model) == before, False, "Should be False")
+        relationship.set_mult1(mult1)
+        self.assertEqual(fingerprint.fingerprint(eer_model), before, "Should be equal")
+        eer_model.get_eer_entities()[0].add_constraint(
+            eer_constraints.Identifier_Constraint(["extra"]))
+        self.assertEqual(fingerprint.fingerprint(eer_model) == before, False, "Should be False")
+
+    def test_Transformations_Equal(self):
+        for lines in [model_generator.eer_xml_lines(300),
+                      model_generator.eer_relationship_xml_lines(200, 30)]:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(model_generator.xml_file_object(lines))
+            arm_model = eer_model.transform_to_arm()
+            self.assertEqual(fingerprint.equal(partition.transform_to_arm(eer_model), arm_model),
+                             True, "Should be True")
+            self.assertEqual(fingerprint.equal(eer_model.transform_to_lazy_arm().to_arm_model(),
+                                               arm_model), True, "Should be True")
+            fingerprints = fingerprint.get_entity_fingerprints(arm_model)
+            self.assertEqual(len(fingerprints), len(arm_model.get_arm_entities()),
+                             "Should be one per relation")
+
+    def test_Unknown_Object(self):
+        with self.assertRaises(AssertionError):
+            fingerprint.fingerprint("Person")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,94 @@
+import os
+import arm
+import eer
+import graph
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_EER_And_ARM_Graphs(self):
+        # An EER model and its transformation have the same graph
+        for example in ["EER_WeakPaymentLoan", "EER_PartSupplier",
+                        "EER_ProfDept", "EER_Inheritance"]:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", example + ".xml"))
+            eer_graph = graph.build_graph(eer_model)
+            arm_graph = graph.build_graph(eer_model.transform_to_arm())
+            self.assertEqual(eer_graph.parents, arm_graph.parents, "Should be equal")
+            self.assertEqual(eer_graph.references, arm_graph.references, "Should be equal")
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        part_supplier = graph.build_graph(eer_model)
+        # A many-to-many relationship is a node of its own
+        self.assertEqual(part_supplier.get_references("Supplies"), ["Supplier", "Part"],
+                         "Should be equal")
+        self.assertEqual(part_supplier.get_referenced_by("Part"), ["Supplies"], "Should be equal")
+
+    def test_Hierarchy(self):
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(os.path.join(BASE_DIR, "ARM_XML_Examples", "ARM_Inheritance.xml"))
+        arm_graph = graph.build_graph(arm_model)
+        arm_graph.add_parent("PhD", "Postgrad")
+        self.assertEqual(arm_graph.get_ancestors("PhD"), ["Postgrad", "Student"], "Should be equal")
+        self.assertEqual(arm_graph.get_descendants("Student"), ["Undergrad", "Postgrad", "PhD"],
+                         "Should be equal")
+        self.assertEqual(arm_graph.get_descendants("Undergrad"), [], "Should be empty")
+        self.assertEqual(arm_graph.is_ancestor("Student", "PhD"), True, "Should be True")
+        self.assertEqual(arm_graph.is_ancestor("Undergrad", "PhD"), False, "Should be False")
+        self.assertEqual(arm_graph.is_ancestor("PhD", "PhD"), False, "Should be False")
+        self.assertEqual(arm_graph.get_depth("PhD"), 2, "Should be 2")
+        self.assertEqual(arm_graph.get_depth("Missing"), None, "Should be None")
+        self.assertEqual(arm_graph.get_longest_chain(), ["Student", "Postgrad", "PhD"],
+                         "Should be equal")
+        # Changing the graph clears the cached analyses
+        arm_graph.add_parent("PhD", "Undergrad")
+        self.assertEqual(arm_graph.get_ancestors("PhD"), ["Undergrad", "Student"],
+                         "Should be equal")
+        self.assertEqual(arm_graph.get_descendants("Postgrad"), [], "Should be empty")
+
+    def test_Hierarchy_Cycle(self):
+        model_graph = graph.Model_Graph()
+        model_graph.add_parent("A", "B")
+        model_graph.add_parent("B", "C")
+        model_graph.add_parent("C", "B")
+        with self.assertRaises(AssertionError):
+            model_graph.get_depth("A")
+
+    def test_Components(self):
+        model_graph = graph.Model_Graph()
+        for source, target in [("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"),
+                               ("E", "E"), ("F", "D")]:
+            model_graph.add_reference(source, target)
+        self.assertEqual(model_graph.get_components(),
+                         [["D"], ["A", "B", "C"], ["E"], ["F"]], "Should be equal")
+        self.assertEqual(model_graph.get_component("B"), ["A", "B", "C"], "Should be equal")
+        self.assertEqual(model_graph.get_reference_cycles(), [["A", "B", "C"], ["E"]],
+                         "Should be equal")
+        self.assertEqual(model_graph.in_reference_cycle("E"), True, "Should be True")
+        self.assertEqual(model_graph.in_reference_cycle("F"), False, "Should be False")
+        self.assertEqual(model_graph.get_referenced_by("D"), ["C", "F"], "Should be equal")
+        # Adding a reference twice does not add a second edge
+        model_graph.add_reference("F", "D")
+        self.assertEqual(model_graph.get_references("F"), ["D"], "Should be equal")
+
+    def test_Deep_Graph(self):
+        # The analyses are iterative, so deep graphs do not hit the recursion limit
+        model_graph = graph.Model_Graph()
+        for i in range(1, 5000):
+            model_graph.add_parent("N{}".format(i), "N{}".format(i - 1))
+            model_graph.add_reference("N{}".format(i - 1), "N{}".format(i))
+        self.assertEqual(model_graph.get_depth("N4999"), 4999, "Should be 4999")
+        self.assertEqual(len(model_graph.get_longest_chain()), 5000, "Should be 5000")
+        self.assertEqual(len(model_graph.get_components()), 5000, "Should be 5000")
+        self.assertEqual(model_graph.get_components()[0], ["N4999"], "Should be equal")
+
+    def test_Invalid_Model(self):
+        with self.assertRaises(AssertionError):
+            graph.build_graph(None)
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,110 @@
+import io
+import os
+import xml.etree.ElementTree as ET
+import arm
+import arm_constraints as AC
+import eer
+import eer_constraints as EC
+import hierarchy
+import model_generator
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_Hierarchy_Index(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_Inheritance.xml"))
+        index = hierarchy.Hierarchy_Index(eer_model.get_eer_entities())
+        self.assertEqual(index.get_children("Student"), ["Undergrad", "Postgrad"],
+                         "Should be [Undergrad, Postgrad]")
+        self.assertEqual(index.get_parent("Postgrad"), "Student", "Should be Student")
+        self.assertEqual(index.get_parent("Student"), None, "Should be None")
+        self.assertEqual(index.get_children("Undergrad"), [], "Should be []")
+        self.assertEqual(index.get_covering_children("Student"), ["Undergrad", "Postgrad"],
+                         "Should be [Undergrad, Postgrad]")
+        self.assertEqual(index.is_disjoint("Undergrad"), True, "Should be True")
+        self.assertEqual(index.get_parents(), ["Student"], "Should be [Student]")
+
+    def test_Wide_Hierarchy(self):
+        lines = ['<eer>\n',
+                 '<entity name="P" type="Entity" weak="False">\n',
+                 '<attribute type="attr" multi_valued="False" derived="False" '
+                 'optional="False">id</attribute>\n',
+                 '<constraint type="identifier">id</constraint>\n',
+                 '</entity>\n']
+        for i in range(1000):
+            lines.append('<entity name="C{}" type="Entity" weak="False">\n'.format(i))
+            lines.append('<constraint type="inheritance" covering="True" '
+                         'disjoint="True">P</constraint>\n')
+            lines.append('</entity>\n')
+        lines.append('</eer>\n')
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(lines))
+        arm_model = eer_model.transform_to_arm()
+
+        cover = arm_model.find_entity("P").get_constraints_of_type(AC.Cover_Constraint)
+        self.assertEqual(len(cover), 1, "Should be 1")
+        self.assertEqual(len(cover[0].get_covered_by()), 1000, "Should be 1000")
+        first = arm_model.find_entity("C0").get_constraint_of_type(AC.Disjointness_Constraint)
+        last = arm_model.find_entity("C999").get_constraint_of_type(AC.Disjointness_Constraint)
+        self.assertEqual(first.get_group() is last.get_group(), True, "Should be shared")
+        self.assertEqual(len(first.get_disjoint_with()), 999, "Should be 999")
+        self.assertEqual("C0" in last.get_disjoint_with(), True, "Should be True")
+        self.assertEqual("C0" in first.get_disjoint_with(), False, "Should be False")
+
+    def test_schedule(self):
+        # A multi-level hierarchy listed subclasses first
+        entities = [eer.EER_Entity("C"), eer.EER_Entity("B"), eer.EER_Entity("A"),
+                    eer.EER_Entity("D")]
+        entities[0].add_constraint(EC.Inheritance_Constraint("B", False, False))
+        entities[1].add_constraint(EC.Inheritance_Constraint("A", False, False))
+        order = [entity.get_name() for entity in hierarchy.schedule(entities)]
+        self.assertEqual(order, ["A", "B", "C", "D"], "Should be [A, B, C, D]")
+        # Parent-first entities keep their order
+        order = [entity.get_name() for entity in hierarchy.schedule(entities[::-1])]
+        self.assertEqual(order, ["D", "A", "B", "C"], "Should be [D, A, B, C]")
+        # A cycle is detected
+        entities[2].add_constraint(EC.Inheritance_Constraint("C", False, False))
+        with self.assertRaises(AssertionError):
+            hierarchy.schedule(entities)
+        # find_cycles() reports the cycle instead, and nothing else
+        self.assertEqual(hierarchy.find_cycles(entities), [["C", "B", "A"]],
+                         "Should be [[C, B, A]]")
+        self.assertEqual(hierarchy.find_cycles(entities[3:]), [], "Should be empty")
+
+    def test_schedule_Duplicate_Names(self):
+        # Entities sharing a name, as a loaded model may have, are all scheduled
+        entities = [eer.EER_Entity("B"), eer.EER_Entity("A"), eer.EER_Entity("B"),
+                    eer.EER_Entity("A")]
+        for entity in entities[::2]:
+            entity.add_constraint(EC.Inheritance_Constraint("A", False, False))
+        order = hierarchy.schedule(entities)
+        self.assertEqual(len(order), 4, "Should be 4")
+        self.assertEqual([id(entity) for entity in order],
+                         [id(entities[i]) for i in [1, 0, 2, 3]], "Should be equal")
+
+    def test_Unordered_Files(self):
+        # Moving the parent after its subclasses does not change the result
+        for path, model_class, load, transform in [
+                (os.path.join(BASE_DIR, "EER_XML_Examples", "EER_Inheritance.xml"),
+                 eer.EER_Model, "load_eer", "transform_to_arm"),
+                (os.path.join(BASE_DIR, "ARM_XML_Examples", "ARM_Inheritance.xml"),
+                 arm.ARM_Model, "load_arm", "transform_to_eer")]:
+            root = ET.parse(path).getroot()
+            blocks = list(root)
+            for block in blocks:
+                root.remove(block)
+            root.extend(blocks[1:] + blocks[:1])
+            ordered = model_class()
+            getattr(ordered, load)(path)
+            unordered = model_class()
+            getattr(unordered, load)(io.StringIO(ET.tostring(root, encoding="unicode")))
+            self.assertEqual(str(getattr(unordered, transform)()),
+                             str(getattr(ordered, transform)()), "Should be equal")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,164 @@
+import random
+import arm
+import arm_constraints as AC
+import eer
+import eer_constraints as EC
+import incremental
+import model_generator
+import unittest2
+
+
+def edited_eer_entity(eer_entity, rng):
+    """Returns a copy of an EER entity with a random change."""
+    weak = eer_entity.is_weak()
+    inheritance = eer_entity.get_inheritance_constraint()
+    change = rng.randrange(3)
+    if change == 0 and inheritance is None:
+        weak = not weak
+    new_entity = eer.EER_Entity(eer_entity.get_name(), weak)
+    for attribute in eer_entity.get_attributes():
+        new_entity.add_attribute(attribute)
+    if change == 1:
+        new_entity.add_attribute(eer.EER_Attribute("extra{}".format(rng.randrange(100))))
+    for constraint in eer_entity.get_constraints():
+        if change == 2 and constraint is inheritance:
+            constraint = EC.Inheritance_Constraint(inheritance.get_parent(),
+                                                   rng.random() < 0.5, rng.random() < 0.5)
+        new_entity.add_constraint(constraint)
+    return new_entity
+
+
+def random_eer_edit(model, rng, count):
+    """Applies a random edit to an Incremental_EER_To_ARM."""
+    names = list(model.eer_entities)
+    edit = rng.randrange(5)
+    if edit == 0:
+        name = rng.choice(names)
+        model.replace_eer_entity(edited_eer_entity(model.eer_entities[name], rng))
+    elif edit == 1 and model.eer_relationships:
+        model.remove_eer_relationship(rng.choice(list(model.eer_relationships.values())))
+    elif edit == 2:
+        mult = [("0", "n"), ("1", "")]
+        relationship = eer.EER_Relationship("New{}".format(count), rng.choice(names),
+                                            rng.choice(names), rng.choice(mult),
+                                            rng.choice(mult), rng.random() < 0.3)
+        relationship.add_attribute(eer.EER_Attribute("since"))
+        model.add_eer_relationship(relationship)
+    elif edit == 3:
+        new_entity = eer.EER_Entity("N{}".format(count))
+        new_entity.add_attribute(eer.EER_Attribute("id"))
+        parent = model.eer_entities[rng.choice(names)]
+        if rng.random() < 0.5 and parent.get_parent() is None:
+            new_entity.add_constraint(EC.Inheritance_Constraint(parent.get_name(), True, True))
+        else:
+            new_entity.add_constraint(EC.Identifier_Constraint(["id"]))
+        model.add_eer_entity(new_entity)
+    else:
+        # Remove an entity that is not a parent, with its relationships
+        name = rng.choice(names)
+        if any(ent.get_parent() == name for ent in model.eer_entities.values()):
+            return
+        for relationship in list(model.relationships_of.get(name, {}).values()):
+            model.remove_eer_relationship(relationship)
+        model.remove_eer_entity(name)
+
+
+def edited_arm_entity(arm_entity, rng):
+    """Returns a copy of a relation with a random change."""
+    new_entity = arm.ARM_Entity(arm_entity.get_name())
+    for attribute in arm_entity.get_attributes():
+        new_entity.add_attribute(attribute)
+    change = rng.randrange(2)
+    if change == 0:
+        new_entity.add_attribute(arm.ARM_Attribute("extra{}".format(rng.randrange(100))))
+    for constraint in arm_entity.get_constraints():
+        if change == 1 and type(constraint) == AC.Cover_Constraint:
+            continue
+        new_entity.add_constraint(constraint)
+    return new_entity
+
+
+def random_arm_edit(model, rng, count):
+    """Applies a random edit to an Incremental_ARM_To_EER."""
+    names = list(model.arm_entities)
+    edit = rng.randrange(3)
+    if edit == 0:
+        name = rng.choice(names)
+        model.replace_arm_entity(edited_arm_entity(model.arm_entities[name], rng))
+    elif edit == 1:
+        new_entity = arm.ARM_Entity("N{}".format(count))
+        new_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
+        new_entity.add_attribute(arm.ARM_Attribute("id"))
+        new_entity.add_attribute(arm.ARM_Attribute("ref", "OID"))
+        new_entity.add_constraint(AC.PK_Constraint("self"))
+        new_entity.add_constraint(AC.Pathfd_Constraint(["id"], "self"))
+        new_entity.add_constraint(AC.FK_Constraint("ref", "ref", rng.choice(names)))
+        model.add_arm_entity(new_entity)
+    else:
+        # Remove a relation that is not a parent
+        name = rng.choice(names)
+        if not model.children.get(name):
+            model.remove_arm_entity(name)
+
+
+class Tests(unittest2.TestCase):
+
+    def test_EER_To_ARM(self):
+        rng = random.Random(3003)
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(60)))
+        model = incremental.Incremental_EER_To_ARM(eer_model)
+        self.assertEqual(str(model.get_arm_model()), str(eer_model.transform_to_arm()),
+                         "Should be equal")
+        for count in range(300):
+            random_eer_edit(model, rng, count)
+            if count % 3 == 0:
+                self.assertEqual(str(model.get_arm_model()),
+                                 str(model.to_eer_model().transform_to_arm()),
+                                 "Should be equal after edit {}".format(count))
+
+    def test_Recomputes_Affected_Relations(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(1000)))
+        model = incremental.Incremental_EER_To_ARM(eer_model)
+        model.get_arm_model()
+        # E1 is a subclass of E0 - its parent's cover constraint lists it
+        model.replace_eer_entity(edited_eer_entity(model.eer_entities["E1"], random.Random(1)))
+        model.get_arm_model()
+        self.assertEqual(model.recomputed, 2, "Should be 2")
+        self.assertEqual(model.get_sources("E0")[0], {"E0", "E1", "E2"},
+                         "Should be {E0, E1, E2}")
+        # E5 is weak and belongs to E4
+        sources, relationships = model.get_sources("E5")
+        self.assertEqual(sources, {"E4", "E5"}, "Should be {E4, E5}")
+        self.assertEqual(len(relationships), 1, "Should be 1")
+
+    def test_ARM_To_EER(self):
+        rng = random.Random(3003)
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(model_generator.xml_file_object(model_generator.arm_xml_lines(60)))
+        model = incremental.Incremental_ARM_To_EER(arm_model)
+        self.assertEqual(str(model.get_eer_model()), str(arm_model.transform_to_eer()),
+                         "Should be equal")
+        for count in range(300):
+            random_arm_edit(model, rng, count)
+            if count % 3 == 0:
+                self.assertEqual(str(model.get_eer_model()),
+                                 str(model.to_arm_model().transform_to_eer()),
+                                 "Should be equal after edit {}".format(count))
+        # Removing the cover constraint of a parent recomputes its subclasses
+        model = incremental.Incremental_ARM_To_EER(arm_model)
+        model.get_eer_model()
+        parent = arm.ARM_Entity("A0")
+        for attribute in arm_model.find_entity("A0").get_attributes():
+            parent.add_attribute(attribute)
+        for constraint in arm_model.find_entity("A0").get_constraints():
+            if type(constraint) != AC.Cover_Constraint:
+                parent.add_constraint(constraint)
+        model.replace_arm_entity(parent)
+        self.assertEqual(str(model.get_eer_model()),
+                         str(model.to_arm_model().transform_to_eer()), "Should be equal")
+        self.assertEqual(model.recomputed, 3, "Should be 3")
+
+if __name__ == '__main__':
+    unittest2.main()
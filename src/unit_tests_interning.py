@@ -0,0 +1,56 @@
+import os
+import eer
+import interning
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_Interner(self):
+        interner = interning.Interner()
+        # Build the strings at runtime so that they are distinct objects
+        first = "".join(["Depart", "ment"])
+        second = "".join(["Depart", "ment"])
+        self.assertEqual(interner.string(first) is first, True, "Should be first")
+        self.assertEqual(interner.string(second) is first, True, "Should be first")
+        self.assertEqual(interner.lower(second), "department", "Should be department")
+        self.assertEqual(interner.string(None), None, "Should be None")
+
+        attribute = interner.arm_attribute("self", "OID")
+        self.assertEqual(interner.arm_attribute("self", "OID") is attribute, True,
+                         "Should be shared")
+        self.assertEqual(interner.arm_attribute("self", "INT") is attribute, False,
+                         "Should not be shared")
+        attribute = interner.eer_attribute("name")
+        self.assertEqual(interner.eer_attribute("name") is attribute, True,
+                         "Should be shared")
+        self.assertEqual(interner.eer_attribute("name", optional=True) is attribute, False,
+                         "Should not be shared")
+
+        stats = interner.get_stats()
+        self.assertEqual(stats["strings_deduplicated"], 1, "Should be 1")
+        self.assertEqual(stats["attribute_lookups"], 6, "Should be 6")
+        self.assertEqual(stats["attributes_deduplicated"], 2, "Should be 2")
+
+    def test_Interner_Bounded(self):
+        interner = interning.Interner(max_entries=2)
+        for name in ["a", "b", "c"]:
+            interner.arm_attribute(name)
+        self.assertEqual(interner.get_stats()["attributes"], 1, "Should be 1")
+
+    def test_Shared_By_Transform(self):
+        interning.reset()
+        model = eer.EER_Model()
+        model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_ProfDept.xml"))
+        arm_model = model.transform_to_arm()
+        self_attributes = [entity.get_attributes()[0] for entity in arm_model.get_arm_entities()]
+        for attribute in self_attributes:
+            self.assertEqual(attribute is self_attributes[0], True, "Should be shared")
+        self.assertEqual(interning.get_stats()["attributes_deduplicated"] > 0, True,
+                         "Should be True")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,43 @@
+import os
+import eer
+import model_generator
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_find_entity(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        arm_model = eer_model.transform_to_arm()
+        lazy_model = eer_model.transform_to_lazy_arm()
+        self.assertEqual(lazy_model.get_materialised_count(), 0, "Should be 0")
+        self.assertEqual(len(lazy_model), len(arm_model), "Should be the same length")
+        self.assertEqual(str(lazy_model.find_entity("Supplier")),
+                         str(arm_model.find_entity("Supplier")), "Should be equal")
+        self.assertEqual(lazy_model.get_materialised_count(), 1, "Should be 1")
+        # Relations are memoised
+        self.assertEqual(lazy_model.find_entity("Supplier") is lazy_model.find_entity("Supplier"),
+                         True, "Should be True")
+        self.assertEqual(lazy_model.get_materialised_count(), 1, "Should be 1")
+        self.assertEqual(lazy_model.find_entity("Missing"), None, "Should be None")
+
+    def test_Identical_To_Eager(self):
+        for lines in [model_generator.eer_xml_lines(300),
+                      model_generator.eer_relationship_xml_lines(200, 30)]:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(model_generator.xml_file_object(lines))
+            lazy_model = eer_model.transform_to_lazy_arm()
+            self.assertEqual(str(lazy_model), str(eer_model.transform_to_arm()),
+                             "Should be equal")
+            self.assertEqual(lazy_model.get_materialised_count(), len(lazy_model),
+                             "Should be all")
+            self.assertEqual([ent.get_name() for ent in lazy_model],
+                             [ent.get_name() for ent in lazy_model.get_arm_entities()],
+                             "Should be equal")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,33 @@
+import os
+import arm
+import eer
+import model_generator
+import parallel
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_transform_to_arm(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(500)))
+        arm_model = parallel.transform_to_arm(eer_model, workers=2, chunk_size=50, threshold=0)
+        self.assertEqual(str(arm_model), str(eer_model.transform_to_arm()), "Should be equal")
+
+    def test_transform_to_eer(self):
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(model_generator.xml_file_object(model_generator.arm_xml_lines(500)))
+        eer_model = parallel.transform_to_eer(arm_model, workers=2, chunk_size=50, threshold=0)
+        self.assertEqual(str(eer_model), str(arm_model.transform_to_eer()), "Should be equal")
+
+    def test_Serial_Fallback(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_Inheritance.xml"))
+        arm_model = parallel.transform_to_arm(eer_model, workers=2)
+        self.assertEqual(str(arm_model), str(eer_model.transform_to_arm()), "Should be equal")
+
+
+if __name__ == '__main__':
+    unittest2.main()
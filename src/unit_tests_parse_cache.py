@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import parse_cache
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hits_and_misses(self):
+        cache = parse_cache.Parse_Cache(self.directory)
+        filename = os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml")
+        first = cache.load_eer(filename)
+        second = cache.load_eer(filename)
+        self.assertEqual(str(first), str(second), "Should be the same model")
+        self.assertEqual(cache.hits, 1, "Should be 1")
+        self.assertEqual(cache.misses, 1, "Should be 1")
+        self.assertEqual(cache.verify_eer(filename), True, "Should be True")
+
+        # The cache persists across Parse_Cache objects
+        cache = parse_cache.Parse_Cache(self.directory)
+        cache.load_eer(filename)
+        self.assertEqual(cache.hits, 1, "Should be 1")
+
+    def test_content_addressing(self):
+        cache = parse_cache.Parse_Cache(self.directory)
+        original = os.path.join(BASE_DIR, "ARM_XML_Examples", "ARM_ProfDept.xml")
+        copy = os.path.join(self.directory, "copy.xml")
+        shutil.copyfile(original, copy)
+        cache.load_arm(original)
+        cache.load_arm(copy)
+        self.assertEqual(cache.hits, 1, "Should be 1 - same contents")
+
+        # Editing the file must invalidate the cached model
+        with open(copy, "a") as f:
+            f.write("\n")
+        cache.load_arm(copy)
+        self.assertEqual(cache.misses, 2, "Should be 2")
+
+    def test_eviction(self):
+        cache = parse_cache.Parse_Cache(self.directory, max_bytes=1)
+        cache.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        cache.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_ProfDept.xml"))
+        self.assertEqual(cache.evictions, 2, "Should be 2")
+        self.assertEqual(cache.get_stats()["entries"], 0, "Should be 0")
+        # The files of evicted entries are forgotten too
+        self.assertEqual(cache.index["files"], {}, "Should be empty")
+
+    def test_removed_files(self):
+        cache = parse_cache.Parse_Cache(self.directory)
+        shutil.copyfile(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_ProfDept.xml"),
+                        os.path.join(self.directory, "first.xml"))
+        cache.load_eer(os.path.join(self.directory, "first.xml"))
+        os.rename(os.path.join(self.directory, "first.xml"),
+                  os.path.join(self.directory, "renamed.xml"))
+        cache.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        # A file that no longer exists is forgotten, even though its entry is kept
+        self.assertEqual(os.path.join(self.directory, "first.xml") in cache.index["files"],
+                         False, "Should be False")
+        self.assertEqual(len(cache.index["files"]), 1, "Should be 1")
+        cache.load_eer(os.path.join(self.directory, "renamed.xml"))
+        self.assertEqual(cache.hits, 1, "Should be 1")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,57 @@
+import os
+import eer
+import model_generator
+import partition
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_find_components(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(20)))
+        components = partition.find_components(eer_model)
+        names = [[ent.get_name() for ent in component.eer_entities]
+                 for component in components]
+        # Each group of ten entities has a hierarchy, a chain of two
+        # relationships, a single relationship and two lone entities
+        self.assertEqual(names[0], ["E0", "E1", "E2"], "Should be [E0, E1, E2]")
+        self.assertEqual(names[1], ["E3", "E4", "E5"], "Should be [E3, E4, E5]")
+        self.assertEqual(names[2], ["E6", "E7"], "Should be [E6, E7]")
+        self.assertEqual(len(components), 10, "Should be 10")
+        self.assertEqual(len(components[1].eer_relationships), 2, "Should be 2")
+        # Components with the same content have the same digest
+        self.assertEqual(components[0].get_digest() == components[5].get_digest(), False,
+                         "Should be False")
+        self.assertEqual(components[0].get_digest(),
+                         partition.find_components(eer_model)[0].get_digest(),
+                         "Should be equal")
+
+    def test_transform_to_arm(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(model_generator.eer_xml_lines(100)))
+        expected = str(eer_model.transform_to_arm())
+        self.assertEqual(str(partition.transform_to_arm(eer_model)), expected,
+                         "Should be equal")
+        self.assertEqual(str(partition.transform_to_arm(eer_model, workers=2)), expected,
+                         "Should be equal")
+
+    def test_Cache(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        cache = {}
+        first = str(partition.transform_to_arm(eer_model, cache=cache))
+        self.assertEqual(len(cache), len(partition.find_components(eer_model)),
+                         "Should be one entry per component")
+        # The second run reuses every component, and leaves the cache unchanged
+        entries = dict(cache)
+        self.assertEqual(str(partition.transform_to_arm(eer_model, cache=cache)), first,
+                         "Should be equal")
+        self.assertEqual(cache, entries, "Should be unchanged")
+        self.assertEqual(first, str(eer_model.transform_to_arm()), "Should be equal")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,88 @@
+import os
+import arm
+import eer
+import eer_constraints
+import model_generator
+import resolution
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_get_kind(self):
+        self.assertEqual(resolution.get_kind(("1", ""), ("1", "")), resolution.ONE_TO_ONE,
+                         "Should be one-to-one")
+        self.assertEqual(resolution.get_kind(("1", ""), ("0", "n")), resolution.ONE_TO_MANY,
+                         "Should be one-to-many")
+        self.assertEqual(resolution.get_kind(("0", "n"), ("1", "")), resolution.MANY_TO_ONE,
+                         "Should be many-to-one")
+        self.assertEqual(resolution.get_kind(("0", "n"), ("1", "n")), resolution.MANY_TO_MANY,
+                         "Should be many-to-many")
+        self.assertEqual(resolution.get_kind(None, ("1", "")), None, "Should be None")
+
+    def test_Weak_Relationship(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_WeakPaymentLoan.xml"))
+        arm_model = arm.ARM_Model()
+        arm_model.add_arm_entity(arm.ARM_Entity("Payment"))
+        arm_model.add_arm_entity(arm.ARM_Entity("Loan"))
+        resolver = resolution.Relationship_Resolver(eer_model, arm_model)
+        resolved = resolver.resolve(eer_model.get_eer_relationships()[0])
+        self.assertEqual(resolved.kind, resolution.MANY_TO_ONE, "Should be many-to-one")
+        self.assertEqual(resolved.weak_victim.get_name(), "Payment", "Should be Payment")
+        self.assertEqual(resolved.owner, "Loan", "Should be Loan")
+        self.assertEqual(resolved.victim.get_name(), "Payment", "Should be Payment")
+        self.assertEqual(resolved.referenced, "Loan", "Should be Loan")
+
+    def test_Foreign_Key_Named_Like_Attribute(self):
+        eer_model = eer.EER_Model()
+        for name, attributes in [("Professor", ["pid", "department"]), ("Department", ["did"])]:
+            eer_entity = eer.EER_Entity(name)
+            for attribute in attributes:
+                eer_entity.add_attribute(eer.EER_Attribute(attribute))
+            eer_entity.add_constraint(eer_constraints.Identifier_Constraint(attributes[:1]))
+            eer_model.add_eer_entity(eer_entity)
+        eer_model.add_eer_relationship(eer.EER_Relationship("WorksIn", "Professor", "Department",
+                                                            ("0", "n"), ("1", "")))
+        professor = eer_model.transform_to_arm().find_entity("Professor")
+        # The attribute becomes the column of the foreign key
+        self.assertEqual(professor.get_fk("department").get_references(), "Department",
+                         "Should be Department")
+        self.assertEqual([attribute.get_name() for attribute in professor.get_attributes()],
+                         ["self", "pid", "department"], "Should be equal")
+
+    def test_Weak_Relationships_To_Same_Owner(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_WeakPaymentLoan.xml"))
+        eer_model.add_eer_relationship(eer.EER_Relationship("Settles", "Payment", "Loan",
+                                                            ("0", "n"), ("1", ""), True))
+        payment = eer_model.transform_to_arm().find_entity("Payment")
+        # The key of the weak entity has the column of its owner once
+        self.assertEqual(payment.get_key_pathfd().get_attributes(), ["paytime", "loan"],
+                         "Should be equal")
+        self.assertEqual(len(payment.get_fk_constraints()), 1, "Should be 1")
+
+    def test_Many_Relationships(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(model_generator.xml_file_object(
+            model_generator.eer_relationship_xml_lines(400, 10)))
+        arm_model = eer_model.transform_to_arm()
+        # The 100 many-to-many relationships each become a new relation
+        self.assertEqual(len(arm_model), 110, "Should be 110")
+        # The other 300 relationships are between 10 pairs of entities, and
+        # each pair shares a single foreign key column and constraint
+        columns = sum(len([attribute for attribute in
+                           arm_model.find_entity("E{}".format(i)).get_attributes()
+                           if attribute.get_data_type() == "OID"]) - 1 for i in range(10))
+        fks = sum(len(arm_model.find_entity("E{}".format(i)).get_fk_constraints())
+                  for i in range(10))
+        self.assertEqual(columns, fks, "Should be equal")
+        self.assertEqual(fks, 10, "Should be 10")
+        self.assertEqual(arm_model.find_entity("R3").get_fk("e3").get_references(), "E3",
+                         "Should be E3")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import arm
+import eer
+import roundtrip
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_EER_Examples(self):
+        results = roundtrip.verify_directory(os.path.join(BASE_DIR, "EER_XML_Examples"),
+                                             workers=1)
+        self.assertEqual([result.name for result in results if result.is_ok()],
+                         ["EER_Inheritance.xml", "EER_PartSupplier.xml",
+                          "EER_WeakPaymentLoan.xml"], "Should be equal")
+        # ARM cannot say that a professor may work in no department
+        prof_dept = results[2]
+        self.assertEqual(prof_dept.kind, "eer", "Should be eer")
+        relationship_diff = prof_dept.model_diff.changed_relationships[0]
+        self.assertEqual(relationship_diff.name, "Department-Professor", "Should be equal")
+        self.assertEqual(relationship_diff.changed_fields, {"mult1": ("0..1", "1")},
+                         "Should be equal")
+
+    def test_ARM_Examples(self):
+        results = roundtrip.verify_directory(os.path.join(BASE_DIR, "ARM_XML_Examples"),
+                                             workers=2)
+        self.assertEqual([result.name for result in results if not result.is_ok()],
+                         ["ARM_Inheritance.xml"], "Should be equal")
+        # The keys of subclasses are lost in EER
+        model_diff = results[0].model_diff
+        self.assertEqual([d.name for d in model_diff.changed_entities],
+                         ["Postgrad", "Undergrad"], "Should be equal")
+        self.assertEqual(model_diff.changed_entities[0].removed_constraints,
+                         ["primary key (self)", "pathfd (Sno) -> self"], "Should be equal")
+        for result in results:
+            self.assertEqual(result.seconds > 0, True, "Should be timed")
+
+    def test_Data_Types(self):
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(os.path.join(BASE_DIR, "ARM_XML_Examples", "ARM_ProfDept.xml"))
+        self.assertEqual(roundtrip.verify_arm(arm_model).is_ok(), True, "Should be True")
+        result = roundtrip.verify_arm(arm_model, ignore_data_types=False)
+        self.assertEqual(result.is_ok(), False, "Should be False")
+        self.assertEqual(("pnum (INT)", "pnum (anyType)") in
+                         result.model_diff.to_dict()["entities"]["changed"]["Professor"]
+                         ["attributes"]["changed"], True, "Should be True")
+
+    def test_Normalisation(self):
+        self.assertEqual(roundtrip.normalise_multiplicity(("1", "")), ("1",), "Should be equal")
+        self.assertEqual(roundtrip.normalise_multiplicity(("1", "1")), ("1",), "Should be equal")
+        self.assertEqual(roundtrip.normalise_multiplicity(("0", "n")), ("0", "n"),
+                         "Should be equal")
+        # Relationships are named after their ends, in a canonical order
+        eer_model = eer.EER_Model()
+        eer_model.add_eer_relationship(eer.EER_Relationship("Works", "B", "A",
+                                                            ("0", "n"), ("1", "1")))
+        relationship = roundtrip.normalise_eer(eer_model).get_eer_relationships()[0]
+        self.assertEqual(relationship.get_name(), "A-B", "Should be A-B")
+        self.assertEqual(relationship.get_mult1(), ("1",), "Should be equal")
+
+    def test_Errors(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, "broken.xml"), "w") as f:
+                f.write("<eer><entity name=")
+            with open(os.path.join(directory, "other.xml"), "w") as f:
+                f.write("<schema></schema>")
+            results = roundtrip.verify_directory(directory, workers=1)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual([result.is_ok() for result in results], [False, False],
+                         "Should be equal")
+        self.assertEqual(results[0].error.startswith("ParseError"), True, "Should be True")
+        self.assertEqual(results[1].error.startswith("AssertionError"), True, "Should be True")
+        self.assertEqual("error" in results[1].to_dict(), True, "Should be True")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from unittest import mock
+import arm
+import arm_constraints as AC
+import eer
+import snapshot
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+EXAMPLES = ["PartSupplier", "ProfDept", "WeakPaymentLoan", "Inheritance"]
+
+
+class Tests(unittest2.TestCase):
+
+    def example_models(self):
+        """Returns the example models along with their transformations."""
+        models = []
+        for example in EXAMPLES:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples",
+                                            "EER_" + example + ".xml"))
+            arm_model = arm.ARM_Model()
+            arm_model.load_arm(os.path.join(BASE_DIR, "ARM_XML_Examples",
+                                            "ARM_" + example + ".xml"))
+            models += [eer_model, arm_model,
+                       eer_model.transform_to_arm(), arm_model.transform_to_eer()]
+        return models
+
+    def test_round_trip(self):
+        for model in self.example_models():
+            loaded = snapshot.loads(snapshot.dumps(model))
+            self.assertEqual(type(loaded), type(model), "Should be the same type")
+            self.assertEqual(str(loaded), str(model), "Should be the same model")
+
+    def test_big_endian_host(self):
+        # On a big-endian host the words are swapped on the way out and back in
+        for model in self.example_models():
+            with mock.patch.object(snapshot.sys, "byteorder", "big"):
+                data = snapshot.dumps(model)
+                loaded = snapshot.loads(data)
+            self.assertEqual(str(loaded), str(model), "Should be the same model")
+            self.assertNotEqual(data, snapshot.dumps(model), "Should be byte-swapped")
+
+    def test_shared_disjointness_group(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples",
+                                        "EER_PartSupplier.xml"))
+        loaded = snapshot.loads(snapshot.dumps(eer_model.transform_to_arm()))
+        groups = [entity.get_constraints_of_type(AC.Disjointness_Constraint)[0].get_group()
+                  for entity in loaded.get_arm_entities()]
+        self.assertEqual(len(groups), 3, "Should be 3")
+        for group in groups:
+            self.assertEqual(group is groups[0], True, "Should be a single shared group")
+
+    def test_file_round_trip(self):
+        filename = os.path.join(tempfile.mkdtemp(), "model.snapshot")
+        try:
+            for model in self.example_models():
+                snapshot.dump(model, filename)
+                self.assertEqual(str(snapshot.load(filename)), str(model),
+                                 "Should be the same model")
+                self.assertEqual(str(snapshot.load(filename, use_mmap=False)),
+                                 str(model), "Should be the same model")
+        finally:
+            os.remove(filename)
+            os.rmdir(os.path.dirname(filename))
+
+    def test_invalid_snapshot(self):
+        data = snapshot.dumps(eer.EER_Model())
+        with self.assertRaises(snapshot.Snapshot_Error):
+            snapshot.loads(b"XXXX" + data[4:])
+        with self.assertRaises(snapshot.Snapshot_Error):
+            snapshot.loads(data[:-1])
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,57 @@
+import io
+import os
+import arm
+import eer
+import model_generator
+import streaming
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_transform_to_arm(self):
+        for lines in [model_generator.eer_xml_lines(200),
+                      model_generator.eer_relationship_xml_lines(200, 30)]:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(model_generator.xml_file_object(lines))
+            arm_model = eer_model.transform_to_arm()
+            relations = list(streaming.transform_to_arm(eer_model))
+            self.assertEqual(len(relations), len(arm_model), "Should be the same length")
+            for arm_entity in relations:
+                self.assertEqual(str(arm_entity),
+                                 str(arm_model.find_entity(arm_entity.get_name())),
+                                 "Should be equal")
+
+    def test_Relations_Are_Final(self):
+        # The weak Payment relation is only yielded after the Pays relationship
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_WeakPaymentLoan.xml"))
+        arm_model = eer_model.transform_to_arm()
+        for arm_entity in streaming.transform_to_arm(eer_model):
+            self.assertEqual(str(arm_entity), str(arm_model.find_entity(arm_entity.get_name())),
+                             "Should be equal")
+
+    def test_dump_arm(self):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_Inheritance.xml"))
+        f = io.StringIO()
+        self.assertEqual(streaming.dump_arm(eer_model, f), 3, "Should be 3")
+        # Without relationships, the relations come out in the order of the model
+        self.assertEqual(f.getvalue(), str(eer_model.transform_to_arm()), "Should be equal")
+
+    def test_transform_to_eer(self):
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(model_generator.xml_file_object(model_generator.arm_xml_lines(200)))
+        eer_model = eer.EER_Model()
+        for item in streaming.transform_to_eer(arm_model):
+            if type(item) == eer.EER_Entity:
+                eer_model.add_eer_entity(item)
+            else:
+                eer_model.add_eer_relationship(item)
+        self.assertEqual(str(eer_model), str(arm_model.transform_to_eer()), "Should be equal")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import arm
+import arm_constraints
+import eer
+import eer_constraints
+import transform_cache
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load_eer(self, name):
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", name))
+        return eer_model
+
+    def test_fingerprint(self):
+        first = self.load_eer("EER_PartSupplier.xml")
+        second = self.load_eer("EER_PartSupplier.xml")
+        self.assertEqual(transform_cache.fingerprint(first), transform_cache.fingerprint(second),
+                         "Should be equal")
+        self.assertEqual(transform_cache.fingerprint(first) ==
+                         transform_cache.fingerprint(self.load_eer("EER_ProfDept.xml")), False,
+                         "Should be False")
+
+    def test_Reordered_Model(self):
+        first = eer.EER_Model()
+        second = eer.EER_Model()
+        for eer_model, names in [(first, ["A", "B"]), (second, ["B", "A"])]:
+            for name in names:
+                eer_entity = eer.EER_Entity(name)
+                eer_entity.add_attribute(eer.EER_Attribute("id"))
+                eer_entity.add_constraint(eer_constraints.Identifier_Constraint(["id"]))
+                eer_model.add_eer_entity(eer_entity)
+        self.assertEqual(transform_cache.fingerprint(first), transform_cache.fingerprint(second),
+                         "Should be equal")
+        # A reordered model gets its relations in its own order
+        cache = transform_cache.Transform_Cache()
+        cache.transform_to_arm(first)
+        self.assertEqual(str(cache.transform_to_arm(second)), str(second.transform_to_arm()),
+                         "Should be equal")
+        self.assertEqual(cache.misses, 2, "Should be 2")
+        # unless the cache is not ordered
+        cache = transform_cache.Transform_Cache(ordered=False)
+        cache.transform_to_arm(first)
+        self.assertEqual(str(cache.transform_to_arm(second)), str(first.transform_to_arm()),
+                         "Should be equal")
+        self.assertEqual(cache.memory_hits, 1, "Should be 1")
+
+    def test_Shared_Group_Order(self):
+        eer_model = eer.EER_Model()
+        person = eer.EER_Entity("Person")
+        person.add_attribute(eer.EER_Attribute("id"))
+        person.add_constraint(eer_constraints.Identifier_Constraint(["id"]))
+        eer_model.add_eer_entity(person)
+        for name in ["Staff", "Student", "Visitor"]:
+            eer_entity = eer.EER_Entity(name)
+            eer_entity.add_constraint(eer_constraints.Inheritance_Constraint("Person", True, False))
+            eer_model.add_eer_entity(eer_entity)
+        first = eer_model.transform_to_arm()
+        second = eer_model.transform_to_arm()
+        self.assertEqual(transform_cache.order_fingerprint(first),
+                         transform_cache.order_fingerprint(second), "Should be equal")
+        # The members of a shared disjointness group are listed in order
+        group = second.find_entity("Staff").get_constraints_of_type(
+            arm_constraints.Disjointness_Constraint)[0].get_group()
+        group.set_members(list(reversed(group.get_members())))
+        self.assertNotEqual(transform_cache.order_fingerprint(first),
+                            transform_cache.order_fingerprint(second), "Should not be equal")
+
+    def test_Memory_Tier(self):
+        cache = transform_cache.Transform_Cache()
+        eer_model = self.load_eer("EER_PartSupplier.xml")
+        expected = str(eer_model.transform_to_arm())
+        first = cache.transform_to_arm(eer_model)
+        # Modifying a result does not affect the cache
+        first.add_arm_entity(arm.ARM_Entity("Extra"))
+        second = cache.transform_to_arm(self.load_eer("EER_PartSupplier.xml"))
+        self.assertEqual(str(second), expected, "Should be equal")
+        self.assertEqual(cache.misses, 1, "Should be 1")
+        self.assertEqual(cache.memory_hits, 1, "Should be 1")
+
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(os.path.join(BASE_DIR, "ARM_XML_Examples", "ARM_ProfDept.xml"))
+        self.assertEqual(str(cache.transform_to_eer(arm_model)), str(arm_model.transform_to_eer()),
+                         "Should be equal")
+
+    def test_Eviction(self):
+        cache = transform_cache.Transform_Cache(max_entries=2)
+        for name in ["EER_PartSupplier.xml", "EER_ProfDept.xml", "EER_Inheritance.xml"]:
+            cache.transform_to_arm(self.load_eer(name))
+        self.assertEqual(cache.evictions, 1, "Should be 1")
+        cache.transform_to_arm(self.load_eer("EER_PartSupplier.xml"))
+        self.assertEqual(cache.misses, 4, "Should be 4")
+        self.assertEqual(cache.get_stats()["entries"], 2, "Should be 2")
+
+    def test_Disk_Tier(self):
+        cache = transform_cache.Transform_Cache(directory=self.directory)
+        eer_model = self.load_eer("EER_Inheritance.xml")
+        cache.transform_to_arm(eer_model)
+        # A new cache finds the result on disk
+        cache = transform_cache.Transform_Cache(directory=self.directory)
+        self.assertEqual(str(cache.transform_to_arm(eer_model)), str(eer_model.transform_to_arm()),
+                         "Should be equal")
+        self.assertEqual(cache.disk_hits, 1, "Should be 1")
+        cache.transform_to_arm(eer_model)
+        self.assertEqual(cache.memory_hits, 1, "Should be 1")
+        self.assertEqual(cache.get_stats()["disk_entries"], 1, "Should be 1")
+
+
+if __name__ == '__main__':
+    unittest2.main()
@@ -0,0 +1,144 @@
+import io
+import os
+import arm
+import arm_constraints
+import eer
+import eer_constraints
+import validation
+import unittest2
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class Tests(unittest2.TestCase):
+
+    def test_Valid_Examples(self):
+        for example in ["EER_WeakPaymentLoan", "EER_PartSupplier",
+                        "EER_ProfDept", "EER_Inheritance"]:
+            eer_model = eer.EER_Model()
+            eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", example + ".xml"))
+            self.assertEqual(validation.validate(eer_model), [], "Should be empty")
+            self.assertEqual(validation.validate(eer_model.transform_to_arm()), [],
+                             "Should be empty")
+        for example in ["ARM_WeakPaymentLoan", "ARM_PartSupplier",
+                        "ARM_ProfDept", "ARM_Inheritance"]:
+            arm_model = arm.ARM_Model()
+            arm_model.load_arm(os.path.join(BASE_DIR, "ARM_XML_Examples", example + ".xml"))
+            self.assertEqual(validation.validate(arm_model), [], "Should be empty")
+
+    def test_EER_Problems(self):
+        eer_model = eer.EER_Model()
+        person = eer.EER_Entity("Person")
+        person.add_attribute(eer.EER_Attribute("name"))
+        person.add_attribute(eer.EER_Attribute("name"))
+        person.add_constraint(eer_constraints.Identifier_Constraint(["id"]))
+        person.add_constraint(eer_constraints.Identifier_Constraint(["name"]))
+        eer_model.add_eer_entity(person)
+        student = eer.EER_Entity("Student")
+        student.add_constraint(eer_constraints.Inheritance_Constraint("Human", True, False))
+        eer_model.add_eer_entity(student)
+        # A strong entity that does not inherit needs an identifier
+        eer_model.add_eer_entity(eer.EER_Entity("Room"))
+        for name, parent in [("A", "B"), ("B", "A")]:
+            entity = eer.EER_Entity(name)
+            entity.add_constraint(eer_constraints.Inheritance_Constraint(parent, False, False))
+            eer_model.add_eer_entity(entity)
+        eer_model.add_eer_relationship(eer.EER_Relationship("Person", "Person", "Course",
+                                                            ("0", "n"), ("0", "n")))
+        eer_model.add_eer_relationship(eer.EER_Relationship("Person", "Person", "Student",
+                                                            ("0", "n"), ("1", "")))
+        problems = validation.validate(eer_model)
+        # Every problem is reported at once, in the order of the model
+        self.assertEqual([(problem.code, problem.element) for problem in problems], [
+            (validation.DUPLICATE_ATTRIBUTE, "Person"),
+            (validation.MULTIPLE_CONSTRAINTS, "Person"),
+            (validation.UNKNOWN_ATTRIBUTE, "Person"),
+            (validation.UNKNOWN_PARENT, "Student"),
+            (validation.MISSING_IDENTIFIER, "Room"),
+            (validation.INHERITANCE_CYCLE, "A"),
+            (validation.DUPLICATE_NAME, "Person"),
+            (validation.UNKNOWN_ENTITY, "Person"),
+            (validation.DUPLICATE_NAME, "Person")], "Should be equal")
+        self.assertEqual(str(problems[3]), "Student: unknown parent Human", "Should be equal")
+        self.assertEqual(str(problems[4]), "Room: no identifier", "Should be equal")
+        self.assertEqual(str(problems[5]), "A: inheritance cycle A -> B -> A", "Should be equal")
+        self.assertEqual(str(problems[7]), "Person: unknown entity Course", "Should be equal")
+
+    def test_ARM_Problems(self):
+        arm_model = arm.ARM_Model()
+        loan = arm.ARM_Entity("Loan")
+        loan.add_attribute(arm.ARM_Attribute("self", "OID"))
+        loan.add_constraint(arm_constraints.PK_Constraint("id"))
+        loan.add_constraint(arm_constraints.FK_Constraint("bank", "bank", "Bank"))
+        loan.add_constraint(arm_constraints.Pathfd_Constraint(["LID"], "self"))
+        loan.add_constraint(arm_constraints.Inheritance_Constraint("Contract"))
+        arm_model.add_arm_entity(loan)
+        # A group shared by every member is only reported once
+        group = arm_constraints.Disjointness_Group(["Loan", "Payment", "Missing"])
+        for name in ["Loan", "Payment"]:
+            if name != "Loan":
+                arm_model.add_arm_entity(arm.ARM_Entity(name))
+            arm_model.find_entity(name).add_constraint(
+                arm_constraints.Disjointness_Constraint(group, owner=name))
+        problems = validation.validate(arm_model)
+        self.assertEqual([str(problem) for problem in problems], [
+            "Loan: unknown attribute id",
+            "Loan: unknown attribute bank",
+            "Loan: unknown relation Bank",
+            "Loan: unknown attribute LID",
+            "Loan: unknown parent Contract",
+            "Loan: unknown relation Missing"], "Should be equal")
+
+    def test_Duplicate_Entities(self):
+        # A file naming two entities alike loads, and every duplicate is reported
+        entity = '<entity name="{}" type="Entity" weak="False">' \
+            '<attribute type="attr" multi_valued="False" derived="False" ' \
+            'optional="False">id</attribute><constraint type="identifier">id</constraint>' \
+            '</entity>'
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(io.StringIO("<eer>{}</eer>".format(
+            "".join(entity.format(name) for name in ["A", "B", "A", "B"]))))
+        self.assertEqual(len(eer_model.get_eer_entities()), 4, "Should be 4")
+        self.assertEqual([str(problem) for problem in validation.validate(eer_model)], [
+            "A: duplicate entity name",
+            "B: duplicate entity name"], "Should be equal")
+        relation = '<entity name="{}" type="Entity">' \
+            '<attribute type="attr" data_type="OID">self</attribute>' \
+            '<constraint type="pk">self</constraint></entity>'
+        arm_model = arm.ARM_Model()
+        arm_model.load_arm(io.StringIO("<arm>{}</arm>".format(
+            "".join(relation.format(name) for name in ["A", "B", "A", "B"]))))
+        self.assertEqual([str(problem) for problem in validation.validate(arm_model)], [
+            "A: duplicate relation name",
+            "B: duplicate relation name"], "Should be equal")
+        with self.assertRaises(validation.Validation_Error):
+            validation.check(arm_model)
+
+    def test_Invalid_Multiplicity(self):
+        # A bound that is neither a number nor many is reported, not asserted on load
+        line = '<related_entity type="ent" mult_left="{}" mult_right="{}">{}</related_entity>'
+        eer_model = eer.EER_Model()
+        eer_model.load_eer(os.path.join(BASE_DIR, "EER_XML_Examples", "EER_PartSupplier.xml"))
+        eer_model.load_eer(io.StringIO(
+            '<eer><relationship name="Stocks" type="Relationship" weak="False">' +
+            line.format("0", "many", "Part") + line.format(" 1", "*", "Supplier") +
+            '</relationship></eer>'))
+        self.assertEqual([str(problem) for problem in validation.validate(eer_model)], [
+            "Stocks: invalid multiplicity 0..many"], "Should be equal")
+
+    def test_check(self):
+        arm_model = arm.ARM_Model()
+        arm_entity = arm.ARM_Entity("A")
+        arm_entity.add_constraint(arm_constraints.PK_Constraint("self"))
+        arm_model.add_arm_entity(arm_entity)
+        with self.assertRaises(validation.Validation_Error) as context:
+            validation.check(arm_model)
+        self.assertEqual(len(context.exception.problems), 1, "Should be 1")
+        # Callers catching AssertionError still catch validation errors
+        self.assertEqual(isinstance(context.exception, AssertionError), True, "Should be True")
+        arm_entity.add_attribute(arm.ARM_Attribute("self", "OID"))
+        validation.check(arm_model)
+
+
+if __name__ == '__main__':
+    unittest2.main()
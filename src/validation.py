@@ -0,0 +1,248 @@
+"""
+Validation of EER and ARM models before they are transformed.
+
+The transformations assume a well-formed model, and a model that is not
+otherwise fails with an AssertionError deep inside a transformation (or
+produces a wrong result). `validate()` checks a model in a single pass over
+its entities, using indexes by name, and returns every problem found
+rather than stopping at the first:
+    - duplicate entity, relationship and attribute names,
+    - inheritance parents that do not exist, and inheritance cycles,
+    - relationship ends that do not exist, and multiplicities with a bound
+      that is neither a number nor many,
+    - foreign keys that reference relations that do not exist,
+    - identifier, primary key, foreign key and pathfd attributes that do
+      not exist,
+    - cover and disjointness constraints naming entities that do not exist,
+    - entities with more than one identifier or inheritance constraint,
+    - strong entities that neither have an identifier nor inherit one.
+
+`check()` raises a Validation_Error - an AssertionError - listing all of
+the problems.
+"""
+import arm
+import arm_constraints
+import eer
+import eer_constraints
+import hierarchy
+import resolution
+
+# The kinds of problem
+DUPLICATE_NAME = "duplicate-name"
+DUPLICATE_ATTRIBUTE = "duplicate-attribute"
+UNKNOWN_PARENT = "unknown-parent"
+INHERITANCE_CYCLE = "inheritance-cycle"
+UNKNOWN_ENTITY = "unknown-entity"
+UNKNOWN_ATTRIBUTE = "unknown-attribute"
+MULTIPLE_CONSTRAINTS = "multiple-constraints"
+MISSING_IDENTIFIER = "missing-identifier"
+INVALID_MULTIPLICITY = "invalid-multiplicity"
+
+
+class Problem:
+    """
+    A class used to represent a problem found in a model.
+
+    Attributes
+    ----------
+    code : str
+        The kind of problem, e.g. UNKNOWN_PARENT.
+    element : str
+        The name of the entity or relationship with the problem.
+    message : str
+        A description of the problem.
+    """
+
+    __slots__ = ("code", "element", "message")
+
+    def __init__(self, code, element, message):
+        self.code = code
+        self.element = element
+        self.message = message
+
+    def __str__(self):
+        """
+        String representation of the problem.
+        e.g. 'Postgrad: unknown parent Student'
+        """
+        return "{}: {}".format(self.element, self.message)
+
+
+class Validation_Error(AssertionError):
+    """
+    Raised by `check()` for a model with problems.
+
+    Attributes
+    ----------
+    problems : list of Problem
+        Every problem found in the model.
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("{} problem(s):\n{}".format(
+            len(problems), "\n".join(str(problem) for problem in problems)))
+
+
+def validate(model):
+    """Finds the problems of an EER_Model or ARM_Model.
+
+    Returns:
+        list of Problem: Every problem found, in the order of the model.
+
+    Raises:
+        AssertionError:
+            if `model` is neither an EER_Model nor an ARM_Model
+    """
+    if isinstance(model, eer.EER_Model):
+        return validate_eer(model)
+    assert isinstance(model, arm.ARM_Model), "Cannot validate {}".format(type(model).__name__)
+    return validate_arm(model)
+
+
+def check(model):
+    """
+    Validates a model.
+
+    Raises:
+        Validation_Error: if the model has any problems, listing them all.
+    """
+    problems = validate(model)
+    if problems:
+        raise Validation_Error(problems)
+
+
+def check_attributes(problems, element, attributes, index=None):
+    """
+    Reports the attribute names that appear more than once in `attributes`.
+    Returns the names, or `index` - the attributes already indexed by name -
+    if no name appears twice.
+    """
+    if index is not None and len(index) == len(attributes):
+        return index
+    seen = set()
+    for attribute in attributes:
+        name = attribute.get_name()
+        if name in seen:
+            problems.append(Problem(DUPLICATE_ATTRIBUTE, element,
+                                    "duplicate attribute {}".format(name)))
+        seen.add(name)
+    return seen
+
+
+def check_names(problems, element, names, known, description):
+    """Reports the names that are not in `known` - attribute names or entity names."""
+    code = UNKNOWN_ATTRIBUTE if description == "attribute" else UNKNOWN_ENTITY
+    for name in names:
+        if name not in known:
+            problems.append(Problem(code, element, "unknown {} {}".format(description, name)))
+
+
+def check_cycles(problems, entities):
+    """Reports every inheritance cycle among `entities`."""
+    for cycle in hierarchy.find_cycles(entities):
+        problems.append(Problem(INHERITANCE_CYCLE, cycle[0], "inheritance cycle {}".format(
+            " -> ".join(cycle + cycle[:1]))))
+
+
+def validate_eer(eer_model):
+    """Finds the problems of an EER_Model. Returns a list of Problem."""
+    problems = []
+    eer_entities = eer_model.get_eer_entities()
+    names = set()
+    for eer_entity in eer_entities:
+        name = eer_entity.get_name()
+        if name in names:
+            problems.append(Problem(DUPLICATE_NAME, name, "duplicate entity name"))
+        names.add(name)
+
+    for eer_entity in eer_entities:
+        name = eer_entity.get_name()
+        attributes = check_attributes(problems, name, eer_entity.get_attributes())
+
+        identifiers = eer_entity.get_constraints_of_type(eer_constraints.Identifier_Constraint)
+        if len(identifiers) > 1:
+            problems.append(Problem(MULTIPLE_CONSTRAINTS, name, "more than one identifier"))
+        for identifier in identifiers:
+            check_names(problems, name, identifier.get_identifier(), attributes, "attribute")
+
+        inheritances = eer_entity.get_constraints_of_type(eer_constraints.Inheritance_Constraint)
+        if len(inheritances) > 1:
+            problems.append(Problem(MULTIPLE_CONSTRAINTS, name,
+                                    "more than one inheritance constraint"))
+        for inheritance in inheritances:
+            parent = inheritance.get_parent()
+            if parent is None or parent not in names:
+                problems.append(Problem(UNKNOWN_PARENT, name,
+                                        "unknown parent {}".format(parent)))
+        # The relation of a strong entity is identified by its identifier
+        if not identifiers and not inheritances and not eer_entity.is_weak():
+            problems.append(Problem(MISSING_IDENTIFIER, name, "no identifier"))
+    check_cycles(problems, eer_entities)
+
+    relationship_names = set()
+    for relationship in eer_model.get_eer_relationships():
+        name = relationship.get_name()
+        if name in relationship_names:
+            problems.append(Problem(DUPLICATE_NAME, name, "duplicate relationship name"))
+        relationship_names.add(name)
+        # A many-to-many relationship becomes a relation of its own
+        if name in names and relationship.get_kind() == resolution.MANY_TO_MANY:
+            problems.append(Problem(DUPLICATE_NAME, name,
+                                    "many-to-many relationship named like an entity"))
+        check_attributes(problems, name, relationship.get_attributes())
+        check_names(problems, name, [relationship.get_entity1(), relationship.get_entity2()],
+                    names, "entity")
+        for card in [relationship.get_cardinality1(), relationship.get_cardinality2()]:
+            if card is not None and not card.is_valid():
+                problems.append(Problem(INVALID_MULTIPLICITY, name,
+                                        "invalid multiplicity {}".format(card)))
+    return problems
+
+
+def validate_arm(arm_model):
+    """Finds the problems of an ARM_Model. Returns a list of Problem."""
+    problems = []
+    arm_entities = arm_model.get_arm_entities()
+    names = set()
+    for arm_entity in arm_entities:
+        name = arm_entity.get_name()
+        if name in names:
+            problems.append(Problem(DUPLICATE_NAME, name, "duplicate relation name"))
+        names.add(name)
+
+    groups = set()                # ids of the disjointness groups checked
+    for arm_entity in arm_entities:
+        name = arm_entity.get_name()
+        attributes = check_attributes(problems, name, arm_entity.get_attributes(),
+                                      arm_entity.attribute_index)
+        inheritances = 0
+        for constraint in arm_entity.get_constraints():
+            constraint_type = type(constraint)
+            if constraint_type == arm_constraints.PK_Constraint:
+                check_names(problems, name, [constraint.get_pk()], attributes, "attribute")
+            elif constraint_type == arm_constraints.FK_Constraint:
+                check_names(problems, name, [constraint.get_fk()], attributes, "attribute")
+                check_names(problems, name, [constraint.get_references()], names, "relation")
+            elif constraint_type == arm_constraints.Pathfd_Constraint:
+                check_names(problems, name,
+                            constraint.get_attributes() + [constraint.get_target()],
+                            attributes, "attribute")
+            elif constraint_type == arm_constraints.Inheritance_Constraint:
+                inheritances += 1
+                if constraint.get_parent() not in names:
+                    problems.append(Problem(UNKNOWN_PARENT, name,
+                                            "unknown parent {}".format(constraint.get_parent())))
+            elif constraint_type == arm_constraints.Cover_Constraint:
+                check_names(problems, name, constraint.get_covered_by(), names, "relation")
+            elif constraint_type == arm_constraints.Disjointness_Constraint:
+                # A group shared by many relations is only checked once
+                group = constraint.get_group()
+                if id(group) not in groups:
+                    groups.add(id(group))
+                    check_names(problems, name, group.get_members(), names, "relation")
+        if inheritances > 1:
+            problems.append(Problem(MULTIPLE_CONSTRAINTS, name,
+                                    "more than one inheritance constraint"))
+    check_cycles(problems, arm_entities)
+    return problems
@@ -0,0 +1,53 @@
+import os
+import xml.etree.ElementTree as ET
+
+
+def iter_blocks(source):
+    """
+    Incrementally parses an XML document and yields each top-level block
+    (a direct child of the root element, e.g. an <entity>) as soon as its
+    closing tag has been read.
+
+    Once the consumer has finished with a block it is cleared and detached
+    from the root, so at most one block is held in memory at a time and the
+    peak memory used is proportional to the largest block rather than the
+    whole document.
+
+    Args:
+        source: The XML file name, an open file object, a bytes object, or
+                an iterable of byte (or str) chunks - e.g. data arriving
+                from a socket or a decompressor.
+    """
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        events = ET.iterparse(source, events=("start", "end"))
+    elif isinstance(source, (bytes, bytearray)):
+        events = iter_chunk_events([source])
+    else:
+        events = iter_chunk_events(source)
+
+    root = None
+    depth = 0
+    for event, element in events:
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1:
+            yield element
+            element.clear()
+            root.remove(element)
+
+
+def iter_chunk_events(chunks):
+    """
+    Feeds an iterable of chunks to a pull parser, yielding the
+    ("start" | "end", element) events as they become available.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()